@@ -0,0 +1,420 @@
+"""
+Generate synthetic Common Cartridge files of configurable size and content mix.
+
+Every module of the generated cartridge contains the same mix of resources:
+HTML pages, QTI assessments, web links, LTI links, discussions and
+assignments. Static files are placed into "web_resources" directory and are
+referenced from the HTML pages.
+
+Usage::
+
+    python -m benchmarks.cartridge_generator synthetic.imscc --html-pages 500 --qti-items-per-profile 100
+"""
+
+import argparse
+import random
+import zipfile
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import List, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+MANIFEST_NAMESPACE = "http://www.imsglobal.org/xsd/imsccv1p1/imscp_v1p1"
+LOM_NAMESPACE = "http://ltsc.ieee.org/xsd/imsccv1p1/LOM/manifest"
+
+LOREM_IPSUM_WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et dolore "
+    "magna aliqua ut enim ad minim veniam quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo"
+).split()
+
+QTI_PROFILES = (
+    "cc.multiple_choice.v0p1",
+    "cc.true_false.v0p1",
+    "cc.multiple_response.v0p1",
+    "cc.fib.v0p1",
+    "cc.essay.v0p1",
+)
+
+MANIFEST_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<manifest identifier="synthetic_cartridge" xmlns="{manifest_namespace}" xmlns:lomimscc="{lom_namespace}">
+  <metadata>
+    <schema>IMS Common Cartridge</schema>
+    <schemaversion>1.1.0</schemaversion>
+    <lomimscc:lom>
+      <lomimscc:general>
+        <lomimscc:title>
+          <lomimscc:string>Synthetic Course</lomimscc:string>
+        </lomimscc:title>
+      </lomimscc:general>
+    </lomimscc:lom>
+  </metadata>
+  <organizations>
+    <organization identifier="org_1" structure="rooted-hierarchy">
+      <item identifier="LearningModules">
+{items}
+      </item>
+    </organization>
+  </organizations>
+  <resources>
+{resources}
+  </resources>
+</manifest>
+"""
+
+HTML_PAGE_TEMPLATE = """<html>
+<head>
+<meta http-equiv="Content-Type" content="text/html; charset=utf-8"/>
+<title>{title}</title>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+WEB_LINK_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<webLink xmlns="http://www.imsglobal.org/xsd/imsccv1p1/imswl_v1p1">
+  <title>{title}</title>
+  <url href={url}/>
+</webLink>
+"""
+
+LTI_LINK_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<cartridge_basiclti_link xmlns="http://www.imsglobal.org/xsd/imslticc_v1p0"
+                         xmlns:blti="http://www.imsglobal.org/xsd/imsbasiclti_v1p0"
+                         xmlns:lticm="http://www.imsglobal.org/xsd/imslticm_v1p0">
+  <blti:title>{title}</blti:title>
+  <blti:description>{description}</blti:description>
+  <blti:secure_launch_url>https://lti.example.com/launch/{index}</blti:secure_launch_url>
+  <blti:extensions platform="canvas.instructure.com">
+    <lticm:property name="tool_id">tool_{index}</lticm:property>
+  </blti:extensions>
+</cartridge_basiclti_link>
+"""
+
+DISCUSSION_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<topic xmlns="http://www.imsglobal.org/xsd/imsccv1p1/imsdt_v1p1">
+  <title>{title}</title>
+  <text texttype="text/html">{text}</text>
+</topic>
+"""
+
+ASSIGNMENT_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<assignment xmlns="http://www.imsglobal.org/xsd/imscc_extensions/assignment" identifier="{identifier}">
+  <title>{title}</title>
+  <text texttype="text/html">{text}</text>
+  <submission_formats>
+    <format type="html"/>
+    <format type="file"/>
+  </submission_formats>
+</assignment>
+"""
+
+QTI_ASSESSMENT_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<questestinterop xmlns="http://www.imsglobal.org/xsd/ims_qtiasiv1p2">
+  <assessment ident="{identifier}" title="{title}">
+    <section ident="{identifier}_section">
+{items}
+    </section>
+  </assessment>
+</questestinterop>
+"""
+
+QTI_ITEM_TEMPLATE = """      <item ident="{identifier}" title="Question">
+        <itemmetadata>
+          <qtimetadata>
+            <qtimetadatafield>
+              <fieldlabel>cc_profile</fieldlabel>
+              <fieldentry>{profile}</fieldentry>
+            </qtimetadatafield>
+          </qtimetadata>
+        </itemmetadata>
+        <presentation>
+          <material>
+            <mattext texttype="text/html">{description}</mattext>
+          </material>
+{response}
+        </presentation>
+        <resprocessing>
+{respconditions}
+        </resprocessing>
+      </item>"""
+
+QTI_CHOICE_RESPONSE_TEMPLATE = """          <response_lid ident="response1" rcardinality="{cardinality}">
+            <render_choice>
+{labels}
+            </render_choice>
+          </response_lid>"""
+
+QTI_RESPONSE_LABEL_TEMPLATE = """              <response_label ident="{ident}">
+                <material>
+                  <mattext texttype="text/plain">{text}</mattext>
+                </material>
+              </response_label>"""
+
+QTI_TEXT_RESPONSE = """          <response_str ident="response1" rcardinality="Single">
+            <render_fib>
+              <response_label ident="answer1" rshuffle="No"/>
+            </render_fib>
+          </response_str>"""
+
+QTI_RESPCONDITION_TEMPLATE = """          <respcondition continue="No">
+            <conditionvar>
+{conditions}
+            </conditionvar>
+            <setvar action="Set" varname="SCORE">100</setvar>
+          </respcondition>"""
+
+MODULE_META_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<modules xmlns="http://canvas.instructure.com/xsd/cccv1p0">
+{modules}
+</modules>
+"""
+
+
+@dataclass
+class CartridgeSpec:
+    """
+    Describe the size and the content mix of a synthetic cartridge.
+
+    The resource numbers are per module.
+    """
+
+    modules: int = 10
+    html_pages: int = 20
+    html_paragraphs: int = 20
+    qti_assessments: int = 2
+    qti_items_per_profile: int = 10
+    web_links: int = 5
+    lti_links: int = 2
+    discussions: int = 2
+    assignments: int = 2
+    static_files: int = 50
+    static_file_size: int = 32 * 1024
+    canvas: bool = False
+    seed: int = 0
+
+
+class CartridgeGenerator:
+    """
+    Generate a synthetic Common Cartridge file.
+    """
+
+    def __init__(self, spec: CartridgeSpec) -> None:
+        self._spec = spec
+        self._random = random.Random(spec.seed)
+        self._files: List[Tuple[str, bytes]] = []
+        self._resources: List[str] = []
+
+    def generate(self, cartridge_path: Path) -> Path:
+        """
+        Write the cartridge to the provided path.
+        """
+        static_file_names = self._add_static_files()
+        modules = [self._add_module(module_index, static_file_names) for module_index in range(self._spec.modules)]
+
+        manifest = MANIFEST_TEMPLATE.format(
+            manifest_namespace=MANIFEST_NAMESPACE,
+            lom_namespace=LOM_NAMESPACE,
+            items="\n".join(module_item for module_item, _ in modules),
+            resources="\n".join(self._resources),
+        )
+        self._files.insert(0, ("imsmanifest.xml", manifest.encode()))
+
+        if self._spec.canvas:
+            module_meta = MODULE_META_TEMPLATE.format(modules="\n".join(module_meta for _, module_meta in modules))
+            self._files.append(("course_settings/module_meta.xml", module_meta.encode()))
+            self._files.append(("course_settings/canvas_export.txt", b"Synthetic Canvas export."))
+
+        with zipfile.ZipFile(cartridge_path, "w", zipfile.ZIP_DEFLATED) as cartridge:
+            for file_name, content in self._files:
+                cartridge.writestr(file_name, content)
+
+        return cartridge_path
+
+    def _add_static_files(self) -> List[str]:
+        """
+        Add the static files to "web_resources" directory.
+        """
+        file_names = []
+
+        for index in range(self._spec.static_files):
+            file_name = f"images/folder_{index % 10}/image_{index}.png"
+            self._files.append((f"web_resources/{file_name}", self._random.randbytes(self._spec.static_file_size)))
+            file_names.append(file_name)
+
+        return file_names
+
+    def _add_module(self, module_index: int, static_file_names: List[str]) -> Tuple[str, str]:
+        """
+        Add the module resources and provide its organization item and Canvas module meta markup.
+        """
+        spec = self._spec
+        prefix = f"module_{module_index}"
+        resource_identifiers = [
+            *(self._add_html_page(f"{prefix}_html_{index}", static_file_names) for index in range(spec.html_pages)),
+            *(self._add_qti_assessment(f"{prefix}_qti_{index}") for index in range(spec.qti_assessments)),
+            *(self._add_web_link(f"{prefix}_web_link_{index}") for index in range(spec.web_links)),
+            *(self._add_lti_link(f"{prefix}_lti_{index}", index) for index in range(spec.lti_links)),
+            *(self._add_discussion(f"{prefix}_discussion_{index}") for index in range(spec.discussions)),
+            *(self._add_assignment(f"{prefix}_assignment_{index}") for index in range(spec.assignments)),
+        ]
+
+        leaf_items = "\n".join(
+            f'          <item identifier="{identifier}_item" identifierref="{identifier}">\n'
+            f"            <title>{identifier}</title>\n"
+            f"          </item>"
+            for identifier in resource_identifiers
+        )
+        module_item = (
+            f'        <item identifier="{prefix}">\n'
+            f"          <title>Module {module_index}</title>\n"
+            f"{leaf_items}\n"
+            f"        </item>"
+        )
+        module_meta_items = "\n".join(
+            f'      <item identifier="{identifier}_item">\n'
+            f"        <content_type>WikiPage</content_type>\n"
+            f"        <title>{identifier}</title>\n"
+            f"        <identifierref>{identifier}</identifierref>\n"
+            f"      </item>"
+            for identifier in resource_identifiers
+        )
+        module_meta = (
+            f'  <module identifier="{prefix}">\n'
+            f"    <title>Module {module_index}</title>\n"
+            f"    <items>\n{module_meta_items}\n    </items>\n"
+            f"  </module>"
+        )
+        return module_item, module_meta
+
+    def _add_resource(self, identifier: str, resource_type: str, file_name: str, content: str) -> str:
+        """
+        Add the resource file and its manifest entry.
+        """
+        self._files.append((file_name, content.encode()))
+        self._resources.append(
+            f'    <resource identifier="{identifier}" type="{resource_type}" href="{file_name}">\n'
+            f'      <file href="{file_name}"/>\n'
+            f"    </resource>"
+        )
+        return identifier
+
+    def _add_html_page(self, identifier: str, static_file_names: List[str]) -> str:
+        paragraphs = []
+
+        for index in range(self._spec.html_paragraphs):
+            paragraphs.append(f"<p>{self._sentence(30)}</p>")
+            if static_file_names and index % 5 == 0:
+                image = self._random.choice(static_file_names)
+                paragraphs.append(f'<img src="%24IMS-CC-FILEBASE%24/{image}" alt="{image}"/>')
+
+        content = HTML_PAGE_TEMPLATE.format(title=identifier, body="\n".join(paragraphs))
+        return self._add_resource(identifier, "webcontent", f"wiki_content/{identifier}.html", content)
+
+    def _add_qti_assessment(self, identifier: str) -> str:
+        items = [
+            self._build_qti_item(f"{identifier}_{profile}_{index}", profile)
+            for profile in QTI_PROFILES
+            for index in range(self._spec.qti_items_per_profile)
+        ]
+        content = QTI_ASSESSMENT_TEMPLATE.format(identifier=identifier, title=identifier, items="\n".join(items))
+        return self._add_resource(
+            identifier,
+            "imsqti_xmlv1p2/imscc_xmlv1p1/assessment",
+            f"{identifier}/assessment_qti.xml",
+            content,
+        )
+
+    def _build_qti_item(self, identifier: str, profile: str) -> str:
+        description = escape(f"<p>{self._sentence(20)}?</p>")
+
+        if profile == "cc.fib.v0p1":
+            response = QTI_TEXT_RESPONSE
+            conditions = f'              <varequal respident="response1">{self._sentence(2)}</varequal>'
+        elif profile == "cc.essay.v0p1":
+            response = QTI_TEXT_RESPONSE
+            conditions = "              <other/>"
+        else:
+            choices_number = 2 if profile == "cc.true_false.v0p1" else 4
+            cardinality = "Multiple" if profile == "cc.multiple_response.v0p1" else "Single"
+            labels = "\n".join(
+                QTI_RESPONSE_LABEL_TEMPLATE.format(ident=f"choice{index}", text=self._sentence(5))
+                for index in range(choices_number)
+            )
+            response = QTI_CHOICE_RESPONSE_TEMPLATE.format(cardinality=cardinality, labels=labels)
+            conditions = '              <varequal respident="response1">choice0</varequal>'
+
+        return QTI_ITEM_TEMPLATE.format(
+            identifier=identifier,
+            profile=profile,
+            description=description,
+            response=response,
+            respconditions=QTI_RESPCONDITION_TEMPLATE.format(conditions=conditions),
+        )
+
+    def _add_web_link(self, identifier: str) -> str:
+        content = WEB_LINK_TEMPLATE.format(title=identifier, url=quoteattr(f"https://example.com/{identifier}"))
+        return self._add_resource(identifier, "imswl_xmlv1p1", f"weblinks/{identifier}.xml", content)
+
+    def _add_lti_link(self, identifier: str, index: int) -> str:
+        content = LTI_LINK_TEMPLATE.format(title=identifier, description=self._sentence(10), index=index)
+        return self._add_resource(identifier, "imsbasiclti_xmlv1p0", f"lti/{identifier}.xml", content)
+
+    def _add_discussion(self, identifier: str) -> str:
+        content = DISCUSSION_TEMPLATE.format(title=identifier, text=escape(f"<p>{self._sentence(40)}</p>"))
+        return self._add_resource(identifier, "imsdt_xmlv1p1", f"discussions/{identifier}.xml", content)
+
+    def _add_assignment(self, identifier: str) -> str:
+        content = ASSIGNMENT_TEMPLATE.format(
+            identifier=identifier,
+            title=identifier,
+            text=escape(f"<p>{self._sentence(40)}</p>"),
+        )
+        return self._add_resource(identifier, "assignment_xmlv1p0", f"assignments/{identifier}.xml", content)
+
+    def _sentence(self, words_number: int) -> str:
+        return " ".join(self._random.choices(LOREM_IPSUM_WORDS, k=words_number))
+
+
+def generate_cartridge(cartridge_path: Path, spec: CartridgeSpec) -> Path:
+    """
+    Generate the synthetic cartridge described by the spec.
+    """
+    return CartridgeGenerator(spec).generate(cartridge_path)
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the cartridge spec fields to the parser as options.
+    """
+    for field in fields(CartridgeSpec):
+        option = f"--{field.name.replace('_', '-')}"
+        if field.type is bool:
+            parser.add_argument(option, action="store_true", help=f"Default: {field.default}.")
+        else:
+            parser.add_argument(option, type=field.type, default=field.default, help=f"Default: {field.default}.")
+
+
+def build_spec(args: argparse.Namespace) -> CartridgeSpec:
+    """
+    Build the cartridge spec from the parsed options.
+    """
+    return CartridgeSpec(**{field.name: getattr(args, field.name) for field in fields(CartridgeSpec)})
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic Common Cartridge file.")
+    parser.add_argument("output", type=Path, help="Path of the generated .imscc file.")
+    add_spec_arguments(parser)
+    return parser.parse_args(args)
+
+
+def main():
+    args = parse_args()
+    cartridge_path = generate_cartridge(args.output, build_spec(args))
+    print(f"Generated {cartridge_path} ({cartridge_path.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
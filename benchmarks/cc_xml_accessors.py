@@ -0,0 +1,57 @@
+"""
+Measure the Common Cartridge QTI element accessors lookup time.
+
+Usage::
+
+    python -m benchmarks.cc_xml_accessors --number 10000
+"""
+
+import argparse
+import timeit
+
+from lxml import etree
+
+from benchmarks.qti_parsing import FIXTURE_ASSESSMENT_PATH
+from cc2olx.xml import cc_xml
+
+ITEM_ACCESSORS = {
+    "QtiItem.profile": lambda item: item.profile,
+    "QtiItem.presentation": lambda item: item.presentation,
+    "QtiItem.description": lambda item: item.description,
+    "QtiItem.qtimetadatafields": lambda item: item.qtimetadatafields,
+    "QtiItem.get_itemfeedback": lambda item: item.get_itemfeedback("general_fb"),
+    "QtiPresentation.response_labels": lambda item: item.presentation.response_labels,
+    "QtiResprocessing.respconditions": lambda item: item.resprocessing.respconditions,
+}
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description="Benchmark Common Cartridge QTI element accessors.")
+    parser.add_argument("--number", type=int, default=10000, help="Number of lookups per accessor and item.")
+    return parser.parse_args(args)
+
+
+def run(number):
+    """
+    Call every accessor on the fixture assessment items and provide microseconds per lookup values.
+    """
+    parser = cc_xml.CommonCartridgeXmlParser()
+    items = etree.parse(str(FIXTURE_ASSESSMENT_PATH), parser).getroot().items
+    results = {}
+
+    for name, accessor in ITEM_ACCESSORS.items():
+        elapsed = sum(timeit.timeit(lambda: accessor(item), number=number) for item in items)
+        results[name] = elapsed / (number * len(items)) * 1e6
+
+    return results
+
+
+def main():
+    args = parse_args()
+
+    for name, microseconds in run(args.number).items():
+        print(f"{name:<35} {microseconds:>8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
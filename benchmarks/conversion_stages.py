@@ -0,0 +1,104 @@
+"""
+Measure the duration of every conversion stage on a synthetic or provided cartridge.
+
+The stages are: extract, manifest parse, normalize, process, post-process,
+serialize and package. The cartridge is converted with `convert_one_file` and
+the durations are collected by a conversion hook. The content processing and
+post-processing are the durations of the content processor and post-processor
+calls, the rest of the OLX writing and the policy writing is serialization.
+
+Usage::
+
+    python -m benchmarks.conversion_stages --repeat 3 --modules 20 --html-pages 50
+    python -m benchmarks.conversion_stages --cartridge test_data/allyworkshop.imscc
+"""
+
+import argparse
+import logging
+import statistics
+import tempfile
+from pathlib import Path
+
+from benchmarks.cartridge_generator import add_spec_arguments, build_spec, generate_cartridge
+from cc2olx.conversion_hooks import BaseConversionHook, ConversionHooks
+from cc2olx.main import convert_one_file, initialize_django
+
+STAGES = ("extract", "manifest parse", "normalize", "process", "post-process", "serialize", "package")
+
+# The benchmark stages of the conversion stages.
+CONVERSION_STAGES = {
+    "extract": "extract",
+    "load_manifest": "manifest parse",
+    "normalize": "normalize",
+    "olx": "serialize",
+    "policy": "serialize",
+    "package": "package",
+}
+
+
+class StageTimer(BaseConversionHook):
+    """
+    Collect the stage durations of several conversion runs.
+    """
+
+    def __init__(self):
+        self.durations = {stage: [] for stage in STAGES}
+        self._run_durations = {}
+
+    def on_conversion_start(self, input_file):
+        self._run_durations = dict.fromkeys(STAGES, 0.0)
+
+    def on_conversion_end(self, input_file, succeeded, duration):
+        for stage, stage_duration in self._run_durations.items():
+            self.durations[stage].append(stage_duration)
+
+    def on_stage_end(self, stage, duration):
+        self._run_durations[CONVERSION_STAGES[stage]] += duration
+
+    def on_content_processor_end(self, processor_name, idref, duration):
+        self._run_durations["process"] += duration
+        self._run_durations["serialize"] -= duration
+
+    def on_content_post_processor_end(self, processor_name, idref, duration):
+        self._run_durations["post-process"] += duration
+        self._run_durations["serialize"] -= duration
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description="Benchmark the conversion stages.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of conversion runs.")
+    parser.add_argument("--cartridge", type=Path, help="Cartridge to convert instead of the synthetic one.")
+    add_spec_arguments(parser)
+    return parser.parse_args(args)
+
+
+def run(cartridge_path, repeat):
+    """
+    Convert the cartridge several times and provide the stage durations.
+    """
+    timer = StageTimer()
+
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as workspace:
+            convert_one_file(cartridge_path, Path(workspace), hooks=ConversionHooks([timer]))
+
+    return timer.durations
+
+
+def main():
+    args = parse_args()
+    initialize_django()
+    # The conversion warnings aren't relevant to the measurements.
+    logging.basicConfig(level=logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cartridge_path = args.cartridge or generate_cartridge(Path(temp_dir) / "synthetic.imscc", build_spec(args))
+        durations = run(cartridge_path, args.repeat)
+
+    print(f"{'stage':<16} {'min, s':>10} {'median, s':>10}")
+    for stage, stage_durations in durations.items():
+        print(f"{stage:<16} {min(stage_durations):>10.3f} {statistics.median(stage_durations):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Measure the logging overhead of the conversion.
+
+The cost of a single per-item message is measured first, then the synthetic
+or provided cartridge is converted with the different logging configurations
+writing to a file:
+
+* disabled - WARNING level, the per-item messages are filtered out by level;
+* file - INFO level, the records are formatted and written synchronously;
+* queued file - INFO level, the records are written by a background thread;
+* summary - INFO level, the per-item messages are aggregated into counters.
+
+Usage::
+
+    python -m benchmarks.logging_overhead --repeat 3 --modules 20 --html-pages 50
+    python -m benchmarks.logging_overhead --cartridge test_data/allyworkshop.imscc
+"""
+
+import argparse
+import logging
+import statistics
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+from django.conf import settings
+
+from benchmarks.cartridge_generator import add_spec_arguments, build_spec, generate_cartridge
+from cc2olx.logs import LoggingSetup, details_logger
+from cc2olx.main import convert_one_file, initialize_django
+
+MODES = ("disabled", "file", "queued file", "summary")
+
+
+class SynchronousFileLogging:
+    """
+    Write the logs to the file in the logging thread, like `logging.basicConfig` does.
+    """
+
+    def __init__(self, level, log_file):
+        self._handler = logging.FileHandler(log_file, encoding="utf-8")
+        self._handler.setFormatter(logging.Formatter(settings.LOG_FORMAT))
+        logging.getLogger().addHandler(self._handler)
+        logging.getLogger().setLevel(level)
+
+    def log_summary(self):
+        pass
+
+    def shutdown(self):
+        logging.getLogger().removeHandler(self._handler)
+        self._handler.close()
+
+
+def set_up_logging(mode, log_file):
+    if mode == "disabled":
+        return LoggingSetup("WARNING", log_file)
+    if mode == "file":
+        return SynchronousFileLogging("INFO", log_file)
+    return LoggingSetup("INFO", log_file, summary=mode == "summary")
+
+
+def measure_message_costs(number, log_file):
+    """
+    Provide the average cost of a details logger message in every logging mode, in microseconds.
+    """
+    costs = {}
+    root_logger_level = logging.getLogger().level
+
+    try:
+        for mode in MODES:
+            logging_setup = set_up_logging(mode, log_file)
+            duration = timeit.timeit(lambda: details_logger.info("Loading file %s", log_file), number=number)
+            logging_setup.shutdown()
+            costs[mode] = duration / number * 1e6
+    finally:
+        logging.getLogger().setLevel(root_logger_level)
+
+    return costs
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description="Benchmark the conversion logging overhead.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of conversion runs per logging mode.")
+    parser.add_argument("--cartridge", type=Path, help="Cartridge to convert instead of the synthetic one.")
+    add_spec_arguments(parser)
+    return parser.parse_args(args)
+
+
+def run(cartridge_path, repeat):
+    """
+    Convert the cartridge with every logging mode and provide the durations and the log sizes.
+    """
+    durations = {mode: [] for mode in MODES}
+    log_sizes = {}
+    root_logger_level = logging.getLogger().level
+
+    try:
+        for _ in range(repeat):
+            for mode in MODES:
+                with tempfile.TemporaryDirectory() as workspace:
+                    log_file = Path(workspace) / "conversion.log"
+                    logging_setup = set_up_logging(mode, log_file)
+
+                    start = time.perf_counter()
+                    convert_one_file(cartridge_path, Path(workspace) / "output")
+                    logging_setup.log_summary()
+                    logging_setup.shutdown()
+                    durations[mode].append(time.perf_counter() - start)
+
+                    log_sizes[mode] = log_file.stat().st_size
+    finally:
+        logging.getLogger().setLevel(root_logger_level)
+
+    return durations, log_sizes
+
+
+def main():
+    args = parse_args()
+    initialize_django()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        message_costs = measure_message_costs(100000, Path(temp_dir) / "messages.log")
+        cartridge_path = args.cartridge or generate_cartridge(Path(temp_dir) / "synthetic.imscc", build_spec(args))
+        durations, log_sizes = run(cartridge_path, args.repeat)
+
+    print(f"{'mode':<12} {'message, us':>12}")
+    for mode, cost in message_costs.items():
+        print(f"{mode:<12} {cost:>12.2f}")
+    print()
+
+    baseline = min(durations["disabled"])
+    print(f"{'mode':<12} {'min, s':>10} {'median, s':>10} {'overhead':>10} {'log, KiB':>10}")
+    for mode, mode_durations in durations.items():
+        best = min(mode_durations)
+        print(
+            f"{mode:<12} {best:>10.3f} {statistics.median(mode_durations):>10.3f} "
+            f"{(best - baseline) / baseline:>10.1%} {log_sizes[mode] / 1024:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
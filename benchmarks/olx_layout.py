@@ -0,0 +1,80 @@
+"""
+Measure the import archive build time of the inline and the exploded OLX layouts.
+
+The synthetic or provided cartridge is converted with both layouts, the OLX
+writing and the archive packaging stages are measured. The exploded layout
+block files are written by the given number of threads.
+
+Usage::
+
+    python -m benchmarks.olx_layout --repeat 3 --workers 4 --modules 20 --html-pages 50
+    python -m benchmarks.olx_layout --cartridge test_data/allyworkshop.imscc
+"""
+
+import argparse
+import logging
+import statistics
+import tempfile
+from pathlib import Path
+
+from benchmarks.cartridge_generator import add_spec_arguments, build_spec, generate_cartridge
+from cc2olx.main import convert_one_file, initialize_django
+from cc2olx.stats import ConversionStats
+
+LAYOUTS = ("inline", "exploded")
+STAGES = ("olx", "package")
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description="Benchmark the import archive build of the OLX layouts.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of conversion runs per layout.")
+    parser.add_argument("--workers", type=int, default=4, help="Number of the exploded layout writing threads.")
+    parser.add_argument("--cartridge", type=Path, help="Cartridge to convert instead of the synthetic one.")
+    add_spec_arguments(parser)
+    return parser.parse_args(args)
+
+
+def run(cartridge_path, repeat, workers):
+    """
+    Convert the cartridge with every layout and provide the stage durations and the archive sizes.
+    """
+    durations = {layout: {stage: [] for stage in STAGES} for layout in LAYOUTS}
+    archive_sizes = {}
+
+    for _ in range(repeat):
+        for layout in LAYOUTS:
+            with tempfile.TemporaryDirectory() as workspace:
+                stats = convert_one_file(
+                    cartridge_path,
+                    Path(workspace) / "output",
+                    stats=ConversionStats(cartridge_path),
+                    exploded_olx_workers=workers if layout == "exploded" else None,
+                )
+
+            for stage in STAGES:
+                durations[layout][stage].append(stats.stages[stage].wall_time)
+            archive_sizes[layout] = stats.output_size
+
+    return durations, archive_sizes
+
+
+def main():
+    args = parse_args()
+    initialize_django()
+    # The conversion warnings aren't relevant to the measurements.
+    logging.basicConfig(level=logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cartridge_path = args.cartridge or generate_cartridge(Path(temp_dir) / "synthetic.imscc", build_spec(args))
+        durations, archive_sizes = run(cartridge_path, args.repeat, args.workers)
+
+    print(f"{'layout':<10} {'stage':<10} {'min, s':>10} {'median, s':>10}")
+    for layout, layout_durations in durations.items():
+        totals = [sum(run_durations) for run_durations in zip(*layout_durations.values())]
+        for stage, stage_durations in {**layout_durations, "total": totals}.items():
+            print(f"{layout:<10} {stage:<10} {min(stage_durations):>10.3f} {statistics.median(stage_durations):>10.3f}")
+        print(f"{layout:<10} archive size {archive_sizes[layout]} bytes")
+
+
+if __name__ == "__main__":
+    main()
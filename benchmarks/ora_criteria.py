@@ -0,0 +1,71 @@
+"""
+Measure the default ORA rubric criteria creation cost per assignment.
+
+The criteria built from the loaded rubric library are compared with the
+criteria parsed from their markup for every assignment and with the clones of
+the parsed criteria.
+
+Usage::
+
+    python -m benchmarks.ora_criteria --assignments 2000
+"""
+
+import argparse
+import time
+import xml.dom.minidom
+
+from django.conf import settings
+
+from cc2olx.content_processors.utils import generate_default_ora_criteria
+from cc2olx.main import initialize_django
+
+METHODS = ("parse", "clone", "build")
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description="Benchmark the default ORA rubric criteria creation.")
+    parser.add_argument(
+        "--assignments", type=int, default=2000, help="Number of assignments to create the criteria for."
+    )
+    return parser.parse_args(args)
+
+
+def run(assignments_number):
+    """
+    Create the criteria of the assignments with every method and provide microseconds per assignment values.
+    """
+    document = xml.dom.minidom.parse(str(settings.ORA_RUBRIC_CRITERIA_PATH))
+    parsed_criteria = document.documentElement.getElementsByTagName("criterion")
+    criteria_markup = [criterion.toxml() for criterion in parsed_criteria]
+
+    methods = {
+        "parse": lambda: [xml.dom.minidom.parseString(markup).documentElement for markup in criteria_markup],
+        "clone": lambda: [criterion.cloneNode(deep=True) for criterion in parsed_criteria],
+        "build": generate_default_ora_criteria,
+    }
+    # The rubric library is loaded before the measurement, as it's done once per run.
+    generate_default_ora_criteria()
+    results = {}
+
+    for method in METHODS:
+        create_criteria = methods[method]
+        start = time.perf_counter()
+        for _ in range(assignments_number):
+            create_criteria()
+        elapsed = time.perf_counter() - start
+
+        results[method] = elapsed / assignments_number * 1_000_000
+
+    return results
+
+
+def main():
+    args = parse_args()
+    initialize_django()
+
+    for method, microseconds in run(args.assignments).items():
+        print(f"{method:<10} {microseconds:>10.1f} us/assignment")
+
+
+if __name__ == "__main__":
+    main()
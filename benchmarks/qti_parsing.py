@@ -0,0 +1,88 @@
+"""
+Measure QTI assessment parsing throughput with the different number of worker processes.
+
+The assessment is built by repeating the items of the test fixture assessment.
+
+Usage::
+
+    python -m benchmarks.qti_parsing --repeat 1000 --workers 0 2 4
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+from cc2olx.content_processors.qti import QtiContentProcessor
+from cc2olx.main import initialize_django
+
+FIXTURE_ASSESSMENT_PATH = (
+    Path(__file__).parent.parent
+    / "tests"
+    / "fixtures_data"
+    / "imscc_files"
+    / "main"
+    / "resource_4_qti"
+    / "assessment_qti.xml"
+)
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description="Benchmark QTI assessment parsing.")
+    parser.add_argument("--repeat", type=int, default=1000, help="Number of times the fixture items are repeated.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[0, 2, 4],
+        help="Values of QTI_PARALLEL_WORKERS setting to measure.",
+    )
+    return parser.parse_args(args)
+
+
+def build_assessment(repeat):
+    """
+    Build the assessment containing the fixture assessment items repeated the specified number of times.
+    """
+    assessment = FIXTURE_ASSESSMENT_PATH.read_text()
+    head, section = assessment.split("<section", 1)
+    section_start_tag, section = section.split(">", 1)
+    items, tail = section.rsplit("</section>", 1)
+    return f"{head}<section{section_start_tag}>{items * repeat}</section>{tail}"
+
+
+def run(assessment_path, workers_values):
+    """
+    Parse the assessment with every number of workers and provide problems per second values.
+    """
+    processor = QtiContentProcessor(cartridge=None, context=None)
+    results = {}
+
+    for workers in workers_values:
+        settings.QTI_PARALLEL_WORKERS = workers
+
+        start = time.perf_counter()
+        problems_number = sum(1 for _ in processor._parse_qti(assessment_path))
+        elapsed = time.perf_counter() - start
+
+        results[workers] = problems_number / elapsed
+
+    return results
+
+
+def main():
+    args = parse_args()
+    initialize_django()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        assessment_path = Path(temp_dir) / "assessment_qti.xml"
+        assessment_path.write_text(build_assessment(args.repeat))
+
+        for workers, problems_per_second in run(assessment_path, args.workers).items():
+            print(f"workers={workers:<4} {problems_per_second:>10.0f} problems/s")
+
+
+if __name__ == "__main__":
+    main()
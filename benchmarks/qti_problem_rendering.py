@@ -0,0 +1,86 @@
+"""
+Measure QTI problem OLX nodes creation throughput per question type.
+
+Usage::
+
+    python -m benchmarks.qti_problem_rendering --problems 5000
+"""
+
+import argparse
+import time
+from collections import OrderedDict
+
+from cc2olx.content_processors.qti import QtiContentProcessor, QtiQuestionType
+from cc2olx.main import initialize_django
+
+PROBLEM_DESCRIPTION = "&lt;p&gt;Which of the following is &lt;strong&gt;true&lt;/strong&gt;?&lt;/p&gt;"
+
+SAMPLE_PROBLEMS = {
+    QtiQuestionType.MULTIPLE_CHOICE: {
+        "problem_description": PROBLEM_DESCRIPTION,
+        "choices": OrderedDict(
+            (str(index), {"text": f"Answer {index} & more", "correct": index == 2}) for index in range(4)
+        ),
+    },
+    QtiQuestionType.MULTIPLE_RESPONSE: {
+        "problem_description": PROBLEM_DESCRIPTION,
+        "choices": OrderedDict(
+            (str(index), {"text": f"Answer {index} & more", "correct": index % 2 == 0}) for index in range(6)
+        ),
+    },
+    QtiQuestionType.FILL_IN_THE_BLANK: {
+        "problem_description": PROBLEM_DESCRIPTION,
+        "is_regexp": False,
+        "answer": "Paris",
+        "additional_answers": ["paris", "Paris, France"],
+    },
+    QtiQuestionType.ESSAY: {
+        "problem_description": "Describe the <b>main idea</b> of the chapter.",
+        "general_fb": "Thank you for the answer.",
+        "sample_solution": "<p>The main idea is...</p>",
+    },
+    QtiQuestionType.BOOLEAN: {
+        "problem_description": PROBLEM_DESCRIPTION,
+        "choices": OrderedDict([("1", {"text": "True", "correct": True}), ("2", {"text": "False", "correct": False})]),
+    },
+}
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description="Benchmark QTI problem OLX nodes creation.")
+    parser.add_argument("--problems", type=int, default=5000, help="Number of problems to create per question type.")
+    return parser.parse_args(args)
+
+
+def run(problems_number):
+    """
+    Create the problems of every question type and provide problems per second values.
+    """
+    processor = QtiContentProcessor(cartridge=None, context=None)
+    results = {}
+
+    for question_type, sample_problem in SAMPLE_PROBLEMS.items():
+        content = [
+            {"ident": f"problem{index}", "cc_profile": question_type, **sample_problem}
+            for index in range(problems_number)
+        ]
+
+        start = time.perf_counter()
+        processor._create_nodes(content)
+        elapsed = time.perf_counter() - start
+
+        results[question_type.name] = problems_number / elapsed
+
+    return results
+
+
+def main():
+    args = parse_args()
+    initialize_django()
+
+    for question_type, problems_per_second in run(args.problems).items():
+        print(f"{question_type:<20} {problems_per_second:>10.0f} problems/s")
+
+
+if __name__ == "__main__":
+    main()
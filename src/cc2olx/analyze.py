@@ -0,0 +1,235 @@
+"""
+Analysis of Common Cartridge files without their conversion.
+
+The cartridge is read right from the zip archive: the manifest, Canvas module
+meta and QTI assessments are parsed incrementally, the file sizes are taken
+from the archive directory. Nothing is extracted, so thousands of cartridges
+can be scanned to find the huge or unusual ones before their conversion.
+"""
+
+import functools
+import json
+import logging
+import re
+import zipfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, IO, Iterable, Iterator, List, Optional
+
+import attrs
+from django.conf import settings
+
+from cc2olx import filesystem
+from cc2olx.constants import BYTES_IN_MEGABYTE
+from cc2olx.enums import CommonCartridgeResourceType
+from cc2olx.models import CANVAS_REPORT, COURSE_SETTINGS_DIR, MANIFEST, MODULE_META
+from cc2olx.utils import clean_file_name
+from cc2olx.xml import cc_xml
+
+logger = logging.getLogger()
+
+WEB_RESOURCES_DIR = "web_resources/"
+HTML_FILE_EXTENSIONS = (".html", ".htm")
+
+
+@attrs.define
+class CartridgeAnalysis:
+    """
+    Encapsulate the Common Cartridge analysis results.
+
+    The static bytes are the uncompressed size of the files copied to the OLX
+    static directory. The estimated conversion time is a linear function of
+    the resources, QTI items and archive size, see `ANALYSIS_TIME_COEFFICIENTS`
+    setting.
+    """
+
+    input_file: Path
+    error: Optional[str] = None
+    is_canvas_flavor: bool = False
+    archive_size: int = 0
+    uncompressed_size: int = 0
+    files: int = 0
+    module_items: int = 0
+    resources: int = 0
+    resources_by_type: Dict[str, int] = attrs.field(factory=Counter)
+    unsupported_resources_by_type: Dict[str, int] = attrs.field(factory=Counter)
+    qti_items_by_profile: Dict[str, int] = attrs.field(factory=Counter)
+    static_files: int = 0
+    static_bytes: int = 0
+    estimated_time: float = 0.0
+
+    def to_dict(self) -> dict:
+        """
+        Provide the JSON serializable analysis representation.
+        """
+        return attrs.asdict(self, value_serializer=lambda _instance, _field, value: _serialize_value(value))
+
+
+def _serialize_value(value):
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, Counter):
+        return dict(value.most_common())
+    return value
+
+
+def is_supported_resource_type(resource_type: str) -> bool:
+    """
+    Check whether the resource type can be converted by the content processors.
+    """
+    return any(re.match(supported_type, resource_type) for supported_type in CommonCartridgeResourceType)
+
+
+def estimate_conversion_time(analysis: CartridgeAnalysis, time_coefficients: Dict[str, float]) -> float:
+    """
+    Estimate the cartridge conversion duration in seconds.
+    """
+    return (
+        time_coefficients["cartridge"]
+        + time_coefficients["resource"] * analysis.resources
+        + time_coefficients["qti_item"] * sum(analysis.qti_items_by_profile.values())
+        + time_coefficients["megabyte"] * analysis.uncompressed_size / BYTES_IN_MEGABYTE
+    )
+
+
+def analyze_cartridge(
+    input_file: Path,
+    time_coefficients: Dict[str, float],
+    count_qti_items: bool = True,
+) -> CartridgeAnalysis:
+    """
+    Analyze the Common Cartridge file without its extraction.
+    """
+    analysis = CartridgeAnalysis(input_file)
+
+    try:
+        analysis.archive_size = input_file.stat().st_size
+        with zipfile.ZipFile(input_file) as cartridge_zip:
+            _analyze_zip(analysis, cartridge_zip, count_qti_items)
+    except Exception as exc:
+        logger.exception("Error while analyzing %s file", input_file)
+        analysis.error = f"{type(exc).__name__}: {exc}"
+    else:
+        analysis.estimated_time = estimate_conversion_time(analysis, time_coefficients)
+
+    return analysis
+
+
+def _analyze_zip(analysis: CartridgeAnalysis, cartridge_zip: zipfile.ZipFile, count_qti_items: bool) -> None:
+    # The member names are cleaned the same way as during the extraction to match the manifest hrefs.
+    members = {clean_file_name(info.filename): info for info in cartridge_zip.infolist() if not info.is_dir()}
+    analysis.files = len(members)
+    analysis.uncompressed_size = sum(info.file_size for info in members.values())
+
+    static_paths = {name for name in members if name.startswith(WEB_RESOURCES_DIR)}
+
+    for resource_type, file_hrefs in _iter_manifest_resources(cartridge_zip, members[MANIFEST]):
+        analysis.resources += 1
+        analysis.resources_by_type[resource_type] += 1
+
+        if not is_supported_resource_type(resource_type):
+            analysis.unsupported_resources_by_type[resource_type] += 1
+        elif resource_type == CommonCartridgeResourceType.WEB_CONTENT:
+            # The web content files outside of web_resources directory are copied to the static directory too.
+            static_paths.update(
+                href for href in file_hrefs if href in members and not href.lower().endswith(HTML_FILE_EXTENSIONS)
+            )
+        elif count_qti_items and re.match(CommonCartridgeResourceType.QTI_ASSESSMENT, resource_type):
+            for href in file_hrefs:
+                if href in members:
+                    analysis.qti_items_by_profile.update(_iter_qti_item_profiles(cartridge_zip, members[href]))
+
+    analysis.static_files = len(static_paths)
+    analysis.static_bytes = sum(members[path].file_size for path in static_paths)
+
+    analysis.is_canvas_flavor = f"{COURSE_SETTINGS_DIR}/{CANVAS_REPORT}" in members
+    module_meta_info = members.get(f"{COURSE_SETTINGS_DIR}/{MODULE_META}")
+    if analysis.is_canvas_flavor and module_meta_info is not None:
+        with cartridge_zip.open(module_meta_info) as module_meta_file:
+            analysis.module_items = sum(1 for _ in filesystem.iter_xml_elements(module_meta_file, "{*}item"))
+
+
+def _iter_manifest_resources(cartridge_zip: zipfile.ZipFile, manifest_info: zipfile.ZipInfo) -> Iterator[tuple]:
+    """
+    Provide the type and the file hrefs of every manifest resource.
+    """
+    with cartridge_zip.open(manifest_info) as manifest_file:
+        for resource in filesystem.iter_xml_elements(manifest_file, "{*}resource"):
+            file_hrefs = [
+                file_element.get("href")
+                for file_element in resource.iterchildren("{*}file")
+                if file_element.get("href")
+            ]
+            yield resource.get("type", ""), file_hrefs
+
+
+def _iter_qti_item_profiles(cartridge_zip: zipfile.ZipFile, assessment_info: zipfile.ZipInfo) -> Iterator[str]:
+    """
+    Provide the `cc_profile` metadata field value of every QTI item.
+
+    Every item is freed as soon as its profile is read, so the item bodies
+    (e.g. the embedded images) aren't accumulated for the whole assessment.
+    """
+    with cartridge_zip.open(assessment_info) as assessment_file:
+        for item in filesystem.iter_xml_elements(assessment_file, "{*}item"):
+            if profile_entries := cc_xml.QtiItem.PROFILE_XPATH(item):
+                yield (profile_entries[0].text or "").strip()
+
+
+def analyze_cartridges(
+    input_files: Iterable[Path], workers: int = 1, count_qti_items: bool = True
+) -> Iterator[CartridgeAnalysis]:
+    """
+    Analyze the cartridges, in parallel processes if more than one worker is requested.
+    """
+    analyze = functools.partial(
+        analyze_cartridge,
+        time_coefficients=dict(settings.ANALYSIS_TIME_COEFFICIENTS),
+        count_qti_items=count_qti_items,
+    )
+
+    if workers <= 1:
+        yield from map(analyze, input_files)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(analyze, input_files, chunksize=settings.ANALYSIS_CHUNK_SIZE)
+
+
+def write_analysis_report(output: IO[str], analyses: Iterable[CartridgeAnalysis]) -> List[CartridgeAnalysis]:
+    """
+    Write the analyses as JSON lines as soon as they are ready.
+    """
+    written_analyses = []
+
+    for analysis in analyses:
+        output.write(json.dumps(analysis.to_dict()) + "\n")
+        output.flush()
+        written_analyses.append(analysis)
+
+    return written_analyses
+
+
+def log_analysis_summary(analyses: List[CartridgeAnalysis]) -> None:
+    """
+    Log the totals of the analyzed cartridges.
+    """
+    failed = [analysis for analysis in analyses if analysis.error]
+    unsupported_types = Counter()
+    for analysis in analyses:
+        unsupported_types.update(analysis.unsupported_resources_by_type)
+
+    logger.info(
+        "Analyzed %d cartridges (%d failed): %d resources, %d static bytes, estimated conversion time %.1f s.",
+        len(analyses),
+        len(failed),
+        sum(analysis.resources for analysis in analyses),
+        sum(analysis.static_bytes for analysis in analyses),
+        sum(analysis.estimated_time for analysis in analyses),
+    )
+    if unsupported_types:
+        logger.info(
+            "Unsupported resource types: %s",
+            ", ".join(f"{resource_type}={count}" for resource_type, count in unsupported_types.most_common()),
+        )
@@ -0,0 +1,103 @@
+"""
+Checkpoint journal of the batch conversion.
+
+Every converted cartridge is recorded in a JSON lines journal with the hashes
+of its source and its output archive. A rerun of the interrupted batch with
+`--resume` skips the cartridges whose source hasn't changed since they were
+converted and whose archive is still in the output folder.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+import attrs
+
+
+def hash_file(path: Path) -> str:
+    """
+    Provide the SHA-256 hex digest of the file content.
+    """
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+@attrs.define(frozen=True)
+class CheckpointEntry:
+    """
+    Encapsulate a converted cartridge record.
+
+    The output file path is relative to the output folder.
+    """
+
+    input_file: str
+    input_sha256: str
+    output_file: str
+    output_sha256: str
+    output_size: int
+
+
+class CheckpointJournal:
+    """
+    Record the converted cartridges in a JSON lines file.
+
+    The journal is started from scratch unless the batch is resumed, then the
+    new records are appended to the ones of the previous runs. Every record is
+    flushed to the disk, so it survives a host crash.
+    """
+
+    def __init__(self, path: Path, output_dir: Path, resume: bool = False) -> None:
+        self.path = path
+        self.output_dir = output_dir
+        self.entries: Dict[str, CheckpointEntry] = {}
+
+        if resume and path.exists():
+            with open(path, encoding="utf-8") as journal_input:
+                for line in journal_input:
+                    if line.strip():
+                        entry = CheckpointEntry(**json.loads(line))
+                        self.entries[entry.input_file] = entry
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._journal = open(path, "a" if resume else "w", encoding="utf-8")
+
+    def find_converted(self, input_file: Path) -> Optional[CheckpointEntry]:
+        """
+        Provide the record of the cartridge if its conversion result is still valid.
+
+        The source is hashed only if the cartridge is recorded and its output
+        archive exists with the recorded size.
+        """
+        entry = self.entries.get(str(input_file))
+        if entry is None:
+            return None
+
+        output_file = self.output_dir / entry.output_file
+        if not output_file.is_file() or output_file.stat().st_size != entry.output_size:
+            return None
+
+        return entry if hash_file(input_file) == entry.input_sha256 else None
+
+    def record(self, input_file: Path, output_file: Path) -> CheckpointEntry:
+        """
+        Append the converted cartridge to the journal.
+        """
+        entry = CheckpointEntry(
+            input_file=str(input_file),
+            input_sha256=hash_file(input_file),
+            output_file=str(output_file.relative_to(self.output_dir)),
+            output_sha256=hash_file(output_file),
+            output_size=output_file.stat().st_size,
+        )
+        self.entries[entry.input_file] = entry
+
+        self._journal.write(json.dumps(attrs.asdict(entry)) + "\n")
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+        return entry
+
+    def close(self) -> None:
+        self._journal.close()
@@ -4,10 +4,19 @@ import logging
 from pathlib import Path
 
 from cc2olx.enums import SupportedCustomBlockContentType
-from cc2olx.validators.cli import link_source_validator
+from cc2olx.validators.cli import link_source_validator, shard_validator
 
 RESULT_TYPE_FOLDER = "folder"
 RESULT_TYPE_ZIP = "zip"
+RESULT_TYPE_TGZ = "tgz"
+RESULT_TYPE_OLX = "olx"
+
+OLX_LAYOUT_INLINE = "inline"
+OLX_LAYOUT_EXPLODED = "exploded"
+
+ANALYZE_COMMAND = "analyze"
+PLAN_COMMAND = "plan"
+RUN_COMMAND = "run"
 
 logger = logging.getLogger()
 
@@ -35,6 +44,27 @@ class AppendIfAllowedAction(argparse._AppendAction):
             logger.warning(self.NOT_ALLOWED_CHOICE_MESSAGE.format(choice_name=values, argument_name=argument_name))
 
 
+def add_input_filters_arguments(parser):
+    """
+    Add the glob patterns filtering the cartridges found in the input directories.
+    """
+    parser.add_argument(
+        "--include",
+        action="append",
+        metavar="PATTERN",
+        help=(
+            "Convert only the cartridges matching the glob pattern, e.g. '2024/*.imscc'. The patterns are matched "
+            "against the paths relative to the input directories from the right. Can be repeated."
+        ),
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        metavar="PATTERN",
+        help="Skip the cartridges and the directories matching the glob pattern, e.g. 'drafts'. Can be repeated.",
+    )
+
+
 def parse_args(args=None):
     parser = argparse.ArgumentParser(
         description=(
@@ -46,9 +76,12 @@ def parse_args(args=None):
         "--inputs",
         action="append",
         type=lambda p: Path(p).absolute(),
-        required=True,
-        help="Please provide the paths to the imscc files or directories that contain them.",
+        help=(
+            "Please provide the paths to the imscc files or directories that contain them. "
+            "Required unless the cartridges are taken from --plan-file."
+        ),
     )
+    add_input_filters_arguments(parser)
     parser.add_argument(
         "-l",
         "--loglevel",
@@ -63,12 +96,16 @@ def parse_args(args=None):
     parser.add_argument(
         "-r",
         "--result",
-        choices=[RESULT_TYPE_FOLDER, RESULT_TYPE_ZIP],
+        choices=[RESULT_TYPE_FOLDER, RESULT_TYPE_ZIP, RESULT_TYPE_TGZ, RESULT_TYPE_OLX],
         default=RESULT_TYPE_FOLDER,
         help=(
             "Please provide the format for output. "
             "It can take one of the following "
-            "values, {folder}, {zip} as argument.".format(folder=RESULT_TYPE_FOLDER, zip=RESULT_TYPE_ZIP)
+            "values, {folder}, {zip}, {tgz}, {olx} as argument. With {tgz} only the tar.gz archive of every "
+            "cartridge is written to the output folder as soon as the cartridge is converted, with {olx} the OLX "
+            "course directory is written instead of the archive.".format(
+                folder=RESULT_TYPE_FOLDER, zip=RESULT_TYPE_ZIP, tgz=RESULT_TYPE_TGZ, olx=RESULT_TYPE_OLX
+            )
         ),
     )
     parser.add_argument(
@@ -88,6 +125,15 @@ def parse_args(args=None):
             "The header for the file should have External Video Link, Edx Id, Youtube Id"
         ),
     )
+    parser.add_argument(
+        "--iframe-inventory",
+        type=lambda p: Path(p).absolute(),
+        default=None,
+        help=(
+            "Path of the iframe inventory JSON lines file produced by the video download tool. The HTML of the "
+            "resources listed in it is parsed only if it embeds the videos from the link file."
+        ),
+    )
     parser.add_argument(
         "-p",
         "--passport-file",
@@ -113,4 +159,253 @@ def parse_args(args=None):
         choices=list(SupportedCustomBlockContentType),
         help="Names of content types for which custom xblocks will be used.",
     )
+    parser.add_argument(
+        "--log-file",
+        type=lambda p: Path(p).absolute(),
+        default=None,
+        help="Path of the file to write the logs to instead of stderr. The file is written by a background thread.",
+    )
+    parser.add_argument(
+        "--log-summary",
+        action="store_true",
+        help=(
+            "Log the summary counters of the per-item messages (loaded files, processed resources, unsupported "
+            "elements) after every cartridge conversion instead of logging every message."
+        ),
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=int,
+        default=None,
+        help=(
+            "Memory budget of a cartridge conversion in megabytes. When the process memory usage exceeds it, the "
+            "completed course chapters and large HTML payloads are spilled to temporary files in the output "
+            "directory, so the conversion becomes slower instead of running out of memory."
+        ),
+    )
+    parser.add_argument(
+        "--qti-workers",
+        type=int,
+        default=None,
+        help=(
+            "Number of worker processes parsing the items of huge QTI assessments. The parallel parsing is "
+            "disabled if it's less than 2. Defaults to the QTI_PARALLEL_WORKERS setting."
+        ),
+    )
+    parser.add_argument(
+        "--stats-file",
+        type=lambda p: Path(p).absolute(),
+        default=None,
+        help=(
+            "Path of the JSON file to write the conversion statistics to: time, CPU time, peak memory usage and "
+            "I/O of every conversion stage, the content processors and post-processors calls and durations."
+        ),
+    )
+    progress_group = parser.add_mutually_exclusive_group()
+    progress_group.add_argument(
+        "--progress-file",
+        type=lambda p: Path(p).absolute(),
+        default=None,
+        help=(
+            "Path of the file to write the conversion progress events to as JSON lines: cartridges started and "
+            "finished, resources processed out of total, bytes packaged and ETA."
+        ),
+    )
+    progress_group.add_argument(
+        "--progress-fd",
+        type=int,
+        default=None,
+        help="File descriptor to write the conversion progress events to, see --progress-file.",
+    )
+    parser.add_argument(
+        "--slowest-resources",
+        type=int,
+        default=0,
+        help="Number of the slowest and the largest resources to report after every cartridge conversion.",
+    )
+    parser.add_argument(
+        "--resources-csv",
+        type=lambda p: Path(p).absolute(),
+        default=None,
+        help="Path of the CSV file to write the processing time, input and output size of every resource to.",
+    )
+    parser.add_argument(
+        "--shard",
+        type=shard_validator,
+        default=None,
+        help=(
+            "Convert only the k-th of N shards of the cartridges, in the k/N format. The shards are taken from "
+            "--plan-file or planned from the inputs the same way as the plan command does."
+        ),
+    )
+    parser.add_argument(
+        "--plan-file",
+        type=lambda p: Path(p).absolute(),
+        default=None,
+        help="Path of the shard plan JSON file written by the plan command.",
+    )
+    parser.add_argument(
+        "--result-index",
+        type=lambda p: Path(p).absolute(),
+        default=None,
+        help=(
+            "Path of the JSON lines file to write the conversion result of every cartridge to: the shard, "
+            "success, the output file and its size. The indexes of the shards are merged by concatenation."
+        ),
+    )
+    parser.add_argument(
+        "--olx-layout",
+        choices=[OLX_LAYOUT_INLINE, OLX_LAYOUT_EXPLODED],
+        default=OLX_LAYOUT_INLINE,
+        help=(
+            "Please provide the OLX course layout. With {inline} the whole course is written to course.xml, with "
+            "{exploded} every block is written to its own <block type>/<url_name>.xml file.".format(
+                inline=OLX_LAYOUT_INLINE, exploded=OLX_LAYOUT_EXPLODED
+            )
+        ),
+    )
+    parser.add_argument(
+        "--olx-workers",
+        type=int,
+        default=4,
+        help="Number of the threads writing the block files of the {} OLX layout.".format(OLX_LAYOUT_EXPLODED),
+    )
+    parser.add_argument(
+        "--checkpoint-file",
+        type=lambda p: Path(p).absolute(),
+        default=None,
+        help=(
+            "Path of the JSON lines journal to record every converted cartridge with the hashes of its source and "
+            "output archive to. Requires the {tgz} result type.".format(tgz=RESULT_TYPE_TGZ)
+        ),
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Skip the cartridges recorded in --checkpoint-file whose source is unchanged and whose archive is still "
+            "in the output folder, the new records are appended to the journal."
+        ),
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop the batch at the first cartridge that fails to be converted.",
+    )
+    parsed_args = parser.parse_args(args)
+
+    if not parsed_args.inputs and not parsed_args.plan_file:
+        parser.error("the following arguments are required: -i/--inputs")
+    if parsed_args.plan_file and not parsed_args.shard:
+        parser.error("argument --plan-file: requires --shard")
+    if parsed_args.checkpoint_file and parsed_args.result != RESULT_TYPE_TGZ:
+        parser.error("argument --checkpoint-file: requires --result {}".format(RESULT_TYPE_TGZ))
+    if parsed_args.resume and not parsed_args.checkpoint_file:
+        parser.error("argument --resume: requires --checkpoint-file")
+
+    return parsed_args
+
+
+def parse_analyze_args(args=None):
+    parser = argparse.ArgumentParser(
+        prog="cc2olx analyze",
+        description=(
+            "This command analyzes imscc files without their conversion: it reports the resource counts by type, "
+            "unsupported resource types, QTI item counts by profile, static files size and the estimated conversion "
+            "time of every cartridge as JSON lines."
+        ),
+    )
+    parser.add_argument(
+        "-i",
+        "--inputs",
+        action="append",
+        type=lambda p: Path(p).absolute(),
+        required=True,
+        help="Please provide the paths to the imscc files or directories that contain them.",
+    )
+    add_input_filters_arguments(parser)
+    parser.add_argument(
+        "-l",
+        "--loglevel",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+        default="INFO",
+        help="Please provide the appropriate level to change the detail of logs.",
+    )
+    parser.add_argument(
+        "--report-file",
+        type=lambda p: Path(p).absolute(),
+        default=None,
+        help="Path of the JSON lines file to write the analysis report to. The report is printed to stdout by default.",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of the worker processes analyzing the cartridges.",
+    )
+    parser.add_argument(
+        "--skip-qti-items",
+        action="store_true",
+        help="Don't count QTI items to analyze only the manifest and the archive directory.",
+    )
+
     return parser.parse_args(args)
+
+
+def parse_plan_args(args=None):
+    parser = argparse.ArgumentParser(
+        prog="cc2olx plan",
+        description=(
+            "This command splits imscc files into shards with balanced estimated conversion times. The plan is "
+            "deterministic, every shard is converted with `cc2olx run --shard k/N --plan-file <PLAN_FILE>`."
+        ),
+    )
+    parser.add_argument(
+        "-i",
+        "--inputs",
+        action="append",
+        type=lambda p: Path(p).absolute(),
+        required=True,
+        help="Please provide the paths to the imscc files or directories that contain them.",
+    )
+    add_input_filters_arguments(parser)
+    parser.add_argument(
+        "-l",
+        "--loglevel",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+        default="INFO",
+        help="Please provide the appropriate level to change the detail of logs.",
+    )
+    parser.add_argument(
+        "-n",
+        "--shards",
+        type=int,
+        required=True,
+        help="Number of the shards to split the cartridges into.",
+    )
+    parser.add_argument(
+        "--plan-file",
+        type=lambda p: Path(p).absolute(),
+        default=None,
+        help="Path of the JSON file to write the plan to. The plan is printed to stdout by default.",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of the worker processes analyzing the cartridges.",
+    )
+    parser.add_argument(
+        "--skip-qti-items",
+        action="store_true",
+        help="Don't count QTI items to estimate the conversion time by the manifest and the archive directory only.",
+    )
+
+    parsed_args = parser.parse_args(args)
+
+    if parsed_args.shards < 1:
+        parser.error("argument -n/--shards: must be at least 1")
+
+    return parsed_args
@@ -1,3 +1,5 @@
 FALLBACK_OLX_CONTENT = "<p>MISSING CONTENT</p>"
 OLX_STATIC_DIR = "static"
 OLX_STATIC_PATH_TEMPLATE = f"/{OLX_STATIC_DIR}/{{static_file_path}}"
+BYTES_IN_MEGABYTE = 1024 * 1024
+TGZ_SUFFIX = ".tar.gz"
@@ -1,5 +1,6 @@
 import xml.dom.minidom
 from abc import ABC, abstractmethod
+from collections import Counter
 from typing import List, Optional
 
 from cc2olx.content_processors.dataclasses import ContentProcessorContext
@@ -18,11 +19,16 @@ class AbstractContentProcessor(ABC):
     Sometimes it is needed to update the object outside the content processor
     during its execution. The allowed side effects are defined by the context
     interface. It is forbidden to mutate the cartridge object.
+
+    A processor can count the events worth reporting (e.g. the skipped
+    expensive operations) in `stats` counter, it's logged when the course
+    conversion is finished.
     """
 
     def __init__(self, cartridge: Cartridge, context: ContentProcessorContext) -> None:
         self._cartridge = cartridge
         self._context = context
+        self.stats = Counter()
 
     @abstractmethod
     def process(self, resource: dict, idref: str) -> Optional[List[xml.dom.minidom.Element]]:
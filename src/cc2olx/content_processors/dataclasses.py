@@ -3,17 +3,22 @@ from typing import List, Optional, Set
 import attrs
 
 from cc2olx.iframe_link_parser import IframeLinkParser
+from cc2olx.utils import LazyProcessPool
 
 
 @attrs.define(frozen=True, slots=False)
 class ContentProcessorContext:
     """
     Encapsulate a content processor context.
+
+    The QTI process pool parses the items of huge assessments, it's provided
+    only if the parallel parsing is enabled.
     """
 
     iframe_link_parser: Optional[IframeLinkParser]
     _lti_consumer_ids: Set[str]
     _content_types_with_custom_blocks: List[str]
+    qti_process_pool: Optional[LazyProcessPool] = None
 
     def add_lti_consumer_id(self, lti_consumer_id: str) -> None:
         """
@@ -12,6 +12,7 @@ from cc2olx.constants import FALLBACK_OLX_CONTENT
 from cc2olx.content_processors import AbstractContentProcessor
 from cc2olx.content_processors.utils import WebContentFile, parse_web_link_content
 from cc2olx.enums import CommonCartridgeResourceType
+from cc2olx.logs import details_logger
 from cc2olx.utils import clean_from_cdata
 
 logger = logging.getLogger()
@@ -29,7 +30,7 @@ class HtmlContentProcessor(AbstractContentProcessor):
 
     def process(self, resource: dict, idref: str) -> Optional[List[xml.dom.minidom.Element]]:
         content = self._parse(resource, idref)
-        return self._create_nodes(content)
+        return self._create_nodes(content, idref)
 
     def _parse(self, resource: dict, idref: str) -> Dict[str, str]:
         """
@@ -63,7 +64,7 @@ class HtmlContentProcessor(AbstractContentProcessor):
         elif not is_web_content_from_web_resources_dir:
             content = self._parse_webcontent_outside_web_resources_dir(web_content_file)
         else:
-            logger.info("Skipping webcontent: %s", resource_file_path)
+            details_logger.info("Skipping webcontent: %s", resource_file_path)
             content = self.FALLBACK_CONTENT
 
         return content
@@ -151,10 +152,10 @@ class HtmlContentProcessor(AbstractContentProcessor):
         if "href" in resource:
             text += ", href = {!r}".format(resource["href"])
 
-        logger.info("%s", text)
+        details_logger.info("Not imported content: type = %r, href = %r", resource_type, resource.get("href"))
         return {"html": text}
 
-    def _create_nodes(self, content: Dict[str, str]) -> List[xml.dom.minidom.Element]:
+    def _create_nodes(self, content: Dict[str, str], idref: Optional[str] = None) -> List[xml.dom.minidom.Element]:
         """
         Give out <html> or <video> OLX nodes.
         """
@@ -164,7 +165,7 @@ class HtmlContentProcessor(AbstractContentProcessor):
         doc = xml.dom.minidom.Document()
 
         if self._context.iframe_link_parser:
-            html, video_olx = self._process_html_for_iframe(html, doc)
+            html, video_olx = self._process_html_for_iframe(html, doc, idref)
         html = clean_from_cdata(html)
         txt = doc.createCDATASection(html)
 
@@ -180,6 +181,7 @@ class HtmlContentProcessor(AbstractContentProcessor):
         self,
         html_str: str,
         doc: xml.dom.minidom.Document,
+        idref: Optional[str] = None,
     ) -> Tuple[str, List[xml.dom.minidom.Element]]:
         """
         Parse the iframe with embedded video, to be converted into video xblock.
@@ -187,8 +189,18 @@ class HtmlContentProcessor(AbstractContentProcessor):
         Provide the html content of the file, if iframe is present and
         converted into xblock then iframe is removed from the HTML, as well as
         a list of XML children, i.e video xblock.
+
+        The HTML is parsed only if the cheap pre-scan finds the tags the iframe
+        link parser works with, most pages don't contain any iframe. If the
+        iframe inventory lists the resource, it's used instead of the pre-scan.
         """
         video_olx = []
+
+        if not self._context.iframe_link_parser.needs_html_parsing(html_str, idref):
+            self.stats["iframe_html_parsing_skipped"] += 1
+            return html_str, video_olx
+
+        self.stats["iframe_html_parsed"] += 1
         parsed_html = lxml.html.fromstring(html_str)
         iframes = parsed_html.xpath("//iframe")
         if not iframes:
@@ -1,24 +1,48 @@
+import concurrent.futures
+import contextlib
 import functools
+import itertools
 import logging
 import re
 import urllib.parse
 import xml.dom.minidom
-from collections import OrderedDict
+from collections import OrderedDict, deque
 from dataclasses import dataclass
 from enum import Enum
 from html import unescape
 from pathlib import Path
-from typing import Callable, Collection, Dict, List, Optional, OrderedDict as OrderedDictType, Tuple, Union
-
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    OrderedDict as OrderedDictType,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+from xml.sax.saxutils import escape, quoteattr
+
+from django.conf import settings
 from lxml import etree, html
 
 from cc2olx import filesystem
 from cc2olx.content_processors import AbstractContentProcessor
 from cc2olx.enums import CommonCartridgeResourceType
-from cc2olx.utils import element_builder
+from cc2olx.logs import details_logger, LogSummary, merge_worker_log_summary, pop_worker_log_summary
+from cc2olx.utils import get_xml_minidom_element_iterator, LazyProcessPool
 from cc2olx.xml import cc_xml
 
 QTI_RESPROCESSING_TYPES = ["general_fb", "correct_fb", "general_incorrect_fb"]
+QTI_ITEM_TAG = etree.QName(cc_xml.QTI_NAMESPACE, "item").text
+QTI_SECTION_TAG = etree.QName(cc_xml.QTI_NAMESPACE, "section").text
+EMPTY_TEXT_MARKER_TARGET = "cc2olx-empty-text"
+EMPTY_TEXT_MARKER = f"<?{EMPTY_TEXT_MARKER_TARGET}?>"
+CDATA_MARKER_TARGET = "cc2olx-cdata"
+XML_INVALID_CHARACTERS_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
 
 logger = logging.getLogger()
 
@@ -60,11 +84,13 @@ class QtiContentProcessor(AbstractContentProcessor):
     FIB_PROBLEM_TEXTLINE_SIZE_BUFFER = 10
 
     def process(self, resource: dict, idref: str) -> Optional[List[xml.dom.minidom.Element]]:
-        if content := self._parse(resource):
-            return self._create_nodes(content)
+        if (content := self._parse(resource)) is not None:
+            # The parsing is finished even if the nodes creation fails.
+            with contextlib.closing(content):
+                return self._create_nodes(content) or None
         return None
 
-    def _parse(self, resource: dict) -> Optional[List[dict]]:
+    def _parse(self, resource: dict) -> Optional[Iterator[dict]]:
         """
         Parse the resource content.
         """
@@ -74,19 +100,97 @@ class QtiContentProcessor(AbstractContentProcessor):
             return self._parse_qti(resource_file_path)
         return None
 
-    def _parse_qti(self, resource_file_path: Path) -> List[dict]:
+    def _parse_qti(self, resource_file_path: Path) -> Iterator[dict]:
         """
         Parse resource of ``imsqti_xmlv1p2/imscc_xmlv1p1/assessment`` type.
+
+        The items are parsed lazily one by one, and the item XML is freed as
+        soon as the next item is requested. It keeps the memory usage
+        independent of the question bank size.
+
+        If the parallel parsing is enabled, the items exceeding
+        `QTI_PARALLEL_MIN_ITEMS` are parsed by the context process pool.
+        """
+        items = enumerate(
+            item
+            for item in filesystem.iter_xml_elements(resource_file_path, QTI_ITEM_TAG)
+            if item.getparent() is not None and item.getparent().tag == QTI_SECTION_TAG
+        )
+        process_pool = self._context.qti_process_pool
+
+        if process_pool is None:
+            items_to_parse_sequentially = items
+        else:
+            # Small assessments don't pay the inter-process communication costs.
+            items_to_parse_sequentially = itertools.islice(items, settings.QTI_PARALLEL_MIN_ITEMS)
+
+        for index, problem in items_to_parse_sequentially:
+            yield self._parse_problem(problem, index, resource_file_path)
+
+        if process_pool is not None:
+            yield from self._parse_problems_concurrently(items, resource_file_path, process_pool)
+
+    def _parse_problems_concurrently(
+        self,
+        items: Iterator[Tuple[int, cc_xml.QtiItem]],
+        resource_file_path: Path,
+        process_pool: LazyProcessPool,
+    ) -> Iterator[dict]:
         """
-        tree = filesystem.get_xml_tree(resource_file_path)
-        root = tree.getroot()
+        Parse QTI items by a pool of worker processes.
 
-        parsed_problems = []
+        The items are serialized and sent to the workers in chunks. The number
+        of chunks being processed at once is limited, so the memory usage
+        stays bounded. The parsed problems are provided in the original order.
+        The pool workers are started only when the first chunk is ready.
+        """
+        chunks = self._serialize_items_in_chunks(items)
 
-        for index, problem in enumerate(root.items):
-            parsed_problems.append(self._parse_problem(problem, index, resource_file_path))
+        if (first_chunk := next(chunks, None)) is None:
+            return
 
-        return parsed_problems
+        pending_results = deque()
+
+        try:
+            for chunk in itertools.chain([first_chunk], chunks):
+                pending_results.append(
+                    process_pool.executor.submit(parse_serialized_qti_items, type(self), chunk, resource_file_path)
+                )
+                if len(pending_results) > 2 * process_pool.max_workers:
+                    yield from self._collect_parsed_chunk(pending_results.popleft())
+
+            while pending_results:
+                yield from self._collect_parsed_chunk(pending_results.popleft())
+        finally:
+            # If the problems aren't consumed till the end, the submitted chunks are still
+            # waited for, so their log summaries aren't lost and the pool is free for the next assessment.
+            for pending_result in pending_results:
+                if pending_result.exception() is None:
+                    merge_worker_log_summary(pending_result.result()[1])
+
+    @staticmethod
+    def _collect_parsed_chunk(pending_result: concurrent.futures.Future) -> List[dict]:
+        """
+        Wait for the parsed chunk problems and merge the worker log summary.
+        """
+        problems, log_summary = pending_result.result()
+        merge_worker_log_summary(log_summary)
+        return problems
+
+    @staticmethod
+    def _serialize_items_in_chunks(
+        items: Iterator[Tuple[int, cc_xml.QtiItem]],
+    ) -> Iterator[List[Tuple[int, bytes]]]:
+        """
+        Serialize QTI items and group them into chunks of `QTI_PARALLEL_CHUNK_SIZE` items.
+
+        The item index is kept along with the item XML, because it's a part of
+        the problem identifier.
+        """
+        serialized_items = ((index, etree.tostring(item)) for index, item in items)
+
+        while chunk := list(itertools.islice(serialized_items, settings.QTI_PARALLEL_CHUNK_SIZE)):
+            yield chunk
 
     def _parse_problem(self, problem: cc_xml.QtiItem, problem_index: int, resource_file_path: Path) -> dict:
         """
@@ -115,9 +219,12 @@ class QtiContentProcessor(AbstractContentProcessor):
         try:
             data.update(parse_problem(problem))
         except NotImplementedError:
-            logger.info("Problem with ID %s can't be converted.", problem.attrib.get("ident"))
-            logger.info("    Profile %s is not supported.", cc_profile)
-            logger.info("    At file %s.", resource_file_path)
+            details_logger.info(
+                "Problem with ID %s can't be converted.\n    Profile %s is not supported.\n    At file %s.",
+                problem.attrib.get("ident"),
+                cc_profile,
+                resource_file_path,
+            )
 
         return data
 
@@ -396,197 +503,123 @@ class QtiContentProcessor(AbstractContentProcessor):
         """
         raise NotImplementedError
 
-    def _create_nodes(self, content: List[dict]) -> List[xml.dom.minidom.Element]:
+    def _create_nodes(self, content: Iterable[dict]) -> List[xml.dom.minidom.Element]:
         """
         Give out <problem> or <openassessment> OLX nodes.
+
+        The parsed problem data is consumed one by one, so only a single item
+        data is kept in memory while the nodes are created.
         """
         problems = []
 
         for problem_data in content:
-            cc_profile = problem_data["cc_profile"]
-            create_problem = self._problem_creators_map.get(cc_profile)
+            # The sample solution is inserted as is, it doesn't pass through the parser.
+            cdata_sections = [problem_data["sample_solution"]] if problem_data.get("sample_solution") else []
+            problems += parse_olx_markup(self._render_problem(problem_data), cdata_sections)
 
-            if create_problem is None:
-                raise QtiError('Unknown cc_profile: "{}"'.format(problem_data["cc_profile"]))
+        return problems
 
-            doc = xml.dom.minidom.Document()
-            problem = create_problem(problem_data, doc)
+    def _render_problem(self, problem_data: dict) -> str:
+        """
+        Render the OLX markup of a problem.
 
-            # sometimes we might want to have additional items from one CC item
-            if isinstance(problem, list) or isinstance(problem, tuple):
-                problems += problem
-            else:
-                problems.append(problem)
+        A single CC item can be rendered into several OLX elements, e.g. an
+        essay with a sample solution.
+        """
+        cc_profile = problem_data["cc_profile"]
+        render_problem = self._problem_renderers_map.get(cc_profile)
 
-        return problems
+        if render_problem is None:
+            raise QtiError('Unknown cc_profile: "{}"'.format(problem_data["cc_profile"]))
+
+        return render_problem(problem_data)
 
     @functools.cached_property
-    def _problem_creators_map(
-        self,
-    ) -> Dict[
-        QtiQuestionType,
-        Callable[[dict, xml.dom.minidom.Document], Union[xml.dom.minidom.Element, Collection[xml.dom.minidom.Element]]],
-    ]:
+    def _problem_renderers_map(self) -> Dict[QtiQuestionType, Callable[[dict], str]]:
         """
-        Provide CC profile value to actual problem node creators mapping.
+        Provide CC profile value to actual problem markup renderers mapping.
 
         Note: Since True/False problems in OLX are constructed identically to
-        OLX Multiple Choice problems, we reuse `_create_multiple_choice_problem`
+        OLX Multiple Choice problems, we reuse `_render_multiple_choice_problem`
         for BOOLEAN type problems
         """
         return {
-            QtiQuestionType.MULTIPLE_CHOICE: self._create_multiple_choice_problem,
-            QtiQuestionType.MULTIPLE_RESPONSE: self._create_multiple_response_problem,
-            QtiQuestionType.FILL_IN_THE_BLANK: self._create_fib_problem,
-            QtiQuestionType.ESSAY: self._create_essay_problem,
-            QtiQuestionType.BOOLEAN: self._create_multiple_choice_problem,
-            QtiQuestionType.PATTERN_MATCH: self._create_pattern_match_problem,
+            QtiQuestionType.MULTIPLE_CHOICE: self._render_multiple_choice_problem,
+            QtiQuestionType.MULTIPLE_RESPONSE: self._render_multiple_response_problem,
+            QtiQuestionType.FILL_IN_THE_BLANK: self._render_fib_problem,
+            QtiQuestionType.ESSAY: self._render_essay_problem,
+            QtiQuestionType.BOOLEAN: self._render_multiple_choice_problem,
+            QtiQuestionType.PATTERN_MATCH: self._render_pattern_match_problem,
         }
 
     @staticmethod
-    def _create_problem_description(description_html_str: str) -> xml.dom.minidom.Element:
+    def _render_problem_description(description_html_str: str) -> str:
         """
-        Create a problem description node.
+        Render a problem description markup.
 
         Material texts can come in form of escaped HTML markup, which
-        can't be considered as valid XML. ``xml.dom.minidom`` has no
-        features to convert HTML to XML, so we use lxml parser here.
+        can't be considered as valid XML, so we use lxml HTML parser to
+        convert it to XML.
         """
         description_html_str = unescape(description_html_str)
 
         description_html_str = urllib.parse.unquote(description_html_str)
 
         element = html.fromstring(description_html_str)
-        xml_string = etree.tostring(element)
-        return xml.dom.minidom.parseString(xml_string).firstChild
+        return etree.tostring(element).decode("ascii")
 
-    def _add_choice(
-        self,
-        parent: xml.dom.minidom.Element,
-        is_correct: bool,
-        text: str,
-        doc: xml.dom.minidom.Document,
-    ) -> None:
+    def _render_choices(self, choices: OrderedDictType[str, Dict[str, Union[bool, str]]]) -> str:
         """
-        Append choices to given ``checkboxgroup`` or ``choicegroup`` parent.
+        Render choices of ``checkboxgroup`` or ``choicegroup``.
         """
-        choice = doc.createElement("choice")
-        choice.setAttribute("correct", "true" if is_correct else "false")
-        self._set_text(choice, text, doc)
-        parent.appendChild(choice)
+        choice_template = load_qti_template("choice")
+        return "".join(
+            choice_template.format(correct="true" if choice["correct"] else "false", text=render_text(choice["text"]))
+            for choice in choices.values()
+        )
 
-    @staticmethod
-    def _set_text(node: xml.dom.minidom.Element, new_text: str, doc: xml.dom.minidom.Document) -> None:
+    def _render_multiple_choice_problem(self, problem_data: dict) -> str:
         """
-        Set a node text.
-        """
-        text_node = doc.createTextNode(new_text)
-        node.appendChild(text_node)
-
-    def _create_multiple_choice_problem(
-        self,
-        problem_data: dict,
-        doc: xml.dom.minidom.Document,
-    ) -> xml.dom.minidom.Element:
+        Render multiple choice problem OLX.
         """
-        Create multiple choice problem OLX.
-        """
-        problem = doc.createElement("problem")
-        problem_content = doc.createElement("multiplechoiceresponse")
-
-        problem_description = self._create_problem_description(problem_data["problem_description"])
-
-        choice_group = doc.createElement("choicegroup")
-        choice_group.setAttribute("type", "MultipleChoice")
-
-        for choice_data in problem_data["choices"].values():
-            self._add_choice(choice_group, choice_data["correct"], choice_data["text"], doc)
-
-        problem_content.appendChild(problem_description)
-        problem_content.appendChild(choice_group)
-        problem.appendChild(problem_content)
-
-        return problem
+        return load_qti_template("multiple_choice_problem").format(
+            description=self._render_problem_description(problem_data["problem_description"]),
+            choices=self._render_choices(problem_data["choices"]),
+        )
 
-    def _create_multiple_response_problem(
-        self,
-        problem_data: dict,
-        doc: xml.dom.minidom.Document,
-    ) -> xml.dom.minidom.Element:
+    def _render_multiple_response_problem(self, problem_data: dict) -> str:
         """
-        Create multiple response problem OLX.
+        Render multiple response problem OLX.
 
         Set partial_credit to EDC by default.
         """
-        el = element_builder(doc)
-
-        problem_description = self._create_problem_description(problem_data["problem_description"])
-
-        problem = el(
-            "problem",
-            [
-                el(
-                    "choiceresponse",
-                    [
-                        problem_description,
-                        el(
-                            "checkboxgroup",
-                            [
-                                el(
-                                    "choice",
-                                    choice["text"],
-                                    {"correct": "true" if choice["correct"] else "false"},
-                                )
-                                for choice in problem_data["choices"].values()
-                            ],
-                            {"type": "MultipleChoice"},
-                        ),
-                    ],
-                    {"partial_credit": "EDC"},
-                ),
-            ],
+        return load_qti_template("multiple_response_problem").format(
+            description=self._render_problem_description(problem_data["problem_description"]),
+            choices=self._render_choices(problem_data["choices"]),
         )
-        return problem
 
-    def _create_fib_problem(self, problem_data: dict, doc: xml.dom.minidom.Document) -> xml.dom.minidom.Element:
+    def _render_fib_problem(self, problem_data: dict) -> str:
         """
-        Create Fill-In-The-Blank problem OLX.
-        """
-        # Track maximum answer length for textline at the bottom
-        max_answer_length = 0
-
-        problem = doc.createElement("problem")
-
-        # Set the primary answer on the stringresponse
-        # and set the type to case insensitive
-        problem_content = doc.createElement("stringresponse")
-        problem_content.setAttribute("answer", problem_data["answer"])
-        problem_content.setAttribute("type", self._build_fib_problem_type(problem_data))
-
-        if len(problem_data["answer"]) > max_answer_length:
-            max_answer_length = len(problem_data["answer"])
-
-        problem_description = self._create_problem_description(problem_data["problem_description"])
-        problem_content.appendChild(problem_description)
-
-        # For any (optional) additional accepted answers, add an
-        # additional_answer element with that answer
-        for answer in problem_data.get("additional_answers", []):
-            additional_answer = doc.createElement("additional_answer")
-            additional_answer.setAttribute("answer", answer)
-            problem_content.appendChild(additional_answer)
-
-            if len(answer) > max_answer_length:
-                max_answer_length = len(answer)
-
-        # Add a textline element with the max answer length plus a buffer
-        textline = doc.createElement("textline")
-        textline.setAttribute("size", str(max_answer_length + self.FIB_PROBLEM_TEXTLINE_SIZE_BUFFER))
-        problem_content.appendChild(textline)
+        Render Fill-In-The-Blank problem OLX.
 
-        problem.appendChild(problem_content)
+        The primary answer is set on the stringresponse, any (optional)
+        additional accepted answers are added as additional_answer elements.
+        A textline element is sized with the max answer length plus a buffer.
+        """
+        additional_answers = problem_data.get("additional_answers", [])
+        max_answer_length = max(len(answer) for answer in [problem_data["answer"], *additional_answers])
+        additional_answer_template = load_qti_template("fib_additional_answer")
 
-        return problem
+        return load_qti_template("fib_problem").format(
+            answer=render_attribute_value(problem_data["answer"]),
+            type=self._build_fib_problem_type(problem_data),
+            description=self._render_problem_description(problem_data["problem_description"]),
+            additional_answers="".join(
+                additional_answer_template.format(answer=render_attribute_value(answer))
+                for answer in additional_answers
+            ),
+            textline_size=max_answer_length + self.FIB_PROBLEM_TEXTLINE_SIZE_BUFFER,
+        )
 
     @staticmethod
     def _build_fib_problem_type(problem_data: dict) -> str:
@@ -600,106 +633,125 @@ class QtiContentProcessor(AbstractContentProcessor):
 
         return " ".join(problem_types)
 
-    def _create_essay_problem(
-        self,
-        problem_data: dict,
-        doc: xml.dom.minidom.Document,
-    ) -> Union[xml.dom.minidom.Element, Tuple[xml.dom.minidom.Element, xml.dom.minidom.Element]]:
+    def _render_essay_problem(self, problem_data: dict) -> str:
         """
-        Create an essay problem OLX.
+        Render an essay problem OLX.
 
-        Given parsed essay problem data, returns a openassessment component. If a sample
-        solution provided, returns that as a HTML block before openassessment.
+        Given parsed essay problem data, renders a openassessment component. If a sample
+        solution provided, renders that as a HTML block before openassessment.
         """
-        el = element_builder(doc)
-
         if any(key in QTI_RESPROCESSING_TYPES for key in problem_data.keys()):
-            resp_samples = [
-                el("name", "Feedback"),
-                el("label", "Feedback"),
-                el("prompt", "Example Feedback"),
-            ]
-
-            for desc, key in zip(["General", "Correct", "Incorrect"], QTI_RESPROCESSING_TYPES):
-                resp_samples.append(
-                    el(
-                        "option",
-                        [el("name", desc), el("label", desc), el("explanation", problem_data.get(key, desc))],
-                        {"points": "0"},
-                    )
+            option_template = load_qti_template("essay_feedback_option")
+            criterion = load_qti_template("essay_feedback_criterion").format(
+                options="".join(
+                    option_template.format(name=desc, explanation=render_text(problem_data.get(key, desc)))
+                    for desc, key in zip(["General", "Correct", "Incorrect"], QTI_RESPROCESSING_TYPES)
                 )
-            criterion = el("criterion", resp_samples, {"feedback": "optional"})
-        else:
-            criterion = el(
-                "criterion",
-                [
-                    el("name", "Ideas"),
-                    el("label", "Ideas"),
-                    el("prompt", "Example criterion"),
-                    el(
-                        "option",
-                        [el("name", "Poor"), el("label", "Poor"), el("explanation", "Explanation")],
-                        {"points": "0"},
-                    ),
-                    el(
-                        "option",
-                        [el("name", "Good"), el("label", "Good"), el("explanation", "Explanation")],
-                        {"points": "1"},
-                    ),
-                ],
-                {"feedback": "optional"},
             )
+        else:
+            criterion = load_qti_template("essay_default_criterion")
 
         description = problem_data["problem_description"]
-        ora = el(
-            "openassessment",
-            [
-                el("title", "Open Response Assessment"),
-                el(
-                    "assessments",
-                    [
-                        el("assessment", None, attributes={"name": "staff-assessment", "required": "True"}),
-                    ],
-                ),
-                el(
-                    "prompts",
-                    [
-                        el(
-                            "prompt",
-                            [el("description", description)],
-                        ),
-                    ],
-                ),
-                el(
-                    "rubric",
-                    [
-                        criterion,
-                        el("feedbackprompt", "Feedback prompt text"),
-                        el("feedback_default_text", "Feedback prompt default text"),
-                    ],
-                ),
-            ],
-            {
-                "url_name": problem_data["ident"],
-                "text_response": "required",
-                "prompts_type": "html",
-            },
+        ora = load_qti_template("essay_problem").format(
+            url_name=render_attribute_value(problem_data["ident"]),
+            description=(
+                "<description/>" if description is None else f"<description>{render_text(description)}</description>"
+            ),
+            criterion=criterion,
         )
 
         # if a sample solution exists add on top of ora, because
         # olx doesn't have a sample solution equivalent.
         if problem_data.get("sample_solution"):
-            child = el("html", doc.createCDATASection(problem_data["sample_solution"]))
-            return child, ora
+            return load_qti_template("essay_sample_solution") + ora
 
         return ora
 
-    def _create_pattern_match_problem(
-        self,
-        problem_data: dict,
-        doc: xml.dom.minidom.Document,
-    ) -> xml.dom.minidom.Element:
+    def _render_pattern_match_problem(self, problem_data: dict) -> str:
         """
-        Create pattern match problem OLX.
+        Render pattern match problem OLX.
         """
         raise NotImplementedError
+
+
+def parse_serialized_qti_items(
+    processor_type: Type[QtiContentProcessor],
+    serialized_items: List[Tuple[int, bytes]],
+    resource_file_path: Path,
+) -> Tuple[List[dict], Optional[LogSummary]]:
+    """
+    Parse the chunk of serialized QTI items.
+
+    It's executed by the worker processes. The problem parsing depends
+    neither on the cartridge nor on the processor context, so they aren't
+    passed to the worker. The details logger summary of the chunk is
+    returned along with the problems.
+    """
+    processor = processor_type(cartridge=None, context=None)
+    parser = cc_xml.CommonCartridgeXmlParser(recover=True, huge_tree=True)
+
+    problems = [
+        processor._parse_problem(etree.fromstring(item_xml, parser), index, resource_file_path)
+        for index, item_xml in serialized_items
+    ]
+    return problems, pop_worker_log_summary()
+
+
+@functools.lru_cache(maxsize=None)
+def load_qti_template(name: str) -> str:
+    """
+    Load QTI problem markup template.
+
+    The templates are read once and reused for all the problems.
+    """
+    with open(settings.TEMPLATES_DIR / "qti" / f"{name}.xml", encoding="utf-8") as template_file:
+        return template_file.read().strip()
+
+
+def render_text(text: str) -> str:
+    """
+    Escape a text to be inserted into the template markup.
+
+    Carriage returns are escaped too, otherwise XML parser normalizes them.
+    The characters not allowed in XML are removed, the parser rejects them.
+    An empty text is rendered as the marker, so the text node is kept in the
+    parsed element.
+    """
+    if not text:
+        return EMPTY_TEXT_MARKER
+    return escape(XML_INVALID_CHARACTERS_RE.sub("", text), {"\r": "&#13;"})
+
+
+def render_attribute_value(value: str) -> str:
+    """
+    Escape and quote an attribute value to be inserted into the template markup.
+
+    The characters not allowed in XML are removed, the parser rejects them.
+    """
+    return quoteattr(XML_INVALID_CHARACTERS_RE.sub("", value))
+
+
+def parse_olx_markup(markup: str, cdata_sections: Sequence[str] = ()) -> List[xml.dom.minidom.Element]:
+    """
+    Parse the rendered OLX markup into the elements.
+
+    The CDATA markers are replaced with the provided CDATA sections in order.
+    Their data is kept as is, as it doesn't pass through the parser.
+    """
+    container = xml.dom.minidom.parseString(f"<olx>{markup}</olx>").documentElement
+
+    if EMPTY_TEXT_MARKER in markup or cdata_sections:
+        cdata_sections = iter(cdata_sections)
+        for node in list(get_xml_minidom_element_iterator(container)):
+            if node.nodeType != node.PROCESSING_INSTRUCTION_NODE:
+                continue
+            if node.target == EMPTY_TEXT_MARKER_TARGET:
+                node.parentNode.replaceChild(node.ownerDocument.createTextNode(""), node)
+            elif node.target == CDATA_MARKER_TARGET:
+                node.parentNode.replaceChild(node.ownerDocument.createCDATASection(next(cdata_sections)), node)
+
+    elements = list(container.childNodes)
+    for element in elements:
+        container.removeChild(element)
+
+    return elements
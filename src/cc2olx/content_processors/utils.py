@@ -1,7 +1,8 @@
+import functools
 import re
 import xml.dom.minidom
 from pathlib import Path
-from typing import Dict, List, Optional, Type
+from typing import Dict, List, Optional, Tuple, Type, Union
 
 from django.conf import settings
 from django.utils.module_loading import import_string
@@ -37,84 +38,78 @@ def load_content_processor_types() -> List[Type[AbstractContentProcessor]]:
     return [import_string(processor_path) for processor_path in settings.CONTENT_PROCESSORS]
 
 
+RubricNode = Union[str, Tuple[str, str], Tuple[str, Tuple[Tuple[str, str], ...], Tuple["RubricNode", ...]]]
+
+
 def generate_default_ora_criteria() -> List[xml.dom.minidom.Element]:
     """
     Generate default ORA criteria OLX.
+
+    The criteria are built from the rubric library nodes which are loaded once,
+    so an ORA creation includes neither criteria parsing nor DOM cloning.
+    """
+    document = xml.dom.minidom.Document()
+    return [
+        _build_rubric_node(document, criterion)
+        for criterion in load_ora_rubric_criteria(settings.ORA_RUBRIC_CRITERIA_PATH)
+    ]
+
+
+def _build_rubric_node(document: xml.dom.minidom.Document, node: RubricNode) -> xml.dom.minidom.Node:
     """
-    ideas_criterion = """
-        <criterion feedback="optional">
-        <name>Ideas</name>
-        <label>Ideas</label>
-        <prompt>Determine if there is a unifying theme or main idea.</prompt>
-        <option points="0">
-            <name>Poor</name>
-            <label>Poor</label>
-            <explanation>
-                Difficult for the reader to discern the main idea. Too brief or too repetitive to establish or maintain
-                a focus.
-            </explanation>
-        </option>
-        <option points="3">
-            <name>Fair</name>
-            <label>Fair</label>
-            <explanation>
-                Presents a unifying theme or main idea, but may include minor tangents. Stays somewhat focused on topic
-                and task.
-            </explanation>
-        </option>
-        <option points="5">
-            <name>Good</name>
-            <label>Good</label>
-            <explanation>
-                Presents a unifying theme or main idea without going off on tangents. Stays completely focused on topic
-                and task.
-            </explanation>
-        </option>
-    </criterion>
+    Create the DOM node of the rubric library node.
+
+    The children are attached directly, as the minidom parser does, skipping
+    the checks of `appendChild` that the freshly created nodes don't need.
     """
-    content_criterion = """
-    <criterion feedback="optional">
-        <name>Content</name>
-        <label>Content</label>
-        <prompt>Assess the content of the submission</prompt>
-        <option points="0">
-            <name>Poor</name>
-            <label>Poor</label>
-            <explanation>
-                Includes little information with few or no details or unrelated details. Unsuccessful in attempts to
-                explore any facets of the topic.
-            </explanation>
-        </option>
-        <option points="1">
-            <name>Fair</name>
-            <label>Fair</label>
-            <explanation>
-                Includes little information and few or no details. Explores only one or two facets of the topic.
-            </explanation>
-        </option>
-        <option points="3">
-            <name>Good</name>
-            <label>Good</label>
-            <explanation>
-                Includes sufficient information and supporting details. (Details may not be fully developed; ideas may
-                be listed.) Explores some facets of the topic.
-            </explanation>
-        </option>
-        <option points="5">
-            <name>Excellent</name>
-            <label>Excellent</label>
-            <explanation>
-                Includes in-depth information and exceptional supporting details that are fully developed. Explores all
-                facets of the topic.
-            </explanation>
-        </option>
-    </criterion>
+    if isinstance(node, str):
+        return document.createTextNode(node)
+    if len(node) == 2:
+        node_name, data = node
+        return document.createCDATASection(data) if node_name == "#cdata-section" else document.createComment(data)
+
+    tag_name, attributes, children = node
+    element = document.createElement(tag_name)
+    for attribute_name, attribute_value in attributes:
+        element.setAttribute(attribute_name, attribute_value)
+    for child in children:
+        child_node = _build_rubric_node(document, child)
+        child_node.parentNode = element
+        element.childNodes.append(child_node)
+    return element
+
+
+@functools.lru_cache(maxsize=None)
+def load_ora_rubric_criteria(rubric_criteria_path: Path) -> Tuple[RubricNode, ...]:
     """
+    Load ORA rubric criteria from the rubric library file.
 
-    return [
-        xml.dom.minidom.parseString(ideas_criterion).documentElement,
-        xml.dom.minidom.parseString(content_criterion).documentElement,
-    ]
+    The file root element contains <criterion> elements in the ORA rubric
+    format. Every criterion is provided as a `(tag name, attributes, children)`
+    tuple, the text children are strings and the CDATA sections and comments
+    are `(node name, data)` tuples.
+    """
+    document = xml.dom.minidom.parse(str(rubric_criteria_path))
+    return tuple(
+        _load_rubric_node(node)
+        for node in document.documentElement.childNodes
+        if node.nodeType == node.ELEMENT_NODE and node.tagName == "criterion"
+    )
+
+
+def _load_rubric_node(node: xml.dom.minidom.Node) -> RubricNode:
+    """
+    Convert the parsed rubric library node into its tuple.
+    """
+    if node.nodeType == node.TEXT_NODE:
+        return node.data
+    if node.nodeType in (node.CDATA_SECTION_NODE, node.COMMENT_NODE):
+        return node.nodeName, node.data
+    return (
+        node.tagName,
+        tuple(node.attributes.items()),
+        tuple(_load_rubric_node(child) for child in node.childNodes),
+    )
 
 
 class WebContentFile:
@@ -0,0 +1,10 @@
+from cc2olx.conversion_hooks.abc import BaseConversionHook
+from cc2olx.conversion_hooks.dispatcher import ConversionHooks
+from cc2olx.conversion_hooks.profiling import CProfileHook, TracemallocHook
+
+__all__ = [
+    "BaseConversionHook",
+    "ConversionHooks",
+    "CProfileHook",
+    "TracemallocHook",
+]
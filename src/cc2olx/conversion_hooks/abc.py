@@ -0,0 +1,78 @@
+from pathlib import Path
+from typing import Optional
+
+
+class BaseConversionHook:
+    """
+    Base class for conversion hooks.
+
+    Hooks are notified about a cartridge conversion progress: the conversion
+    start and end, every conversion stage and every content processor and
+    post-processor call. The methods do nothing by default, so a subclass
+    overrides only the events it is interested in. To attach the subclass to
+    the conversion, you need to add it to the `CONVERSION_HOOKS` setting.
+
+    A hook instance is created per cartridge conversion. The durations are
+    provided in seconds.
+    """
+
+    # The cartridge output path relative to the output directory without the
+    # suffix, e.g. `2024/course`. It's set when the hook is created.
+    output_path: Optional[Path] = None
+
+    def on_conversion_start(self, input_file: Path) -> None:
+        """
+        Handle the cartridge conversion start.
+        """
+
+    def on_conversion_end(self, input_file: Path, succeeded: bool, duration: float) -> None:
+        """
+        Handle the cartridge conversion end.
+        """
+
+    def on_stage_start(self, stage: str) -> None:
+        """
+        Handle the conversion stage start.
+        """
+
+    def on_stage_end(self, stage: str, duration: float) -> None:
+        """
+        Handle the conversion stage end.
+        """
+
+    def on_resources_found(self, total: int) -> None:
+        """
+        Handle the number of course items to convert into OLX being counted.
+        """
+
+    def on_resource_start(self, idref: Optional[str]) -> None:
+        """
+        Handle the course item conversion start.
+
+        The items without a resource have no identifierref.
+        """
+
+    def on_resource_end(self, idref: Optional[str], duration: float) -> None:
+        """
+        Handle the course item conversion end.
+        """
+
+    def on_content_processor_start(self, processor_name: str, idref: str) -> None:
+        """
+        Handle the content processor call start.
+        """
+
+    def on_content_processor_end(self, processor_name: str, idref: str, duration: float) -> None:
+        """
+        Handle the content processor call end.
+        """
+
+    def on_content_post_processor_start(self, processor_name: str, idref: str) -> None:
+        """
+        Handle the content post-processor call start.
+        """
+
+    def on_content_post_processor_end(self, processor_name: str, idref: str, duration: float) -> None:
+        """
+        Handle the content post-processor call end.
+        """
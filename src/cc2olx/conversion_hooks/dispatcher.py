@@ -0,0 +1,92 @@
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import ContextManager, Iterator, List, Optional
+
+from cc2olx.conversion_hooks.abc import BaseConversionHook
+
+NO_HOOKS_CONTEXT = nullcontext()
+
+
+class ConversionHooks:
+    """
+    Notify the conversion hooks about the conversion events.
+
+    The context managers measure the event duration and call the hooks'
+    start and end methods around the wrapped code. If there are no hooks,
+    a shared no-op context manager is returned, so the conversion doesn't
+    pay for the measurements.
+    """
+
+    def __init__(self, hooks: List[BaseConversionHook]) -> None:
+        self._hooks = hooks
+
+    def __bool__(self) -> bool:
+        return bool(self._hooks)
+
+    def conversion(self, input_file: Path) -> ContextManager[None]:
+        """
+        Wrap the cartridge conversion.
+        """
+        return self._notify_conversion(input_file) if self._hooks else NO_HOOKS_CONTEXT
+
+    def stage(self, stage: str) -> ContextManager[None]:
+        """
+        Wrap the conversion stage.
+        """
+        return self._notify("stage", stage) if self._hooks else NO_HOOKS_CONTEXT
+
+    def resources_found(self, total: int) -> None:
+        """
+        Notify about the number of course items to convert into OLX.
+        """
+        for hook in self._hooks:
+            hook.on_resources_found(total)
+
+    def resource(self, idref: Optional[str]) -> ContextManager[None]:
+        """
+        Wrap the course item conversion.
+        """
+        return self._notify("resource", idref) if self._hooks else NO_HOOKS_CONTEXT
+
+    def content_processor_call(self, processor_name: str, idref: str) -> ContextManager[None]:
+        """
+        Wrap the content processor call.
+        """
+        return self._notify("content_processor", processor_name, idref) if self._hooks else NO_HOOKS_CONTEXT
+
+    def content_post_processor_call(self, processor_name: str, idref: str) -> ContextManager[None]:
+        """
+        Wrap the content post-processor call.
+        """
+        return self._notify("content_post_processor", processor_name, idref) if self._hooks else NO_HOOKS_CONTEXT
+
+    @contextmanager
+    def _notify_conversion(self, input_file: Path) -> Iterator[None]:
+        for hook in self._hooks:
+            hook.on_conversion_start(input_file)
+
+        succeeded = False
+        start_time = time.perf_counter()
+
+        try:
+            yield
+            succeeded = True
+        finally:
+            duration = time.perf_counter() - start_time
+            for hook in reversed(self._hooks):
+                hook.on_conversion_end(input_file, succeeded, duration)
+
+    @contextmanager
+    def _notify(self, event: str, *args: Optional[str]) -> Iterator[None]:
+        for hook in self._hooks:
+            getattr(hook, f"on_{event}_start")(*args)
+
+        start_time = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start_time
+            for hook in reversed(self._hooks):
+                getattr(hook, f"on_{event}_end")(*args, duration)
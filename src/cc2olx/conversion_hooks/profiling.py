@@ -0,0 +1,77 @@
+import cProfile
+import logging
+import tracemalloc
+from pathlib import Path
+
+from django.conf import settings
+
+from cc2olx.conversion_hooks.abc import BaseConversionHook
+
+logger = logging.getLogger()
+
+
+class CProfileHook(BaseConversionHook):
+    """
+    Profile the cartridge conversion with cProfile.
+
+    The profile is written to `<cartridge name>.prof` file in the
+    `CPROFILE_HOOK_OUTPUT_DIR` directory, it can be inspected with `pstats`
+    or visualized with tools like snakeviz. The cartridge output
+    subdirectories are kept, so the same-named cartridges don't share a file.
+    """
+
+    def __init__(self) -> None:
+        self._profiler = cProfile.Profile()
+
+    def on_conversion_start(self, input_file: Path) -> None:
+        self._profiler.enable()
+
+    def on_conversion_end(self, input_file: Path, succeeded: bool, duration: float) -> None:
+        self._profiler.disable()
+
+        output_path = self.output_path or Path(input_file.stem)
+        profile_path = Path(settings.CPROFILE_HOOK_OUTPUT_DIR) / output_path.parent / f"{output_path.name}.prof"
+        profile_path.parent.mkdir(parents=True, exist_ok=True)
+        self._profiler.dump_stats(profile_path)
+        logger.info("The %s conversion profile is written to %s", input_file, profile_path)
+
+
+class TracemallocHook(BaseConversionHook):
+    """
+    Report the top memory allocation sites of the cartridge conversion.
+
+    The `TRACEMALLOC_HOOK_TOP_SIZE` source lines that allocated the most memory
+    still alive at the end of the conversion are logged along with the peak
+    traced memory size. Tracing slows the conversion down noticeably.
+    """
+
+    def __init__(self) -> None:
+        self._started_tracing = False
+
+    def on_conversion_start(self, input_file: Path) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        tracemalloc.reset_peak()
+
+    def on_conversion_end(self, input_file: Path, succeeded: bool, duration: float) -> None:
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            ]
+        )
+        _current_size, peak_size = tracemalloc.get_traced_memory()
+
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+        top_statistics = snapshot.statistics("lineno")[: settings.TRACEMALLOC_HOOK_TOP_SIZE]
+        logger.info(
+            "Top %d allocation sites of %s conversion (peak traced memory %d B):\n%s",
+            len(top_statistics),
+            input_file,
+            peak_size,
+            "\n".join(f"{position:>4}. {statistic}" for position, statistic in enumerate(top_statistics, start=1)),
+        )
@@ -0,0 +1,28 @@
+from pathlib import Path
+from typing import List, Optional, Type
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from cc2olx.conversion_hooks.abc import BaseConversionHook
+from cc2olx.conversion_hooks.dispatcher import ConversionHooks
+
+
+def load_conversion_hook_types() -> List[Type[BaseConversionHook]]:
+    """
+    Load conversion hook types.
+    """
+    return [import_string(hook_path) for hook_path in settings.CONVERSION_HOOKS]
+
+
+def create_conversion_hooks(*extra_hooks: BaseConversionHook, output_path: Optional[Path] = None) -> ConversionHooks:
+    """
+    Create the conversion hooks for a single cartridge conversion.
+
+    The extra hooks are notified after the hooks from the settings. The
+    cartridge output path is provided to all the hooks.
+    """
+    hooks = [*(hook_type() for hook_type in load_conversion_hook_types()), *extra_hooks]
+    for hook in hooks:
+        hook.output_path = output_path
+    return ConversionHooks(hooks)
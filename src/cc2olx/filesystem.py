@@ -1,11 +1,21 @@
+import contextlib
+import errno
 import logging
+import os
+import shutil
 import tarfile
+import tempfile
+import time
 import zipfile
 
+from pathlib import Path
 from xml.etree import ElementTree
 
+from lxml import etree
+
+from cc2olx.logs import details_logger
 from cc2olx.utils import clean_file_name
-from cc2olx.xml.cc_xml import CommonCartridgeXmlParser
+from cc2olx.xml.cc_xml import CommonCartridgeElementClassLookup, CommonCartridgeXmlParser
 
 logger = logging.getLogger()
 
@@ -27,7 +37,7 @@ def get_xml_tree(path_src):
     Returns:
         ElementTree: This gives back an xml parse tree that can handle different operation
     """
-    logger.info("Loading file %s", path_src)
+    details_logger.info("Loading file %s", path_src)
     try:
         # We are using this parser with recover and encoding options so that we are
         # able to parse malformed xml without much issue. The xml that we are
@@ -39,7 +49,49 @@ def get_xml_tree(path_src):
         logger.error("Error while reading xml from %s.", path_src, exc_info=True)
 
 
-def unzip_directory(path_src, path_dst_base=None):
+def iter_xml_elements(path_src, tag):
+    """
+    Incrementally parse an XML file and provide the elements with the given tag.
+
+    Unlike ``get_xml_tree``, the whole tree is never kept in memory: when the
+    next element is requested, the previous one is cleared and its preceding
+    siblings are removed from the tree. So, a consumer must not
+    keep references to the provided elements.
+
+    Args:
+        path_src ([str]): File path or binary file object that needs to be parsed.
+        tag ([str]): Qualified name of the elements to provide.
+
+    Yields:
+        CommonCartridgeElementBase: The parsed element with all its descendants.
+    """
+    details_logger.info("Loading file %s", getattr(path_src, "name", path_src))
+    source = path_src if hasattr(path_src, "read") else str(path_src)
+    # The same parser options as in ``get_xml_tree`` are used, ``huge_tree`` allows
+    # to parse elements with large embedded content, e.g. base64 encoded images.
+    context = etree.iterparse(source, events=("end",), tag=tag, encoding="utf-8", recover=True, huge_tree=True)
+    context.set_element_class_lookup(CommonCartridgeElementClassLookup())
+
+    for _, element in context:
+        yield element
+
+        # The element itself can't be removed as the parser may still reference
+        # it, it's removed along with the next element's preceding siblings.
+        element.clear(keep_tail=False)
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
+
+
+def unzip_directory(path_src, path_dst_base=None, skip_member=None):
+    """
+    Extract the zip archive into the directory named after the archive.
+
+    The member names are cleaned of the reserved characters. The members for
+    which `skip_member` predicate is true aren't extracted, only their parent
+    directories are created.
+    """
     src_dir_path = path_src.parent
     path_dst_base = path_dst_base or src_dir_path
 
@@ -50,12 +102,77 @@ def unzip_directory(path_src, path_dst_base=None):
 
     for zip in zip_list:
         zip.filename = clean_file_name(zip.filename)
-        output_file.extract(zip, path=str(path_dst))
+        if skip_member is not None and skip_member(zip):
+            (path_dst / zip.filename).parent.mkdir(parents=True, exist_ok=True)
+        else:
+            output_file.extract(zip, path=str(path_dst))
 
     return path_dst
 
 
-def add_in_tar_gz(archive_name, inputs):
+def copy_file(src, dst):
+    """
+    Copy the file content and metadata, keeping the data in the kernel if possible.
+
+    The content is copied with `os.copy_file_range`, which lets the filesystems
+    supporting it share the data blocks. `shutil.copyfile` is used, which
+    copies the files with `os.sendfile` on Linux, if the files are on different
+    filesystems or the system call isn't supported. The signature follows
+    `shutil.copy2`, so it can be used as `shutil.copytree` copy function.
+    """
+    try:
+        _copy_file_range(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+    shutil.copystat(src, dst)
+    return dst
+
+
+def _copy_file_range(src, dst):
+    if not hasattr(os, "copy_file_range"):
+        raise OSError(errno.ENOSYS, "os.copy_file_range is not available")
+
+    with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+        remaining = os.fstat(src_file.fileno()).st_size
+
+        while remaining > 0:
+            copied = os.copy_file_range(src_file.fileno(), dst_file.fileno(), remaining)
+            if not copied:
+                # E.g. the file shrank or the filesystem reports a size it can't copy.
+                raise OSError(errno.EIO, "os.copy_file_range stopped before the end of the file", str(src))
+            remaining -= copied
+
+
+@contextlib.contextmanager
+def atomic_output_file(path):
+    """
+    Provide a temporary file path which is renamed to the given path on success.
+
+    The temporary file is created in the same directory, so the rename is atomic
+    and the readers of the directory never see a partially written file. The
+    temporary file is removed if the writing fails.
+    """
+    fd, temp_path = tempfile.mkstemp(prefix=".{}.".format(path.name), suffix=".tmp", dir=path.parent)
+    os.close(fd)
+
+    try:
+        yield temp_path
+        os.chmod(temp_path, 0o666 & ~_get_umask())
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(temp_path)
+        raise
+
+
+def _get_umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+def add_in_tar_gz(archive_name, inputs, zip_members=()):
     """
     Creates ``.tar.gz`` archive using given list of files.
 
@@ -64,6 +181,9 @@ def add_in_tar_gz(archive_name, inputs):
         inputs: list of tuples like ``('assets', 'static')``,
             where first element is any type of file, and second is
             an alternative name of file in archive.
+        zip_members: list of tuples like ``(zip_file, zip_info, 'static/image.png')``
+            of zip archive members which are streamed to the archive
+            right from the zip file without their extraction.
 
     Returns: path to the newly created archive.
     """
@@ -75,4 +195,92 @@ def add_in_tar_gz(archive_name, inputs):
             except FileNotFoundError:
                 logger.error("%s was not found. Skipping", str(file))
 
+        for zip_file, zip_info, alternative_name in zip_members:
+            tar_info = tarfile.TarInfo(alternative_name)
+            tar_info.size = zip_info.file_size
+            tar_info.mtime = time.mktime(zip_info.date_time + (0, 0, -1))
+            tar_info.mode = 0o644
+            with zip_file.open(zip_info) as member:
+                archive.addfile(tar_info, member)
+
     return archive_name
+
+
+def link_file(src, dst):
+    """
+    Hard link the file, copy it if the link can't be created.
+
+    The files on different filesystems are copied with ``copy_file``, which
+    shares the data blocks on the filesystems supporting the reflinks.
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        copy_file(src, dst)
+
+
+def add_in_directory(directory, inputs, zip_members=()):
+    """
+    Creates the directory using given list of files, the counterpart of ``add_in_tar_gz``.
+
+    The files are hard linked, the zip archive members are written right from
+    the zip file. The directory is created under a temporary name next to it
+    and renamed, replacing the previous directory, so it's never seen
+    partially written.
+
+    Args:
+        directory: path to resulting directory.
+        inputs: list of tuples like ``('assets', 'static')``,
+            where first element is any type of file, and second is
+            an alternative name of file in the directory.
+        zip_members: list of tuples like ``(zip_file, zip_info, 'static/image.png')``.
+
+    Returns: total size of the files in the directory in bytes.
+    """
+    temp_directory = Path(tempfile.mkdtemp(prefix=".{}.".format(directory.name), suffix=".tmp", dir=directory.parent))
+    total_size = 0
+
+    try:
+        for file, alternative_name in inputs:
+            for src, dst in _iter_directory_files(Path(file), temp_directory / alternative_name.lstrip("/")):
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                link_file(src, dst)
+                total_size += dst.stat().st_size
+
+        for zip_file, zip_info, alternative_name in zip_members:
+            dst = temp_directory / alternative_name
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            with zip_file.open(zip_info) as member, open(dst, "wb") as output_file:
+                shutil.copyfileobj(member, output_file)
+            total_size += zip_info.file_size
+
+        os.chmod(temp_directory, 0o777 & ~_get_umask())
+        _replace_directory(temp_directory, directory)
+    except BaseException:
+        shutil.rmtree(temp_directory, ignore_errors=True)
+        raise
+
+    return total_size
+
+
+def _iter_directory_files(src, dst):
+    if src.is_dir():
+        for path in sorted(src.rglob("*")):
+            if path.is_file():
+                yield path, dst / path.relative_to(src)
+    elif src.exists():
+        yield src, dst
+    else:
+        # Disregard any file that isn't found
+        logger.error("%s was not found. Skipping", str(src))
+
+
+def _replace_directory(src, dst):
+    if not dst.exists():
+        os.rename(src, dst)
+        return
+
+    old_directory = tempfile.mkdtemp(prefix=".{}.".format(dst.name), suffix=".old", dir=dst.parent)
+    os.replace(dst, old_directory)
+    os.rename(src, dst)
+    shutil.rmtree(old_directory)
@@ -0,0 +1,279 @@
+"""
+Inventory of the iframes embedded into the cartridge HTML files.
+
+The HTML files are scanned for iframes once, right from the cartridge zip
+archive, and the results are stored as JSON lines. The video download tool
+takes the video URLs from the inventory and the converter uses it to skip
+parsing the HTML which doesn't embed any video from the link file.
+
+An inventory is identified by the resolved path, the size and the SHA-256
+hash of the scanned cartridge, so it's never applied to another cartridge
+with the same name or to a changed one.
+"""
+
+import json
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, IO, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import attrs
+import lxml.html
+
+from cc2olx import filesystem
+from cc2olx.checkpoint import hash_file
+from cc2olx.models import MANIFEST
+from cc2olx.utils import clean_file_name
+
+HTML_FILE_EXTENSION = ".html"
+
+# The resolved path, the size and the SHA-256 hash of the cartridge file.
+InventoryKey = Tuple[str, Optional[int], Optional[str]]
+
+# HTML files without the tag aren't parsed at all.
+IFRAME_TAG_RE = re.compile(rb"<iframe", re.IGNORECASE)
+
+
+def extract_video_url(src: str) -> str:
+    """
+    Extract a downloadable video link from an iframe src attribute.
+
+    An empty string is returned for the iframes which don't embed a supported video.
+    """
+    if "youtube.com" in src:
+        return src.replace("/embed/", "/watch?v=").replace("?rel=0", "")
+    elif "cdnapisec.kaltura.com" in src:
+        # Skip playlist URLs
+        if "playlist" in src:
+            return ""
+        return src
+    return ""
+
+
+def get_kaltura_entry_id(src: str) -> Optional[str]:
+    """
+    Extract Kaltura entry_id from embedding URL.
+    """
+    entry_id_query = parse_qs(urlparse(src).query).get("entry_id")
+    return entry_id_query[0] if entry_id_query else None
+
+
+def normalize_video_url(url: str) -> str:
+    """
+    Reformat the video link as it's expected in the link file.
+    """
+    if "kaltura" in url:
+        netloc = url.split("embedIframeJs")[0].strip()
+        entry_id = get_kaltura_entry_id(url)
+        url = f"{netloc}playManifest/entryId/{entry_id}/format/url/protocol/https"
+    return url
+
+
+def find_iframe_srcs(content: bytes) -> List[str]:
+    """
+    Find the src attributes of the iframes in HTML content.
+
+    The content isn't parsed unless it contains an iframe tag.
+    """
+    if not IFRAME_TAG_RE.search(content):
+        return []
+    return [iframe.get("src", "") for iframe in lxml.html.fromstring(content).xpath("//iframe")]
+
+
+@attrs.define(frozen=True)
+class InventoryIframe:
+    """
+    Encapsulate an iframe found in the HTML file.
+
+    The URL is the normalized video link as it appears in the link file, it's
+    empty if the iframe doesn't embed a supported video.
+    """
+
+    src: str
+    url: str
+
+    @classmethod
+    def from_src(cls, src: str) -> "InventoryIframe":
+        video_url = extract_video_url(src)
+        return cls(src, normalize_video_url(video_url) if video_url else "")
+
+
+@attrs.define
+class InventoryHtmlFile:
+    """
+    Encapsulate the iframes found in a single HTML file.
+
+    The resource IDs are the identifiers of the manifest resources the file is
+    the content of, the files which aren't referenced by the manifest have none.
+    """
+
+    file: str
+    resource_ids: List[str] = attrs.field(factory=list)
+    iframes: List[InventoryIframe] = attrs.field(factory=list)
+
+
+@attrs.define
+class IframeInventory:
+    """
+    Encapsulate the iframe inventory of a cartridge.
+    """
+
+    cartridge: str
+    cartridge_size: Optional[int] = None
+    cartridge_sha256: Optional[str] = None
+    html_files: List[InventoryHtmlFile] = attrs.field(factory=list)
+    _html_files_by_resource_id: Dict[str, InventoryHtmlFile] = attrs.field(init=False, factory=dict)
+
+    @property
+    def key(self) -> InventoryKey:
+        return self.cartridge, self.cartridge_size, self.cartridge_sha256
+
+    def add(self, html_file: InventoryHtmlFile) -> None:
+        """
+        Add the scanned HTML file to the inventory.
+        """
+        self.html_files.append(html_file)
+        for resource_id in html_file.resource_ids:
+            self._html_files_by_resource_id[resource_id] = html_file
+
+    def get_resource_iframes(self, resource_id: str) -> Optional[List[InventoryIframe]]:
+        """
+        Provide the iframes of the resource, ``None`` if the resource content wasn't scanned.
+        """
+        html_file = self._html_files_by_resource_id.get(resource_id)
+        return None if html_file is None else html_file.iframes
+
+    def iter_video_iframes(self) -> Iterator[InventoryIframe]:
+        """
+        Provide the iframes embedding the supported videos in the order of the HTML files.
+        """
+        for html_file in self.html_files:
+            yield from (iframe for iframe in html_file.iframes if iframe.url)
+
+    def write(self, output: IO[str]) -> None:
+        """
+        Write the inventory as JSON lines, a line per HTML file.
+        """
+        cartridge = {
+            "cartridge": self.cartridge,
+            "cartridge_size": self.cartridge_size,
+            "cartridge_sha256": self.cartridge_sha256,
+        }
+        for html_file in self.html_files:
+            output.write(json.dumps({**cartridge, **attrs.asdict(html_file)}) + "\n")
+
+
+def read_iframe_inventories(inventory_input: Iterable[str]) -> Dict[InventoryKey, IframeInventory]:
+    """
+    Read the inventory JSON lines and provide the inventories by their keys.
+
+    The inventories of several cartridges can be concatenated into a single
+    file. The lines written without the cartridge size and hash get the keys
+    that never match a cartridge, so they are ignored.
+    """
+    inventories = {}
+
+    for line in inventory_input:
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        inventory = IframeInventory(
+            entry.pop("cartridge"), entry.pop("cartridge_size", None), entry.pop("cartridge_sha256", None)
+        )
+        iframes = [InventoryIframe(**iframe) for iframe in entry.pop("iframes")]
+        inventories.setdefault(inventory.key, inventory).add(InventoryHtmlFile(iframes=iframes, **entry))
+
+    return inventories
+
+
+def load_iframe_inventories(inventory_file: Path) -> Dict[InventoryKey, IframeInventory]:
+    """
+    Load the inventories of the cartridges from the file.
+    """
+    with open(inventory_file, encoding="utf-8") as inventory_input:
+        return read_iframe_inventories(inventory_input)
+
+
+def find_iframe_inventory(
+    inventories: Dict[InventoryKey, IframeInventory],
+    input_file: Path,
+) -> Optional[IframeInventory]:
+    """
+    Provide the inventory scanned from the same cartridge file content.
+
+    The cartridge is hashed only if there is an inventory with its path and
+    size, so the batches without the inventories don't pay for it.
+    """
+    input_file = Path(input_file).resolve()
+    cartridge, cartridge_size = str(input_file), input_file.stat().st_size
+
+    if not any(key[:2] == (cartridge, cartridge_size) for key in inventories):
+        return None
+
+    return inventories.get((cartridge, cartridge_size, hash_file(input_file)))
+
+
+def scan_cartridge(input_file: Path, workers: Optional[int] = None) -> IframeInventory:
+    """
+    Build the iframe inventory of the cartridge without its extraction.
+
+    The HTML files are scanned concurrently by the given number of workers, a
+    single HTML file is scanned as is.
+    """
+    input_file = Path(input_file).resolve()
+    inventory = IframeInventory(str(input_file), input_file.stat().st_size, hash_file(input_file))
+
+    if not zipfile.is_zipfile(input_file):
+        inventory.add(InventoryHtmlFile(str(input_file), iframes=_scan_html(input_file.read_bytes())))
+        return inventory
+
+    with zipfile.ZipFile(input_file) as cartridge_zip, ThreadPoolExecutor(max_workers=workers) as executor:
+        # The member names are cleaned the same way as during the extraction to match the manifest hrefs.
+        html_members = [
+            (clean_file_name(info.filename), info)
+            for info in cartridge_zip.infolist()
+            if info.filename.endswith(HTML_FILE_EXTENSION)
+        ]
+        resource_ids_by_href = _get_resource_ids_by_content_href(cartridge_zip)
+
+        scanned_members = executor.map(lambda member: _scan_html(cartridge_zip.read(member[1])), html_members)
+        for (name, _), iframes in zip(html_members, scanned_members):
+            inventory.add(InventoryHtmlFile(name, resource_ids_by_href.get(name, []), iframes))
+
+    return inventory
+
+
+def _scan_html(content: bytes) -> List[InventoryIframe]:
+    return [InventoryIframe.from_src(src) for src in find_iframe_srcs(content)]
+
+
+def _get_resource_ids_by_content_href(cartridge_zip: zipfile.ZipFile) -> Dict[str, List[str]]:
+    """
+    Map the hrefs of the resource content files to the resource identifiers.
+
+    The resource content is its first file, the same as the converter uses.
+    """
+    resource_ids_by_href = {}
+
+    try:
+        manifest_info = cartridge_zip.getinfo(MANIFEST)
+    except KeyError:
+        return resource_ids_by_href
+
+    for identifier, href in _iter_manifest_resource_contents(cartridge_zip, manifest_info):
+        resource_ids_by_href.setdefault(clean_file_name(href), []).append(identifier)
+
+    return resource_ids_by_href
+
+
+def _iter_manifest_resource_contents(
+    cartridge_zip: zipfile.ZipFile,
+    manifest_info: zipfile.ZipInfo,
+) -> Iterator[Tuple[str, str]]:
+    with cartridge_zip.open(manifest_info) as manifest_file:
+        for resource in filesystem.iter_xml_elements(manifest_file, "{*}resource"):
+            file_element = resource.find("{*}file")
+            if file_element is not None and file_element.get("href") and resource.get("identifier"):
+                yield resource.get("identifier"), file_element.get("href")
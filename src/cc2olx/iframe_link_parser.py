@@ -1,7 +1,7 @@
 from urllib.parse import parse_qs, urlparse
 
 from cc2olx.link_file_reader import LinkFileReader
-from cc2olx.utils import element_builder
+from cc2olx.utils import element_builder, html_may_contain_tags
 
 
 class IframeLinkParserError(Exception):
@@ -16,8 +16,33 @@ class IframeLinkParser:
     written.
     """
 
-    def __init__(self, link_file):
+    # HTML tags the parser works with. HTML that doesn't contain them is not parsed at all.
+    HTML_TAGS = ("iframe",)
+
+    def __init__(self, link_file, iframe_inventory=None):
         self.link_map = LinkFileReader(link_file).get_link_map()
+        self.iframe_inventory = iframe_inventory
+
+    def needs_html_parsing(self, html_str, idref=None):
+        """
+        Decide whether the HTML must be parsed to look for the iframes.
+
+        If the resource content is listed in the iframe inventory, the HTML
+        is parsed only if it embeds any video from the link file.
+
+        Args:
+            html_str ([str]): The HTML content of the page.
+            idref ([str]): The identifier of the resource the HTML is the content of.
+
+        Returns:
+            [bool]: False if the HTML definitely doesn't contain iframes to convert.
+        """
+        if self.iframe_inventory is not None and idref is not None:
+            iframes = self.iframe_inventory.get_resource_iframes(idref)
+            if iframes is not None:
+                return any(self._extract_url(iframe.src) in self.link_map for iframe in iframes)
+
+        return html_may_contain_tags(html_str, self.HTML_TAGS)
 
     def _extract_src(self, iframe_element):
         """
@@ -125,8 +150,8 @@ class KalturaIframeLinkParser(IframeLinkParser):
     Link parser for Kaltura videos.
     """
 
-    def __init__(self, link_file):
-        super().__init__(link_file)
+    def __init__(self, link_file, iframe_inventory=None):
+        super().__init__(link_file, iframe_inventory)
         self.kalutra_url_format = "{}playManifest/entryId/{}/format/url/protocol/https"
 
     def _extract_url(self, url):
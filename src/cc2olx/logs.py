@@ -0,0 +1,209 @@
+"""
+Logging configuration of the conversion.
+
+The messages logged per converted item (loaded XML file, processed resource,
+unsupported element and so on) are sent to the details logger. They can be
+aggregated into summary counters, so huge cartridges don't pay for the
+formatting and output of hundreds of thousands of lines.
+
+The worker processes send their log records to the conversion process through
+a multiprocessing queue, and return their summary counters with the results.
+"""
+
+import logging
+import multiprocessing
+import queue
+from collections import Counter
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+
+DETAILS_LOGGER_NAME = "cc2olx.details"
+
+logger = logging.getLogger()
+
+
+class LogSummary:
+    """
+    Count the log messages per level and message template.
+
+    Only the first message of every template is formatted to be kept as an
+    example, the rest are just counted.
+    """
+
+    def __init__(self) -> None:
+        self.counts: Counter = Counter()
+        self.examples: Dict[Tuple[int, str], str] = {}
+
+    def add(self, level: int, msg: str, args: tuple) -> None:
+        key = (level, msg)
+        if key not in self.counts:
+            self.examples[key] = msg % args if args else msg
+        self.counts[key] += 1
+
+    def merge(self, other: "LogSummary") -> None:
+        """
+        Add the counters collected by another summary, e.g. in a worker process.
+        """
+        for key, count in other.counts.items():
+            self.examples.setdefault(key, other.examples[key])
+            self.counts[key] += count
+
+    def log(self) -> None:
+        """
+        Log the collected counters and reset them.
+        """
+        for (level, template), count in sorted(self.counts.items(), key=lambda item: (-item[1], item[0])):
+            logger.log(level, "%d x %r, e.g. %r", count, template, self.examples[(level, template)])
+
+        self.counts.clear()
+        self.examples.clear()
+
+
+class DetailsLogger(logging.LoggerAdapter):
+    """
+    Log the per-item messages or count them if the summary is enabled.
+
+    The counted messages don't create log records, so they cost about as
+    much as the messages filtered out by level.
+    """
+
+    def __init__(self, logger: logging.Logger) -> None:
+        super().__init__(logger, None)
+        self.summary: Optional[LogSummary] = None
+
+    def log(self, level: int, msg: str, *args, **kwargs) -> None:
+        if self.summary is None:
+            # The frame of this method is skipped to log the caller's location.
+            kwargs["stacklevel"] = kwargs.get("stacklevel", 1) + 1
+            super().log(level, msg, *args, **kwargs)
+        elif self.isEnabledFor(level):
+            self.summary.add(level, msg, args)
+
+
+details_logger = DetailsLogger(logging.getLogger(DETAILS_LOGGER_NAME))
+
+
+class LoggingSetup:
+    """
+    Configure the conversion logging and release its resources afterwards.
+
+    The logs are written to stderr, or to the file if it is provided. The file
+    is written by a separate thread through a queue, so the conversion doesn't
+    wait for the disk. If the summary is requested, the details logger messages
+    are aggregated by `LogSummary`.
+
+    The worker processes records are written to the file through a separate
+    multiprocessing queue, it's created when the first worker pool is started.
+    """
+
+    # The setup of the running conversion, the worker processes are configured after it.
+    current: Optional["LoggingSetup"] = None
+
+    def __init__(self, level: str, log_file: Optional[Path] = None, summary: bool = False) -> None:
+        self.summary = LogSummary() if summary else None
+        self._queue_handler = None
+        self._queue_listener = None
+        self._worker_queue_listener = None
+
+        if log_file is None:
+            logging.basicConfig(level=level, format=settings.LOG_FORMAT)
+        else:
+            file_handler = logging.FileHandler(log_file, encoding="utf-8")
+            file_handler.setFormatter(logging.Formatter(settings.LOG_FORMAT))
+            log_queue = queue.SimpleQueue()
+            self._queue_handler = QueueHandler(log_queue)
+            self._queue_listener = QueueListener(log_queue, file_handler)
+            self._queue_listener.start()
+            logger.addHandler(self._queue_handler)
+            logger.setLevel(level)
+
+        details_logger.summary = self.summary
+        LoggingSetup.current = self
+
+    def get_worker_log_queue(self) -> Optional[multiprocessing.Queue]:
+        """
+        Provide the queue of the worker processes records if the logs are written to the file.
+        """
+        if self._queue_listener is None:
+            return None
+
+        if self._worker_queue_listener is None:
+            self._worker_queue_listener = QueueListener(multiprocessing.Queue(), *self._queue_listener.handlers)
+            self._worker_queue_listener.start()
+
+        return self._worker_queue_listener.queue
+
+    def log_summary(self) -> None:
+        """
+        Log the aggregated details logger records if the summary is requested.
+        """
+        if self.summary:
+            self.summary.log()
+
+    def shutdown(self) -> None:
+        """
+        Flush the summary and the log file.
+        """
+        if self.summary:
+            self.summary.log()
+            details_logger.summary = None
+
+        if self._worker_queue_listener:
+            self._worker_queue_listener.stop()
+            self._worker_queue_listener.queue.close()
+
+        if self._queue_listener:
+            logger.removeHandler(self._queue_handler)
+            self._queue_listener.stop()
+            for handler in self._queue_listener.handlers:
+                handler.close()
+
+        if LoggingSetup.current is self:
+            LoggingSetup.current = None
+
+
+def get_worker_logging_initargs() -> Tuple[Optional[multiprocessing.Queue], int, bool]:
+    """
+    Provide the `init_worker_logging` arguments to configure a worker process after the current one.
+    """
+    log_queue = LoggingSetup.current.get_worker_log_queue() if LoggingSetup.current else None
+    return log_queue, logger.getEffectiveLevel(), details_logger.summary is not None
+
+
+def init_worker_logging(log_queue: Optional[multiprocessing.Queue], level: int, summary: bool) -> None:
+    """
+    Configure the logging of a worker process.
+
+    A forked worker inherits the handlers of the conversion process, but not
+    its queue listener thread, so the records are sent through the worker
+    queue instead. The details logger messages are counted by a new summary,
+    it's returned to the conversion process by `pop_worker_log_summary`.
+    """
+    if log_queue is not None:
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        logger.addHandler(QueueHandler(log_queue))
+
+    logger.setLevel(level)
+    details_logger.summary = LogSummary() if summary else None
+
+
+def pop_worker_log_summary() -> Optional[LogSummary]:
+    """
+    Provide the summary collected by the worker process so far and start a new one.
+    """
+    summary = details_logger.summary
+    if summary is not None:
+        details_logger.summary = LogSummary()
+    return summary
+
+
+def merge_worker_log_summary(summary: Optional[LogSummary]) -> None:
+    """
+    Add the summary collected by a worker process to the conversion process one.
+    """
+    if summary is not None and details_logger.summary is not None:
+        details_logger.summary.merge(summary)
@@ -9,10 +9,37 @@ import django
 from django.conf import settings
 
 from cc2olx import filesystem, olx
-from cc2olx.cli import parse_args, RESULT_TYPE_FOLDER, RESULT_TYPE_ZIP
-from cc2olx.constants import OLX_STATIC_DIR
-from cc2olx.models import Cartridge
-from cc2olx.parser import parse_options
+from cc2olx.analyze import analyze_cartridges, log_analysis_summary, write_analysis_report
+from cc2olx.checkpoint import CheckpointJournal
+from cc2olx.cli import (
+    ANALYZE_COMMAND,
+    OLX_LAYOUT_EXPLODED,
+    parse_analyze_args,
+    parse_args,
+    parse_plan_args,
+    PLAN_COMMAND,
+    RESULT_TYPE_FOLDER,
+    RESULT_TYPE_OLX,
+    RESULT_TYPE_TGZ,
+    RESULT_TYPE_ZIP,
+    RUN_COMMAND,
+)
+from cc2olx.constants import BYTES_IN_MEGABYTE, OLX_STATIC_DIR, TGZ_SUFFIX
+from cc2olx.conversion_hooks.utils import create_conversion_hooks
+from cc2olx.iframe_inventory import find_iframe_inventory, load_iframe_inventories
+from cc2olx.logs import LoggingSetup
+from cc2olx.models import Cartridge, WEB_RESOURCES_DIR
+from cc2olx.parser import get_output_path, parse_analyze_options, parse_options, parse_plan_options
+from cc2olx.progress import ProgressReporter, open_progress_output
+from cc2olx.sharding import (
+    create_shard_plan,
+    format_shard,
+    load_shard_plan,
+    log_shard_plan_summary,
+    write_result_index,
+    write_shard_plan,
+)
+from cc2olx.stats import ConversionStats, log_resources_report, write_resources_csv, write_stats_file
 
 
 def convert_one_file(
@@ -22,52 +49,130 @@ def convert_one_file(
     passport_file=None,
     relative_links_source=None,
     content_types_with_custom_blocks=None,
+    stats=None,
+    hooks=None,
+    memory_budget=None,
+    iframe_inventory=None,
+    output_dir=None,
+    archive=True,
+    exploded_olx_workers=None,
+    qti_workers=None,
 ):
+    """
+    Convert the cartridge into the OLX course tar.gz archive in the workspace.
+
+    If the output directory is provided, the archive is atomically written to
+    it instead of the workspace. Without the archive the OLX course directory
+    is written to the output directory. If the exploded OLX workers number is
+    provided, the OLX is written in the exploded layout, a file per block.
+    If the QTI workers number is not provided, `QTI_PARALLEL_WORKERS` is used.
+    """
     content_types_with_custom_blocks = content_types_with_custom_blocks or []
+    stats = ConversionStats(input_file) if stats is None else stats
+    hooks = create_conversion_hooks() if hooks is None else hooks
+
+    with hooks.conversion(input_file):
+        filesystem.create_directory(workspace)
+
+        # The extracted cartridge isn't a part of the output if the archive is written to the output directory.
+        cartridge = Cartridge(input_file, workspace, stream_static_files=output_dir is not None)
+
+        with stats.measure_stage("extract"), hooks.stage("extract"):
+            manifest = cartridge.extract()
+
+        with stats.measure_stage("load_manifest"), hooks.stage("load_manifest"):
+            cartridge.load_manifest(manifest)
+
+        with stats.measure_stage("normalize"), hooks.stage("normalize"):
+            cartridge.normalize()
 
-    filesystem.create_directory(workspace)
+        olx_export = olx.OlxExport(
+            cartridge,
+            link_file,
+            passport_file,
+            relative_links_source,
+            content_types_with_custom_blocks,
+            collect_resources_stats=stats.resources is not None,
+            hooks=hooks,
+            memory_budget=memory_budget,
+            iframe_inventory=iframe_inventory,
+            qti_workers=qti_workers,
+        )
+        stats.content_processors = olx_export.content_processors_stats
+        stats.content_post_processors = olx_export.content_post_processors_stats
+        olx_filename = cartridge.directory.parent / (cartridge.directory.name + "-course.xml")
+        exploded_olx_dirname = cartridge.directory.parent / (cartridge.directory.name + "-olx")
+        policy_filename = cartridge.directory.parent / "policy.json"
 
-    cartridge = Cartridge(input_file, workspace)
-    cartridge.load_manifest_extracted()
-    cartridge.normalize()
+        with stats.measure_stage("olx"), hooks.stage("olx"):
+            try:
+                if exploded_olx_workers:
+                    filesystem.create_directory(exploded_olx_dirname)
+                    olx_export.write_exploded_xml(exploded_olx_dirname, exploded_olx_workers)
+                else:
+                    with open(str(olx_filename), "w", encoding="utf-8") as olxfile:
+                        olx_export.write_xml(olxfile)
+            finally:
+                olx_export.close()
+
+        stats.resources = olx_export.resources_stats
+
+        with stats.measure_stage("policy"), hooks.stage("policy"):
+            with open(str(policy_filename), "w", encoding="utf-8") as policy:
+                policy.write(olx_export.policy())
+
+        tgz_filename = workspace / (cartridge.directory.name + TGZ_SUFFIX)
 
-    olx_export = olx.OlxExport(
-        cartridge,
-        link_file,
-        passport_file,
-        relative_links_source,
-        content_types_with_custom_blocks,
-    )
-    olx_filename = cartridge.directory.parent / (cartridge.directory.name + "-course.xml")
-    policy_filename = cartridge.directory.parent / "policy.json"
+        if exploded_olx_workers:
+            file_list = [(str(path), path.name) for path in sorted(exploded_olx_dirname.iterdir())]
+        else:
+            file_list = [(str(olx_filename), "course.xml")]
 
-    with open(str(olx_filename), "w", encoding="utf-8") as olxfile:
-        olxfile.write(olx_export.xml())
+        file_list += [
+            (str(policy_filename), "policies/course/policy.json"),
+            (str(cartridge.directory / WEB_RESOURCES_DIR), "/{}/".format(OLX_STATIC_DIR)),
+        ]
 
-    with open(str(policy_filename), "w", encoding="utf-8") as policy:
-        policy.write(olx_export.policy())
+        # Add static files that are outside of web_resources directory
+        file_list += [
+            (str(cartridge.directory / original_filepath), olx_static_path)
+            for olx_static_path, original_filepath in cartridge.olx_to_original_static_file_paths.extra.items()
+        ]
 
-    tgz_filename = (workspace / cartridge.directory.name).with_suffix(".tar.gz")
+        zip_members = [
+            (cartridge.cartridge, info, "{}/{}".format(OLX_STATIC_DIR, static_file_path))
+            for info, static_file_path in cartridge.iter_streamed_static_members()
+        ]
 
-    file_list = [
-        (str(olx_filename), "course.xml"),
-        (str(policy_filename), "policies/course/policy.json"),
-        (str(cartridge.directory / "web_resources"), "/{}/".format(OLX_STATIC_DIR)),
-    ]
+        with stats.measure_stage("package"), hooks.stage("package"):
+            if not archive:
+                olx_dirname = output_dir / cartridge.directory.name
+                stats.output_size = filesystem.add_in_directory(olx_dirname, file_list, zip_members)
+                stats.output_file = olx_dirname
+            elif output_dir is None:
+                filesystem.add_in_tar_gz(str(tgz_filename), file_list, zip_members)
+            else:
+                tgz_filename = output_dir / (cartridge.directory.name + TGZ_SUFFIX)
+                with filesystem.atomic_output_file(tgz_filename) as temp_tgz_filename:
+                    filesystem.add_in_tar_gz(temp_tgz_filename, file_list, zip_members)
 
-    # Add static files that are outside of web_resources directory
-    file_list += [
-        (str(cartridge.directory / original_filepath), olx_static_path)
-        for olx_static_path, original_filepath in cartridge.olx_to_original_static_file_paths.extra.items()
-    ]
+        if archive:
+            stats.output_file = tgz_filename
+            stats.output_size = tgz_filename.stat().st_size
 
-    filesystem.add_in_tar_gz(str(tgz_filename), file_list)
+    return stats
 
 
 def main():
     initialize_django()
 
-    args = parse_args()
+    if sys.argv[1:2] == [ANALYZE_COMMAND]:
+        return analyze(sys.argv[2:])
+
+    if sys.argv[1:2] == [PLAN_COMMAND]:
+        return plan(sys.argv[2:])
+
+    args = parse_args(sys.argv[2:] if sys.argv[1:2] == [RUN_COMMAND] else None)
     options = parse_options(args)
 
     workspace = options["workspace"]
@@ -75,39 +180,223 @@ def main():
     passport_file = options["passport_file"]
     relative_links_source = options["relative_links_source"]
     content_types_with_custom_blocks = options["content_types_with_custom_blocks"]
+    memory_budget = options["memory_budget"] and options["memory_budget"] * BYTES_IN_MEGABYTE
+    iframe_inventories = load_iframe_inventories(options["iframe_inventory"]) if options["iframe_inventory"] else {}
+    # The archives or the OLX directories are written right to the output folder, the extracted cartridges are
+    # removed one by one.
+    per_cartridge_output = options["output_format"] in (RESULT_TYPE_TGZ, RESULT_TYPE_OLX)
+    olx_output = options["output_format"] == RESULT_TYPE_OLX
+    exploded_olx_workers = options["olx_workers"] if options["olx_layout"] == OLX_LAYOUT_EXPLODED else None
 
     # setup logger
-    logging.basicConfig(level=options["log_level"], format=settings.LOG_FORMAT)
+    logging_setup = LoggingSetup(options["log_level"], options["log_file"], options["log_summary"])
     logger = logging.getLogger()
 
-    with tempfile.TemporaryDirectory() as tmpdirname:
+    if options["shard"]:
+        try:
+            options["input_files"] = get_shard_input_files(options)
+        except ValueError as exc:
+            logger.error("%s", exc)
+            logging_setup.shutdown()
+            return 1
+        logger.info("Converting %d cartridges of shard %s", len(options["input_files"]), format_shard(options["shard"]))
+
+    slowest_resources = options["slowest_resources"]
+    resources_csv = options["resources_csv"]
+    collect_resources_stats = bool(slowest_resources or resources_csv)
+    conversions_stats = []
+
+    progress_output = open_progress_output(options["progress_file"], options["progress_fd"])
+    if progress_output:
+        # The progress totals are known only when the inputs are scanned completely.
+        options["input_files"] = list(options["input_files"])
+    progress = ProgressReporter(progress_output, options["input_files"]) if progress_output else None
+
+    if progress:
+        progress.batch_started()
+
+    if per_cartridge_output:
+        workspace.mkdir(parents=True, exist_ok=True)
+
+    # The cartridges are extracted next to the OLX directories, so their static files can be hard linked.
+    with tempfile.TemporaryDirectory(prefix=".", dir=workspace if olx_output else None) as tmpdirname:
         temp_workspace = Path(tmpdirname) / workspace.stem
+        # A shard may have no cartridges, its output is still created.
+        filesystem.create_directory(temp_workspace)
+
+        checkpoint = (
+            CheckpointJournal(options["checkpoint_file"], workspace, options["resume"])
+            if options["checkpoint_file"]
+            else None
+        )
+
+        # Every output path belongs to one cartridge, including the ones converted by the previous runs.
+        output_owners = {
+            Path(entry.output_file[: -len(TGZ_SUFFIX)]): entry.input_file
+            for entry in (checkpoint.entries.values() if checkpoint else [])
+        }
 
         for input_file in options["input_files"]:
+            stats = ConversionStats(input_file, resources=[] if collect_resources_stats else None)
+            conversions_stats.append(stats)
+
+            checkpoint_entry = checkpoint.find_converted(input_file) if checkpoint else None
+            if checkpoint_entry:
+                logger.info("Skipping %s file converted by the previous run", input_file)
+                stats.resumed = True
+                stats.output_file = workspace / checkpoint_entry.output_file
+                stats.output_size = checkpoint_entry.output_size
+                if progress:
+                    progress.cartridge_finished(stats)
+                continue
+
+            if progress:
+                progress.cartridge_started(input_file)
+
+            # The cartridges found in the input subdirectories are written to the same output subdirectories.
+            output_path = get_output_path(input_file, options["input_directories"])
+            output_subdirectory = output_path.parent
+            output_owner = output_owners.setdefault(output_path, str(input_file))
+
             try:
+                if output_owner != str(input_file):
+                    raise FileExistsError(f"The output {output_path} is already written for {output_owner} file")
+
+                if per_cartridge_output:
+                    (workspace / output_subdirectory).mkdir(parents=True, exist_ok=True)
+                (temp_workspace / output_subdirectory).mkdir(parents=True, exist_ok=True)
+
                 convert_one_file(
                     input_file,
-                    temp_workspace,
+                    temp_workspace / output_subdirectory,
                     link_file,
                     passport_file,
                     relative_links_source,
                     content_types_with_custom_blocks,
+                    stats,
+                    create_conversion_hooks(
+                        *([progress.create_hook(input_file)] if progress else []), output_path=output_path
+                    ),
+                    memory_budget,
+                    find_iframe_inventory(iframe_inventories, input_file) if iframe_inventories else None,
+                    workspace / output_subdirectory if per_cartridge_output else None,
+                    not olx_output,
+                    exploded_olx_workers,
+                    options["qti_workers"],
                 )
             except Exception:
+                stats.succeeded = False
                 logger.exception("Error while converting %s file", input_file)
+            else:
+                if slowest_resources:
+                    log_resources_report(stats, slowest_resources)
+                if checkpoint:
+                    checkpoint.record(input_file, stats.output_file)
+            finally:
+                if per_cartridge_output:
+                    shutil.rmtree(str(temp_workspace), ignore_errors=True)
+
+            logging_setup.log_summary()
+
+            if progress:
+                progress.cartridge_finished(stats)
+
+            if options["fail_fast"] and not stats.succeeded:
+                logger.error("Stopping the batch after %s file conversion failure", input_file)
+                break
+
+        if checkpoint:
+            checkpoint.close()
+
+        if options["result_index"]:
+            output_root = workspace if per_cartridge_output else temp_workspace
+            write_result_index(options["result_index"], conversions_stats, output_root, options["shard"])
 
         if options["output_format"] == RESULT_TYPE_FOLDER:
             shutil.rmtree(str(workspace), ignore_errors=True)
-            shutil.copytree(str(temp_workspace), str(workspace))
+            shutil.copytree(str(temp_workspace), str(workspace), copy_function=filesystem.copy_file)
 
         if options["output_format"] == RESULT_TYPE_ZIP:
             shutil.make_archive(str(workspace), "zip", str(temp_workspace))
 
+    if options["stats_file"]:
+        write_stats_file(options["stats_file"], conversions_stats)
+
+    if resources_csv:
+        write_resources_csv(resources_csv, conversions_stats)
+
+    if progress:
+        progress.batch_finished()
+        progress_output.close()
+
     logger.info("Conversion completed")
+    logging_setup.shutdown()
+
+    return 1 if options["fail_fast"] and not all(stats.succeeded for stats in conversions_stats) else 0
+
+
+def analyze(argv=None):
+    """
+    Analyze the cartridges without their conversion and report the results as JSON lines.
+    """
+    options = parse_analyze_options(parse_analyze_args(argv))
+
+    logging.basicConfig(level=options["log_level"], format=settings.LOG_FORMAT)
+
+    analyses = analyze_cartridges(options["input_files"], options["workers"], options["count_qti_items"])
+
+    if options["report_file"]:
+        with open(options["report_file"], "w", encoding="utf-8") as report:
+            analyses = write_analysis_report(report, analyses)
+    else:
+        analyses = write_analysis_report(sys.stdout, analyses)
+
+    log_analysis_summary(analyses)
+
+    return 0
+
+
+def plan(argv=None):
+    """
+    Split the cartridges into shards with balanced estimated conversion times and write the plan as JSON.
+    """
+    options = parse_plan_options(parse_plan_args(argv))
+
+    logging.basicConfig(level=options["log_level"], format=settings.LOG_FORMAT)
+
+    analyses = analyze_cartridges(options["input_files"], options["workers"], options["count_qti_items"])
+    shard_plan = create_shard_plan(analyses, options["shards"])
+
+    if options["plan_file"]:
+        with open(options["plan_file"], "w", encoding="utf-8") as plan_output:
+            write_shard_plan(plan_output, shard_plan)
+    else:
+        write_shard_plan(sys.stdout, shard_plan)
+
+    log_shard_plan_summary(shard_plan)
 
     return 0
 
 
+def get_shard_input_files(options):
+    """
+    Provide the files of the cartridges of the shard to convert.
+
+    The shards are taken from the plan file if it's provided, otherwise the
+    input files are planned the same way as the plan command does.
+    """
+    shard, shards = options["shard"]
+
+    if options["plan_file"]:
+        shard_plan = load_shard_plan(options["plan_file"])
+        if shard_plan.shards != shards:
+            raise ValueError(f"The plan {options['plan_file']} has {shard_plan.shards} shards, not {shards}.")
+    else:
+        shard_plan = create_shard_plan(analyze_cartridges(sorted(options["input_files"])), shards)
+
+    return shard_plan.get_shard_input_files(shard)
+
+
 def initialize_django():
     """
     Initialize the Django package.
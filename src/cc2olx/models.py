@@ -2,6 +2,7 @@ import attrs
 import logging
 import os.path
 import re
+import shutil
 import zipfile
 from collections import ChainMap
 from pathlib import Path
@@ -11,11 +12,13 @@ from typing import Dict, Optional
 
 from cc2olx import filesystem
 from cc2olx.external.canvas import ModuleMeta
+from cc2olx.logs import details_logger
 from cc2olx.utils import clean_file_name
 
 logger = logging.getLogger()
 
 MANIFEST = "imsmanifest.xml"
+WEB_RESOURCES_DIR = "web_resources"
 
 # canvas-cc course settings
 COURSE_SETTINGS_DIR = "course_settings"
@@ -92,7 +95,7 @@ class OlxToOriginalStaticFilePaths:
 
 
 class Cartridge:
-    def __init__(self, cartridge_file, workspace):
+    def __init__(self, cartridge_file, workspace, stream_static_files=False):
         self.cartridge = zipfile.ZipFile(str(cartridge_file))
         self.metadata = None
         self.resources = None
@@ -110,6 +113,10 @@ class Cartridge:
         self.olx_to_original_static_file_paths = OlxToOriginalStaticFilePaths()
 
         self.workspace = workspace
+        # The stored (uncompressed) static files which aren't resources are packaged
+        # right from the cartridge archive instead of their extraction.
+        self.stream_static_files = stream_static_files
+        self.streamed_static_members = {}
 
     def __repr__(self):
         filename = os.path.basename(self.file_path)
@@ -342,8 +349,13 @@ class Cartridge:
         return resource
 
     def load_manifest_extracted(self):
-        manifest = self._extract()
+        manifest = self.extract()
+        return self.load_manifest(manifest)
 
+    def load_manifest(self, manifest):
+        """
+        Load the manifest and the course settings of the extracted cartridge.
+        """
         # load module_meta
         self.is_canvas_flavor = self._check_if_canvas_flavor()
         if self.is_canvas_flavor:
@@ -362,6 +374,8 @@ class Cartridge:
         # Keep a map with href -> identifier mapping. Used when processing statics.
         self.resource_id_by_href = {r["href"]: r["identifier"] for r in self.resources if "href" in r}
 
+        self._extract_streamed_resource_files()
+
         self.version = self.metadata.get("schema", {}).get("version", self.version)
         return data
 
@@ -420,12 +434,56 @@ class Cartridge:
         """
         return self.directory / file_name
 
-    def _extract(self):
-        path_extracted = filesystem.unzip_directory(self.file_path, self.workspace)
+    def extract(self):
+        """
+        Extract the cartridge into the workspace and provide the manifest path.
+        """
+        if self.stream_static_files:
+            self.streamed_static_members = {
+                name: info
+                for name, info in ((clean_file_name(info.filename), info) for info in self.cartridge.infolist())
+                if self._is_streamable_static_member(name, info)
+            }
+
+        path_extracted = filesystem.unzip_directory(
+            self.file_path,
+            self.workspace,
+            lambda info: info.filename in self.streamed_static_members,
+        )
         self.directory = path_extracted
         manifest = path_extracted / MANIFEST
         return manifest
 
+    @staticmethod
+    def _is_streamable_static_member(name: str, info: zipfile.ZipInfo) -> bool:
+        return (
+            name.startswith(WEB_RESOURCES_DIR + "/") and info.compress_type == zipfile.ZIP_STORED and not info.is_dir()
+        )
+
+    def _extract_streamed_resource_files(self):
+        """
+        Extract the streamed static files which are the resource files.
+
+        The resource files are read by the content processors, so they are
+        needed in the workspace.
+        """
+        for resource in self.resources:
+            for child in resource.get("children", []):
+                if not isinstance(child, ResourceFile):
+                    continue
+                name = clean_file_name(child.href)
+                info = self.streamed_static_members.pop(name, None)
+                if info is not None:
+                    with self.cartridge.open(info) as member, open(self.directory / name, "wb") as resource_file:
+                        shutil.copyfileobj(member, resource_file)
+
+    def iter_streamed_static_members(self):
+        """
+        Provide the streamed static files with their paths in the OLX static directory.
+        """
+        for name, info in self.streamed_static_members.items():
+            yield info, name.removeprefix(WEB_RESOURCES_DIR + "/")
+
     def _check_if_canvas_flavor(self):
         """
         Checks if the current file is exported from canvas.
@@ -635,7 +693,7 @@ class Cartridge:
             elif tag == "metadata":
                 child_data = self._parse_resource_metadata(child)
             else:
-                logger.info("Unsupported Resource Type %s", tag)
+                details_logger.info("Unsupported Resource Type %s", tag)
                 continue
             if child_data:
                 children.append(child_data)
@@ -1,8 +1,14 @@
+import io
 import json
 import logging
+import time
 import xml.dom.minidom
+from concurrent.futures import ThreadPoolExecutor
 from functools import cached_property
-from typing import List, Type
+from pathlib import Path
+from typing import List, Optional, Type
+
+from django.conf import settings
 
 from cc2olx.constants import FALLBACK_OLX_CONTENT
 from cc2olx.content_post_processors import AbstractContentPostProcessor
@@ -11,11 +17,22 @@ from cc2olx.content_post_processors.utils import load_content_post_processor_typ
 from cc2olx.content_processors import AbstractContentProcessor
 from cc2olx.content_processors.dataclasses import ContentProcessorContext
 from cc2olx.content_processors.utils import load_content_processor_types
+from cc2olx.conversion_hooks import ConversionHooks
 from cc2olx.iframe_link_parser import KalturaIframeLinkParser
-from cc2olx.utils import passport_file_parser
+from cc2olx.logs import details_logger
+from cc2olx.models import ResourceFile
+from cc2olx.spill import SpilledCDATASection, SpilledElement, SpillStorage
+from cc2olx.stats import ResourceStats, create_processors_stats, get_current_rss, get_peak_rss, measure_xml_size
+from cc2olx.utils import LazyProcessPool, passport_file_parser
 
 logger = logging.getLogger()
 
+OLX_INDENT = "\t"
+OLX_NEWLINE = "\n"
+
+# The children of these blocks are exploded recursively, the other blocks are written as a whole.
+EXPLODED_OLX_CONTAINER_TAGS = ("course", "chapter", "sequential", "vertical")
+
 
 class OlxExport:
     """
@@ -32,18 +49,32 @@ class OlxExport:
         passport_file=None,
         relative_links_source=None,
         content_types_with_custom_blocks=None,
+        collect_resources_stats=False,
+        hooks=None,
+        memory_budget=None,
+        iframe_inventory=None,
+        qti_workers=None,
     ):
         self.cartridge = cartridge
         self.doc = None
         self.link_file = link_file
         self.passport_file = passport_file
         self.relative_links_source = relative_links_source
-        self.iframe_link_parser = KalturaIframeLinkParser(self.link_file) if link_file else None
+        self.iframe_link_parser = KalturaIframeLinkParser(self.link_file, iframe_inventory) if link_file else None
         self.lti_consumer_present = False
         self.lti_consumer_ids = set()
         self._content_types_with_custom_blocks = content_types_with_custom_blocks or []
+        qti_workers = settings.QTI_PARALLEL_WORKERS if qti_workers is None else qti_workers
+        # The pool is shared by the QTI assessments of the course, it's shut down when the export is closed.
+        self._qti_process_pool = LazyProcessPool(qti_workers) if qti_workers > 1 else None
         self._content_processors = self._create_content_processors(load_content_processor_types())
         self._content_post_processors = self._create_content_post_processors(load_content_post_processor_types())
+        self.content_processors_stats = create_processors_stats()
+        self.content_post_processors_stats = create_processors_stats()
+        self.resources_stats = [] if collect_resources_stats else None
+        self.hooks = hooks or ConversionHooks([])
+        self._memory_budget = memory_budget
+        self._spill_storage = None
 
     def _create_content_processors(
         self,
@@ -56,6 +87,7 @@ class OlxExport:
             iframe_link_parser=self.iframe_link_parser,
             lti_consumer_ids=self.lti_consumer_ids,
             content_types_with_custom_blocks=self._content_types_with_custom_blocks,
+            qti_process_pool=self._qti_process_pool,
         )
         return [content_processor_type(self.cartridge, context) for content_processor_type in content_processor_types]
 
@@ -73,6 +105,88 @@ class OlxExport:
         ]
 
     def xml(self):
+        buffer = io.StringIO()
+        self.write_xml(buffer)
+        return buffer.getvalue()
+
+    def write_xml(self, writer) -> None:
+        """
+        Build the OLX course document and write it to the writer.
+
+        Unlike `xml`, the document markup isn't accumulated in memory, so the
+        spilled fragments are copied straight to the writer.
+        """
+        self._build_document()
+        self.doc.writexml(writer, "", OLX_INDENT, OLX_NEWLINE)
+
+    def write_exploded_xml(self, directory: Path, workers: Optional[int] = None) -> None:
+        """
+        Build the OLX course document and write it in the exploded layout.
+
+        Every block with `url_name` is written to its own `<tag>/<url_name>.xml`
+        file in the directory and its parent only points to it, so the top-level
+        `course.xml` is a pointer to `course/course.xml`. The block files are
+        written concurrently by the given number of workers, the spilled
+        fragments are written by a single one, since they share the storage.
+        """
+        self._build_document()
+        xcourse = self.doc.documentElement
+        course_pointer = self.doc.createElement(xcourse.tagName)
+        for attribute in ("url_name", "org", "course"):
+            course_pointer.setAttribute(attribute, xcourse.getAttribute(attribute))
+
+        with ThreadPoolExecutor(max_workers=1 if self._spill_storage else workers) as executor:
+            block_files = []
+            self._explode_children(xcourse, directory, executor, block_files, set())
+            block_files.append(executor.submit(_write_block_file, directory, xcourse))
+
+            with open(directory / "course.xml", "w", encoding="utf-8") as course_file:
+                course_pointer.writexml(course_file, "", OLX_INDENT, OLX_NEWLINE)
+
+            for block_file in block_files:
+                block_file.result()
+
+    def _explode_children(self, element, directory, executor, block_files, exploded_blocks) -> None:
+        """
+        Replace the element children with the pointers to their block files.
+
+        The children are exploded depth first, so a block is written when its
+        children are already replaced. The blocks without `url_name`, the ones
+        with the same tag and `url_name` as an already exploded block and the
+        spilled chapters stay inline.
+        """
+        for child in list(element.childNodes):
+            if child.nodeType != child.ELEMENT_NODE or isinstance(child, SpilledElement):
+                continue
+
+            if child.tagName in EXPLODED_OLX_CONTAINER_TAGS:
+                self._explode_children(child, directory, executor, block_files, exploded_blocks)
+
+            block = (child.tagName, child.getAttribute("url_name"))
+            if not block[1] or "/" in block[1] or block in exploded_blocks:
+                continue
+            exploded_blocks.add(block)
+
+            pointer = self.doc.createElement(child.tagName)
+            pointer.setAttribute("url_name", block[1])
+            element.replaceChild(pointer, child)
+            block_files.append(executor.submit(_write_block_file, directory, child))
+
+    def close(self) -> None:
+        """
+        Release the storage of the spilled document fragments and the QTI worker processes.
+        """
+        if self._qti_process_pool is not None:
+            self._qti_process_pool.shutdown()
+
+        if self._spill_storage is not None:
+            self._spill_storage.close()
+            self._spill_storage = None
+
+    def _build_document(self) -> None:
+        """
+        Build the OLX course document from the normalized cartridge data.
+        """
         self.doc = xml.dom.minidom.Document()
         self.doc.appendChild(self.doc.createComment(" Generated by cc2olx "))
 
@@ -84,9 +198,90 @@ class OlxExport:
         self.doc.appendChild(xcourse)
 
         tags = "chapter sequential vertical".split()
-        self._add_olx_nodes(xcourse, self.cartridge.normalized["children"], tags)
+        if self.hooks:
+            self.hooks.resources_found(self._count_leaf_elements(self.cartridge.normalized["children"], len(tags)))
+
+        for chapter_data in self.cartridge.normalized["children"]:
+            self._add_olx_nodes(xcourse, [chapter_data], tags)
+
+            if self._is_memory_budget_exceeded():
+                self._spill_chapters(xcourse)
+
+        self._log_content_processors_stats()
+
+    def _is_memory_budget_exceeded(self) -> bool:
+        """
+        Check whether the process memory usage exceeds the conversion memory budget.
+
+        If the current memory usage can't be determined (it's read from procfs),
+        the peak one is used instead, it's never less than the current one. If
+        neither is available, the budget is disabled with a warning.
+        """
+        if self._memory_budget is None:
+            return False
+
+        rss = get_current_rss()
+        if rss is None:
+            rss = get_peak_rss()
+
+        if rss is None:
+            logger.warning("The memory usage can't be determined on this platform, the memory budget is ignored.")
+            self._memory_budget = None
+            return False
+
+        return rss > self._memory_budget
+
+    @property
+    def spill_storage(self) -> SpillStorage:
+        """
+        Provide the storage of the spilled document fragments.
+
+        The storage file is created in the workspace, since the temporary
+        directory can be a memory-backed filesystem.
+        """
+        if self._spill_storage is None:
+            self._spill_storage = SpillStorage(self.cartridge.workspace)
+        return self._spill_storage
+
+    def _spill_chapters(self, xcourse: "xml.dom.minidom.Element") -> None:
+        """
+        Replace the completed chapters in the course with their spilled markup.
+        """
+        for chapter in list(xcourse.childNodes):
+            if not isinstance(chapter, SpilledElement):
+                spilled_chapter = SpilledElement(chapter, self.spill_storage, OLX_INDENT, OLX_INDENT, OLX_NEWLINE)
+                xcourse.replaceChild(spilled_chapter, chapter)
+                chapter.unlink()
+
+        logger.info(
+            "The course chapters are spilled to disk, %d characters in total.", self.spill_storage.spilled_characters
+        )
 
-        return self.doc.toprettyxml()
+    def _spill_large_payloads(self, olx_node: "xml.dom.minidom.Element") -> None:
+        """
+        Replace the large CDATA sections of the node with the spilled ones if the memory budget is exceeded.
+        """
+        for child in olx_node.childNodes:
+            if (
+                child.nodeType == child.CDATA_SECTION_NODE
+                and not isinstance(child, SpilledCDATASection)
+                and len(child.data) >= settings.SPILL_PAYLOAD_MIN_SIZE
+                and self._is_memory_budget_exceeded()
+            ):
+                spilled_child = SpilledCDATASection(child.data, self.spill_storage)
+                olx_node.replaceChild(spilled_child, child)
+
+    def _log_content_processors_stats(self) -> None:
+        """
+        Log the counters collected by content processors.
+        """
+        for content_processor in self._content_processors:
+            if content_processor.stats:
+                logger.info(
+                    "%s stats: %s",
+                    type(content_processor).__name__,
+                    ", ".join(f"{name}={count}" for name, count in sorted(content_processor.stats.items())),
+                )
 
     def policy(self):
         """
@@ -185,7 +380,8 @@ class OlxExport:
         leaf = not tags
         for element_data in course_data:
             if leaf:
-                children = self._create_olx_nodes(element_data)
+                with self.hooks.resource(element_data.get("identifierref")):
+                    children = self._create_olx_nodes(element_data)
             else:
                 children = [self.doc.createElement(tags[0])]
 
@@ -202,6 +398,17 @@ class OlxExport:
                 if "children" in element_data:
                     self._add_olx_nodes(child, element_data["children"], tags[1:])
 
+    def _count_leaf_elements(self, course_data: List[dict], depth: int) -> int:
+        """
+        Count the elements `_add_olx_nodes` creates OLX nodes from by content processors.
+
+        The elements nested `depth` levels deep and deeper are leaf ones.
+        """
+        return sum(
+            (depth <= 0) + self._count_leaf_elements(element_data.get("children", []), depth - 1)
+            for element_data in course_data
+        )
+
     def _create_olx_nodes(self, element_data: dict) -> List["xml.dom.minidom.Element"]:
         """
         Help to create OLX nodes of different Common Cartridge resource types.
@@ -225,32 +432,77 @@ class OlxExport:
             logger.warning("Missing resource: %s", idref)
             return self._fallback_olx_nodes
 
+        if self.resources_stats is None:
+            return self._process_resource(resource, idref)
+
+        start_time = time.perf_counter()
+        olx_nodes = self._process_resource(resource, idref)
+        self.resources_stats.append(
+            ResourceStats(
+                identifierref=idref,
+                type=resource.get("type", ""),
+                time=time.perf_counter() - start_time,
+                input_size=self._get_resource_input_size(resource),
+                output_size=measure_xml_size(olx_nodes),
+            )
+        )
+        return olx_nodes
+
+    def _process_resource(self, resource: dict, idref: str) -> List["xml.dom.minidom.Element"]:
+        """
+        Create the resource OLX nodes by the first content processor that can handle it.
+        """
         for content_processor in self._content_processors:
+            content_processor_name = type(content_processor).__name__
+            content_processor_stats = self.content_processors_stats[content_processor_name]
+
             try:
-                olx_nodes = content_processor.process(resource, idref)
+                with content_processor_stats.measure_call(), self.hooks.content_processor_call(
+                    content_processor_name, idref
+                ):
+                    olx_nodes = content_processor.process(resource, idref)
             except Exception:
                 logger.exception(
                     'An error occurred during resource "%s" processing by %s:',
                     idref,
-                    type(content_processor).__name__,
+                    content_processor_name,
                 )
                 logger.error("The processor is skipped.")
             else:
                 if olx_nodes:
-                    logger.info(
+                    content_processor_stats.processed += 1
+                    details_logger.info(
                         'The resource with "%s" identifier is successfully processed by %s.',
                         idref,
-                        type(content_processor).__name__,
+                        content_processor_name,
                     )
 
                     for olx_node in olx_nodes:
                         self._post_process(olx_node, idref)
 
+                        if self._memory_budget is not None:
+                            self._spill_large_payloads(olx_node)
+
                     return olx_nodes
 
         logger.warning('The resource with "%s" identifier value is not supported.', idref)
         return self._fallback_olx_nodes
 
+    def _get_resource_input_size(self, resource: dict) -> int:
+        """
+        Provide the total size of the resource files in bytes.
+        """
+        input_size = 0
+
+        for child in resource.get("children", []):
+            if isinstance(child, ResourceFile):
+                try:
+                    input_size += self.cartridge.build_resource_file_path(child.href).stat().st_size
+                except OSError:
+                    pass
+
+        return input_size
+
     @cached_property
     def _fallback_olx_nodes(self) -> List["xml.dom.minidom.Element"]:
         """
@@ -267,19 +519,39 @@ class OlxExport:
         Perform additional processing of the generated OLX node.
         """
         for post_processor in self._content_post_processors:
+            post_processor_name = type(post_processor).__name__
+            post_processor_stats = self.content_post_processors_stats[post_processor_name]
+
             try:
-                post_processor.process(olx_node)
+                with post_processor_stats.measure_call(), self.hooks.content_post_processor_call(
+                    post_processor_name, idref
+                ):
+                    post_processor.process(olx_node)
             except Exception:
                 logger.exception(
                     'An error occurred during <%s> node post-processing by %s for resource "%s":',
                     olx_node.tagName,
-                    type(post_processor).__name__,
+                    post_processor_name,
                     idref,
                 )
                 logger.error("The post processor is skipped.")
             else:
-                logger.info(
+                post_processor_stats.processed += 1
+                details_logger.info(
                     'The resource with "%s" identifier is successfully post-processed by %s.',
                     idref,
-                    type(post_processor).__name__,
+                    post_processor_name,
                 )
+
+
+def _write_block_file(directory: Path, element: "xml.dom.minidom.Element") -> None:
+    """
+    Write the OLX block to its file in the exploded layout, `url_name` is defined by the file name.
+    """
+    url_name = element.getAttribute("url_name")
+    element.removeAttribute("url_name")
+    block_directory = directory / element.tagName
+    block_directory.mkdir(parents=True, exist_ok=True)
+
+    with open(block_directory / f"{url_name}.xml", "w", encoding="utf-8") as block_file:
+        element.writexml(block_file, "", OLX_INDENT, OLX_NEWLINE)
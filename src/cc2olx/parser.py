@@ -1,47 +1,199 @@
-from pathlib import Path
+import heapq
+import logging
+import os
+from pathlib import Path, PurePosixPath
+from typing import Iterable, Iterator, Sequence, Tuple
+
+from django.conf import settings
 
 COMMON_CARTRIDGE_FILE_EXTENSION = ".imscc"
 
+logger = logging.getLogger()
+
 
 def _is_cartridge_file(path):
     return path.is_file() and path.suffix == COMMON_CARTRIDGE_FILE_EXTENSION
 
 
-def _get_files(parsed_args):
+def _matches_any(path: PurePosixPath, patterns: Sequence[str]) -> bool:
+    return any(path.match(pattern) for pattern in patterns)
+
+
+def _scan_directory(
+    directory: str,
+    include: Sequence[str],
+    exclude: Sequence[str],
+    relative_path: PurePosixPath = PurePosixPath(),
+) -> Iterator[Tuple[Path, int]]:
     """
-    Collects all Common Cartridge files from list of files and directories.
+    Recursively find the cartridge files in the directory with their sizes.
+
+    The entries are visited in the order of their names. The patterns are
+    matched against the paths relative to the input directory, the excluded
+    subdirectories aren't scanned. The symbolic links to directories aren't
+    followed to avoid the cycles.
     """
+    try:
+        with os.scandir(directory) as entries:
+            entries = sorted(entries, key=lambda entry: entry.name)
+    except OSError as exc:
+        logger.warning("Unable to scan %s directory: %s", directory, exc)
+        return
+
+    for entry in entries:
+        entry_path = relative_path / entry.name
+
+        if _matches_any(entry_path, exclude):
+            continue
 
-    files = set()
+        if entry.is_dir(follow_symlinks=False):
+            yield from _scan_directory(entry.path, include, exclude, entry_path)
+        elif (
+            entry.name.endswith(COMMON_CARTRIDGE_FILE_EXTENSION)
+            and entry.is_file()
+            and (not include or _matches_any(entry_path, include))
+        ):
+            yield Path(entry.path), entry.stat().st_size
 
-    for path in parsed_args.inputs:
-        if not path.exists():
-            raise FileNotFoundError
 
-        if _is_cartridge_file(path):
-            files.add(path)
+def iter_cartridge_files(
+    paths: Iterable[Path],
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = (),
+) -> Iterator[Tuple[Path, int]]:
+    """
+    Find the Common Cartridge files with their sizes in the files and directories.
+
+    The directories are scanned recursively and lazily, the files are provided
+    as soon as they are found. The include and exclude glob patterns don't
+    apply to the files given explicitly.
+    """
+    found_files = set()
 
+    for path in paths:
         if path.is_dir():
-            for input_file in path.iterdir():
-                if _is_cartridge_file(input_file):
-                    files.add(input_file)
+            cartridge_files = _scan_directory(str(path), include, exclude)
+        elif _is_cartridge_file(path):
+            cartridge_files = [(path, path.stat().st_size)]
+        else:
+            continue
 
-    return files
+        for cartridge_file, size in cartridge_files:
+            if cartridge_file not in found_files:
+                found_files.add(cartridge_file)
+                yield cartridge_file, size
+
+
+def order_largest_first(cartridge_files: Iterable[Tuple[Path, int]], window: int) -> Iterator[Path]:
+    """
+    Reorder the cartridge files so the larger ones come first.
+
+    Not more than `window` files are read ahead, the next file is the largest
+    of them; the files of the same size keep their order.
+    """
+    found_files = []
+
+    for index, (cartridge_file, size) in enumerate(cartridge_files):
+        heapq.heappush(found_files, (-size, index, cartridge_file))
+        if len(found_files) >= window:
+            yield heapq.heappop(found_files)[2]
+
+    while found_files:
+        yield heapq.heappop(found_files)[2]
+
+
+def get_output_path(input_file: Path, input_directories: Sequence[Path]) -> Path:
+    """
+    Provide the cartridge conversion output path relative to the output folder, without the suffix.
+
+    The cartridges found in the input directories keep their subdirectories,
+    e.g. `2023/course.imscc` and `2024/course.imscc` are converted to
+    `2023/course` and `2024/course`, so the same-named cartridges don't share
+    the output. The other cartridges are named after their files.
+    """
+    for directory in input_directories:
+        try:
+            return input_file.absolute().relative_to(directory.absolute()).with_suffix("")
+        except ValueError:
+            continue
+
+    return Path(input_file.stem)
+
+
+def _get_files(parsed_args):
+    """
+    Collects all Common Cartridge files from list of files and directories.
+
+    The files are found lazily, the larger ones first. All the input paths are
+    checked to exist before the scan.
+    """
+    missing_paths = [str(path) for path in parsed_args.inputs if not path.exists()]
+    if missing_paths:
+        raise FileNotFoundError("The input paths don't exist: {}".format(", ".join(missing_paths)))
+
+    cartridge_files = iter_cartridge_files(parsed_args.inputs, parsed_args.include or (), parsed_args.exclude or ())
+    return order_largest_first(cartridge_files, settings.INPUT_FILES_ORDERING_WINDOW)
 
 
 def parse_options(args):
     """
     Parses script options from argparse arguments.
     """
-    input_files = _get_files(args)
+    input_files = _get_files(args) if args.inputs else []
 
     return {
         "input_files": input_files,
+        "input_directories": [path for path in args.inputs or [] if path.is_dir()],
         "output_format": args.result,
         "log_level": args.loglevel,
+        "log_file": args.log_file,
+        "log_summary": args.log_summary,
         "workspace": Path.cwd() / args.output,
         "link_file": args.link_file,
+        "iframe_inventory": args.iframe_inventory,
         "passport_file": args.passport_file,
         "relative_links_source": args.relative_links_source,
         "content_types_with_custom_blocks": args.content_types_with_custom_blocks,
+        "memory_budget": args.memory_budget,
+        "qti_workers": args.qti_workers,
+        "stats_file": args.stats_file,
+        "slowest_resources": args.slowest_resources,
+        "resources_csv": args.resources_csv,
+        "progress_file": args.progress_file,
+        "progress_fd": args.progress_fd,
+        "shard": args.shard,
+        "plan_file": args.plan_file,
+        "result_index": args.result_index,
+        "olx_layout": args.olx_layout,
+        "olx_workers": args.olx_workers,
+        "checkpoint_file": args.checkpoint_file,
+        "resume": args.resume,
+        "fail_fast": args.fail_fast,
+    }
+
+
+def parse_analyze_options(args):
+    """
+    Parses analyze command options from argparse arguments.
+    """
+    return {
+        "input_files": sorted(_get_files(args)),
+        "log_level": args.loglevel,
+        "report_file": args.report_file,
+        "workers": args.workers,
+        "count_qti_items": not args.skip_qti_items,
+    }
+
+
+def parse_plan_options(args):
+    """
+    Parses plan command options from argparse arguments.
+    """
+    return {
+        "input_files": sorted(_get_files(args)),
+        "log_level": args.loglevel,
+        "shards": args.shards,
+        "plan_file": args.plan_file,
+        "workers": args.workers,
+        "count_qti_items": not args.skip_qti_items,
     }
@@ -0,0 +1,139 @@
+"""
+Machine-readable conversion progress reporting.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import IO, Iterable, Optional
+
+from django.conf import settings
+
+from cc2olx.conversion_hooks import BaseConversionHook
+from cc2olx.stats import ConversionStats
+
+
+class ProgressReporter:
+    """
+    Write the batch conversion progress events as JSON lines.
+
+    Every event is a JSON object with `event` name, `timestamp` and the
+    event-specific fields. The estimated time of arrival is computed from the
+    input cartridges' sizes, the current cartridge progress is estimated by the
+    share of its converted resources. The cartridges skipped by the resumed
+    batch take no time, so they are left out of the estimate.
+    """
+
+    def __init__(self, output: IO[str], input_files: Iterable[Path]) -> None:
+        self._output = output
+        self._input_sizes = {input_file: input_file.stat().st_size for input_file in input_files}
+        self._bytes_total = sum(self._input_sizes.values())
+        self._bytes_done = 0
+        self._bytes_resumed = 0
+        self._cartridges_done = 0
+        self._start_time = time.monotonic()
+
+    def _write_event(self, event: str, **fields) -> None:
+        self._output.write(json.dumps({"event": event, "timestamp": time.time(), **fields}) + "\n")
+        self._output.flush()
+
+    def _estimate_time_left(self, bytes_done: float) -> Optional[float]:
+        if not bytes_done:
+            return None
+        elapsed = time.monotonic() - self._start_time
+        return elapsed * (self._bytes_total - self._bytes_resumed - bytes_done) / bytes_done
+
+    def batch_started(self) -> None:
+        self._write_event("batch_started", cartridges_total=len(self._input_sizes), bytes_total=self._bytes_total)
+
+    def cartridge_started(self, input_file: Path) -> None:
+        self._write_event(
+            "cartridge_started",
+            input_file=str(input_file),
+            input_size=self._input_sizes[input_file],
+            cartridges_done=self._cartridges_done,
+            cartridges_total=len(self._input_sizes),
+        )
+
+    def resources_processed(self, input_file: Path, processed: int, total: int) -> None:
+        cartridge_progress = processed / total if total else 1.0
+        self._write_event(
+            "resources_processed",
+            input_file=str(input_file),
+            processed=processed,
+            total=total,
+            eta=self._estimate_time_left(self._bytes_done + self._input_sizes[input_file] * cartridge_progress),
+        )
+
+    def cartridge_finished(self, stats: ConversionStats) -> None:
+        if stats.resumed:
+            self._bytes_resumed += self._input_sizes[stats.input_file]
+        else:
+            self._bytes_done += self._input_sizes[stats.input_file]
+        self._cartridges_done += 1
+        self._write_event(
+            "cartridge_finished",
+            input_file=str(stats.input_file),
+            succeeded=stats.succeeded,
+            bytes_packaged=stats.output_size,
+            cartridges_done=self._cartridges_done,
+            cartridges_total=len(self._input_sizes),
+            eta=self._estimate_time_left(self._bytes_done),
+        )
+
+    def batch_finished(self) -> None:
+        self._write_event(
+            "batch_finished",
+            cartridges_done=self._cartridges_done,
+            elapsed=time.monotonic() - self._start_time,
+        )
+
+    def create_hook(self, input_file: Path) -> "ProgressHook":
+        """
+        Create the hook reporting the cartridge resources conversion progress.
+        """
+        return ProgressHook(self, input_file)
+
+
+def open_progress_output(progress_file: Optional[Path], progress_fd: Optional[int]) -> Optional[IO[str]]:
+    """
+    Open the progress events output if it is requested.
+
+    The file descriptor is left open when the output is closed, since it is
+    owned by the process that has started the conversion.
+    """
+    if progress_fd is not None:
+        return open(progress_fd, "w", encoding="utf-8", closefd=False)
+    if progress_file is not None:
+        return open(progress_file, "w", encoding="utf-8")
+    return None
+
+
+class ProgressHook(BaseConversionHook):
+    """
+    Report the number of the converted cartridge resources.
+
+    The events are written not more often than `PROGRESS_EVENTS_INTERVAL`
+    seconds, so the reporting cost doesn't depend on the resources number.
+    """
+
+    def __init__(self, reporter: ProgressReporter, input_file: Path) -> None:
+        self._reporter = reporter
+        self._input_file = input_file
+        self._total = 0
+        self._processed = 0
+        self._events_interval = settings.PROGRESS_EVENTS_INTERVAL
+        self._next_report_time = 0.0
+
+    def on_resources_found(self, total: int) -> None:
+        self._total = total
+        self._processed = 0
+        self._next_report_time = time.monotonic() + self._events_interval
+        self._reporter.resources_processed(self._input_file, self._processed, self._total)
+
+    def on_resource_end(self, idref: Optional[str], duration: float) -> None:
+        self._processed += 1
+
+        if self._processed == self._total or time.monotonic() >= self._next_report_time:
+            self._next_report_time = time.monotonic() + self._events_interval
+            self._reporter.resources_processed(self._input_file, self._processed, self._total)
@@ -32,5 +32,62 @@ CONTENT_PROCESSORS = [
 # with nodes modified by the previous one. It means that the order is important,
 CONTENT_POST_PROCESSORS = ["cc2olx.content_post_processors.StaticLinkPostProcessor"]
 
+# QTI items of a single assessment can be parsed concurrently by a pool of
+# worker processes, it allows huge question banks to use more than one CPU core.
+# The parallel parsing is used when the number of workers is greater than 1 and
+# the assessment has more than `QTI_PARALLEL_MIN_ITEMS` items, the items are
+# sent to the workers in chunks of `QTI_PARALLEL_CHUNK_SIZE` items to amortize
+# the inter-process communication costs. The workers number can be overridden
+# by `--qti-workers` option.
+QTI_PARALLEL_WORKERS = 0
+QTI_PARALLEL_MIN_ITEMS = 1000
+QTI_PARALLEL_CHUNK_SIZE = 200
+
+# The rubric library file with the default criteria of ORA blocks created from
+# Common Cartridge assignments. Its root element contains <criterion> elements
+# in the ORA rubric format. The file is loaded once per conversion run.
+ORA_RUBRIC_CRITERIA_PATH = TEMPLATES_DIR / "ora" / "default_rubric_criteria.xml"
+
+# It is used to attach hooks to the conversion, e.g. profilers or metrics
+# exporters. The hooks are notified before and after every conversion stage,
+# content processor and post-processor call, see `BaseConversionHook` for the
+# details. The built-in `cc2olx.conversion_hooks.CProfileHook` writes
+# per-cartridge cProfile files to `CPROFILE_HOOK_OUTPUT_DIR` directory, the
+# `cc2olx.conversion_hooks.TracemallocHook` logs `TRACEMALLOC_HOOK_TOP_SIZE`
+# top memory allocation sites of every cartridge conversion.
+CONVERSION_HOOKS = []
+CPROFILE_HOOK_OUTPUT_DIR = Path("profiles")
+TRACEMALLOC_HOOK_TOP_SIZE = 10
+
+# The minimal interval in seconds between the resources conversion progress
+# events written with `--progress-file` or `--progress-fd` arguments.
+PROGRESS_EVENTS_INTERVAL = 1.0
+
+# `cc2olx analyze` estimates the conversion time of a cartridge in seconds as
+# the sum of the fixed per-cartridge time and the times per resource, per QTI
+# item and per megabyte of the uncompressed cartridge content. The values are
+# measured on synthetic cartridges, they should be calibrated on the real ones
+# with `--stats-file` conversion statistics. The cartridges are sent to
+# analysis worker processes in chunks of `ANALYSIS_CHUNK_SIZE` files.
+ANALYSIS_TIME_COEFFICIENTS = {
+    "cartridge": 0.05,
+    "resource": 0.0003,
+    "qti_item": 0.0008,
+    "megabyte": 0.09,
+}
+ANALYSIS_CHUNK_SIZE = 8
+
+# The CDATA sections of the OLX nodes, e.g. HTML pages, of at least
+# `SPILL_PAYLOAD_MIN_SIZE` characters are spilled to disk right after the
+# resource processing when the `--memory-budget` is exceeded. The completed
+# chapters are spilled regardless of their size.
+SPILL_PAYLOAD_MIN_SIZE = 64 * 1024
+
+# The input directories are scanned lazily while the cartridges are converted.
+# The next cartridge to convert is the largest of `INPUT_FILES_ORDERING_WINDOW`
+# cartridges found ahead, so the large conversions start first without waiting
+# for the whole input tree scan.
+INPUT_FILES_ORDERING_WINDOW = 1000
+
 USE_I18N = False
 USE_TZ = False
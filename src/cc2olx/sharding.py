@@ -0,0 +1,188 @@
+"""
+Splitting of the cartridges conversion into shards run on different hosts.
+
+The shard plan assigns every cartridge to one of the shards so the estimated
+conversion times of the shards are balanced. The plan is deterministic: the
+same cartridges always result in the same plan, so the hosts can compute it
+independently or share the plan file, no coordinator is needed. Every shard
+writes a result index as JSON lines, the indexes of all the shards are merged
+by their concatenation.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, IO, Iterable, List, Optional, Tuple
+
+import attrs
+from django.conf import settings
+
+from cc2olx.analyze import CartridgeAnalysis
+from cc2olx.constants import BYTES_IN_MEGABYTE
+from cc2olx.stats import ConversionStats
+
+logger = logging.getLogger()
+
+Shard = Tuple[int, int]
+
+
+def format_shard(shard: Shard) -> str:
+    """
+    Provide the shard representation in the `k/N` format.
+    """
+    return "{}/{}".format(*shard)
+
+
+def estimate_cartridge_cost(analysis: CartridgeAnalysis) -> float:
+    """
+    Provide the cartridge conversion cost estimate in seconds.
+
+    The cartridges that failed to be analyzed are estimated by their archive size.
+    """
+    if not analysis.error:
+        return analysis.estimated_time
+
+    time_coefficients = settings.ANALYSIS_TIME_COEFFICIENTS
+    return time_coefficients["cartridge"] + time_coefficients["megabyte"] * analysis.archive_size / BYTES_IN_MEGABYTE
+
+
+@attrs.define(frozen=True)
+class PlannedCartridge:
+    """
+    Encapsulate a cartridge assignment to a shard.
+
+    The shards are numbered from 1.
+    """
+
+    input_file: Path = attrs.field(converter=Path)
+    estimated_time: float
+    shard: int
+
+
+@attrs.define
+class ShardPlan:
+    """
+    Encapsulate the assignment of the cartridges to the shards.
+
+    The cartridges are ordered by their decreasing cost, so every shard starts
+    with its largest cartridges.
+    """
+
+    shards: int
+    cartridges: List[PlannedCartridge] = attrs.field(factory=list)
+
+    def get_shard_input_files(self, shard: int) -> List[Path]:
+        """
+        Provide the files of the shard cartridges.
+        """
+        return [cartridge.input_file for cartridge in self.cartridges if cartridge.shard == shard]
+
+    def get_shard_estimated_times(self) -> Dict[int, float]:
+        """
+        Provide the total estimated conversion time of every shard.
+        """
+        estimated_times = dict.fromkeys(range(1, self.shards + 1), 0.0)
+        for cartridge in self.cartridges:
+            estimated_times[cartridge.shard] += cartridge.estimated_time
+        return estimated_times
+
+    def to_dict(self) -> dict:
+        """
+        Provide the JSON serializable plan representation.
+        """
+        return {
+            "shards": self.shards,
+            "shard_estimated_times": {
+                str(shard): round(estimated_time, 3)
+                for shard, estimated_time in self.get_shard_estimated_times().items()
+            },
+            "cartridges": [
+                {
+                    "input_file": str(cartridge.input_file),
+                    "estimated_time": cartridge.estimated_time,
+                    "shard": cartridge.shard,
+                }
+                for cartridge in self.cartridges
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ShardPlan":
+        return cls(data["shards"], [PlannedCartridge(**cartridge) for cartridge in data["cartridges"]])
+
+
+def create_shard_plan(analyses: Iterable[CartridgeAnalysis], shards: int) -> ShardPlan:
+    """
+    Assign the cartridges to the shards balancing the shards estimated conversion times.
+
+    The cartridges are assigned in the order of decreasing cost to the shard
+    with the least total cost so far (the longest processing time first
+    scheduling), the ties are resolved by the file paths and the shard numbers.
+    """
+    costs = sorted(
+        ((estimate_cartridge_cost(analysis), analysis.input_file) for analysis in analyses),
+        key=lambda cost: (-cost[0], str(cost[1])),
+    )
+    shard_costs = [0.0] * shards
+    plan = ShardPlan(shards)
+
+    for cost, input_file in costs:
+        shard_index = min(range(shards), key=lambda index: (shard_costs[index], index))
+        shard_costs[shard_index] += cost
+        plan.cartridges.append(PlannedCartridge(input_file, cost, shard_index + 1))
+
+    return plan
+
+
+def write_shard_plan(output: IO[str], plan: ShardPlan) -> None:
+    """
+    Write the shard plan as JSON.
+    """
+    json.dump(plan.to_dict(), output, indent=2)
+    output.write("\n")
+
+
+def load_shard_plan(plan_file: Path) -> ShardPlan:
+    """
+    Load the shard plan from the JSON file.
+    """
+    with open(plan_file, encoding="utf-8") as plan_input:
+        return ShardPlan.from_dict(json.load(plan_input))
+
+
+def log_shard_plan_summary(plan: ShardPlan) -> None:
+    """
+    Log the cartridges number and the estimated conversion time of every shard.
+    """
+    for shard, estimated_time in plan.get_shard_estimated_times().items():
+        logger.info(
+            "Shard %s: %d cartridges, estimated conversion time %.1f s.",
+            format_shard((shard, plan.shards)),
+            len(plan.get_shard_input_files(shard)),
+            estimated_time,
+        )
+
+
+def write_result_index(
+    result_index_file: Path,
+    conversions_stats: List[ConversionStats],
+    workspace: Path,
+    shard: Optional[Shard] = None,
+) -> None:
+    """
+    Write the conversion result of every cartridge as JSON lines.
+
+    The output file paths are relative to the output directory, so the indexes
+    of the shards converted on different hosts can be merged by concatenation.
+    """
+    with open(result_index_file, "w", encoding="utf-8") as result_index:
+        for stats in conversions_stats:
+            entry = {
+                "input_file": str(stats.input_file),
+                "shard": format_shard(shard) if shard else None,
+                "succeeded": stats.succeeded,
+                "output_file": str(stats.output_file.relative_to(workspace)) if stats.output_file else None,
+                "output_size": stats.output_size,
+                "wall_time": round(sum(stage.wall_time for stage in stats.stages.values()), 3),
+            }
+            result_index.write(json.dumps(entry) + "\n")
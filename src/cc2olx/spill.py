@@ -0,0 +1,147 @@
+"""
+Spilling of the OLX document fragments to disk.
+
+When the conversion exceeds its memory budget, the completed OLX fragments
+are serialized into a temporary file and replaced in the document with
+lightweight nodes, which copy the serialized markup when the document is
+written out.
+"""
+
+import tempfile
+import xml.dom.minidom
+from pathlib import Path
+from typing import IO, Optional
+
+import attrs
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class _CountingWriter:
+    """
+    Write the text to the file counting the written characters.
+    """
+
+    def __init__(self, file: IO[str]) -> None:
+        self._file = file
+        self.length = 0
+
+    def write(self, text: str) -> None:
+        self._file.write(text)
+        self.length += len(text)
+
+
+@attrs.frozen
+class SpilledFragment:
+    """
+    Locate the serialized markup in the spill storage.
+    """
+
+    storage: "SpillStorage"
+    position: int
+    length: int
+
+    def write_to(self, writer) -> None:
+        self.storage.copy(self, writer)
+
+    def read(self) -> str:
+        return self.storage.read(self)
+
+
+class SpillStorage:
+    """
+    Keep the serialized OLX fragments in a single anonymous temporary file.
+
+    The file is removed by the operating system when it's closed, the
+    fragments are appended to its end and are copied out in chunks, so
+    neither the whole file nor a whole fragment is loaded into memory.
+    """
+
+    def __init__(self, directory: Optional[Path] = None) -> None:
+        self._file = tempfile.TemporaryFile("w+", encoding="utf-8", dir=directory)
+        self.spilled_characters = 0
+
+    def write(self, render) -> SpilledFragment:
+        """
+        Spill the markup produced by the render function called with a writer.
+
+        The rendered markup can include the already spilled fragments, they are
+        read from the same file, so the reading methods restore the file end
+        position.
+        """
+        position = self._file.tell()
+        writer = _CountingWriter(self._file)
+        render(writer)
+        self.spilled_characters += writer.length
+        return SpilledFragment(self, position, writer.length)
+
+    def copy(self, fragment: SpilledFragment, writer) -> None:
+        """
+        Copy the fragment markup to the writer.
+        """
+        position = fragment.position
+        remaining = fragment.length
+
+        while remaining:
+            self._file.seek(position)
+            chunk = self._file.read(min(remaining, COPY_CHUNK_SIZE))
+            if not chunk:
+                raise EOFError("The spilled fragment is truncated.")
+            position = self._file.tell()
+            # The writer can append to this file, so the end position is restored before writing.
+            self._file.seek(0, 2)
+            writer.write(chunk)
+            remaining -= len(chunk)
+
+    def read(self, fragment: SpilledFragment) -> str:
+        self._file.seek(fragment.position)
+        data = self._file.read(fragment.length)
+        self._file.seek(0, 2)
+        return data
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class SpilledElement(xml.dom.minidom.Element):
+    """
+    A minidom element written out as the spilled markup of the original element.
+
+    The markup is rendered with the indentation of the element's place in the
+    document, so the element can't be moved to another depth.
+    """
+
+    def __init__(self, element: xml.dom.minidom.Element, storage: SpillStorage, indent: str, addindent: str, newl: str):
+        super().__init__(element.tagName)
+        self._indentation = (indent, addindent, newl)
+        self._fragment = storage.write(lambda writer: element.writexml(writer, indent, addindent, newl))
+
+    def writexml(self, writer, indent="", addindent="", newl=""):
+        if (indent, addindent, newl) != self._indentation:
+            raise ValueError(f"The <{self.tagName}> element is spilled with a different indentation.")
+        self._fragment.write_to(writer)
+
+
+class SpilledCDATASection(xml.dom.minidom.CDATASection):
+    """
+    A minidom CDATA section which data is kept in the spill storage.
+    """
+
+    def __init__(self, data: str, storage: SpillStorage) -> None:
+        super().__init__()
+        if "]]>" in data:
+            raise ValueError("']]>' not allowed in a CDATA section")
+        self._fragment = storage.write(lambda writer: writer.write(data))
+
+    @property
+    def data(self) -> str:
+        return self._fragment.read()
+
+    @data.setter
+    def data(self, value: str) -> None:
+        raise AttributeError("The spilled CDATA section is read-only.")
+
+    def writexml(self, writer, indent="", addindent="", newl=""):
+        writer.write("<![CDATA[")
+        self._fragment.write_to(writer)
+        writer.write("]]>")
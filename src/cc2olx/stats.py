@@ -0,0 +1,274 @@
+"""
+Conversion statistics collection.
+"""
+
+import csv
+import heapq
+import json
+import logging
+import os
+import sys
+import time
+import xml.dom.minidom
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import attrs
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    # The module is not available on Windows.
+    resource = None
+
+logger = logging.getLogger()
+
+PROC_SELF_IO_PATH = "/proc/self/io"
+PROC_SELF_STATM_PATH = "/proc/self/statm"
+
+
+def get_peak_rss() -> Optional[int]:
+    """
+    Provide the peak resident set size of the process in bytes.
+
+    ``None`` is returned if the platform doesn't provide the value.
+    """
+    if resource is None:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports the value in bytes, other platforms - in kilobytes.
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def get_current_rss() -> Optional[int]:
+    """
+    Provide the current resident set size of the process in bytes.
+
+    The value is taken from ``/proc/self/statm``, so it's available on Linux
+    only, ``None`` is returned on the other platforms.
+    """
+    try:
+        with open(PROC_SELF_STATM_PATH, encoding="ascii") as statm_file:
+            resident_pages = int(statm_file.read().split()[1])
+    except OSError:
+        return None
+
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def get_io_counters() -> Tuple[Optional[int], Optional[int]]:
+    """
+    Provide the numbers of bytes read and written by the process.
+
+    The values are taken from ``/proc/self/io``, so they are available on
+    Linux only, ``None`` values are returned on the other platforms.
+    """
+    try:
+        with open(PROC_SELF_IO_PATH, encoding="ascii") as io_file:
+            counters = dict(line.split(":", 1) for line in io_file if ":" in line)
+    except OSError:
+        return None, None
+
+    return int(counters["rchar"]), int(counters["wchar"])
+
+
+def _subtract(end_value: Optional[int], start_value: Optional[int]) -> Optional[int]:
+    if end_value is None or start_value is None:
+        return None
+    return end_value - start_value
+
+
+@attrs.define
+class StageStats:
+    """
+    Encapsulate a conversion stage statistics.
+
+    The peak RSS is the process-wide peak reached by the end of the stage.
+    """
+
+    wall_time: float
+    cpu_time: float
+    peak_rss: Optional[int]
+    bytes_read: Optional[int]
+    bytes_written: Optional[int]
+
+
+@attrs.define
+class ProcessorStats:
+    """
+    Encapsulate a content processor or post-processor statistics.
+
+    ``calls`` is the number of the processor invocations, ``processed`` is
+    the number of resources the processor has produced the result for.
+    """
+
+    calls: int = 0
+    processed: int = 0
+    errors: int = 0
+    time: float = 0.0
+
+    @contextmanager
+    def measure_call(self) -> Iterator[None]:
+        """
+        Count the processor invocation and its duration.
+        """
+        start_time = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.calls += 1
+            self.time += time.perf_counter() - start_time
+
+
+@attrs.define
+class ResourceStats:
+    """
+    Encapsulate a Common Cartridge resource processing statistics.
+
+    The time includes the content processing and post-processing. The input
+    size is the total size of the resource files and the output size is the
+    size of the produced OLX markup, both in bytes.
+    """
+
+    identifierref: str
+    type: str
+    time: float
+    input_size: int
+    output_size: int
+
+
+class ByteCountingWriter:
+    """
+    A writer counting the UTF-8 encoded size of the written text without keeping it.
+    """
+
+    def __init__(self) -> None:
+        self.size = 0
+
+    def write(self, text: str) -> None:
+        self.size += len(text.encode("utf-8"))
+
+
+def measure_xml_size(nodes: Iterable[xml.dom.minidom.Node]) -> int:
+    """
+    Provide the size of the nodes markup in bytes.
+
+    The markup is written to a counting writer, so it isn't accumulated in
+    memory, it matters for the huge pages and quizzes.
+    """
+    writer = ByteCountingWriter()
+    for node in nodes:
+        node.writexml(writer)
+    return writer.size
+
+
+def create_processors_stats() -> Dict[str, ProcessorStats]:
+    """
+    Create the processor statistics mapping by processor names.
+    """
+    return defaultdict(ProcessorStats)
+
+
+@attrs.define
+class ConversionStats:
+    """
+    Collect a single cartridge conversion statistics.
+    """
+
+    input_file: Path
+    succeeded: bool = True
+    output_size: Optional[int] = None
+    output_file: Optional[Path] = None
+    # The cartridge converted by the previous run is skipped when the batch is resumed.
+    resumed: bool = False
+    stages: Dict[str, StageStats] = attrs.field(factory=dict)
+    content_processors: Dict[str, ProcessorStats] = attrs.field(factory=create_processors_stats)
+    content_post_processors: Dict[str, ProcessorStats] = attrs.field(factory=create_processors_stats)
+    # The resources statistics are collected only if the list is provided.
+    resources: Optional[List[ResourceStats]] = None
+
+    @contextmanager
+    def measure_stage(self, name: str) -> Iterator[None]:
+        """
+        Measure the resources consumed by the conversion stage.
+        """
+        start_bytes_read, start_bytes_written = get_io_counters()
+        start_cpu_time = time.process_time()
+        start_wall_time = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - start_wall_time
+            cpu_time = time.process_time() - start_cpu_time
+            end_bytes_read, end_bytes_written = get_io_counters()
+
+            self.stages[name] = StageStats(
+                wall_time=wall_time,
+                cpu_time=cpu_time,
+                peak_rss=get_peak_rss(),
+                bytes_read=_subtract(end_bytes_read, start_bytes_read),
+                bytes_written=_subtract(end_bytes_written, start_bytes_written),
+            )
+
+    def to_dict(self) -> dict:
+        """
+        Provide the JSON serializable statistics representation.
+        """
+        return attrs.asdict(
+            self,
+            filter=attrs.filters.exclude(attrs.fields(ConversionStats).resources),
+            value_serializer=lambda _instance, _field, value: _serialize_value(value),
+        )
+
+
+def _serialize_value(value):
+    return str(value) if isinstance(value, Path) else value
+
+
+def write_stats_file(stats_file: Path, conversions_stats: List[ConversionStats]) -> None:
+    """
+    Write the conversions statistics to the JSON file.
+    """
+    with open(stats_file, "w", encoding="utf-8") as stats_output:
+        json.dump({"cartridges": [stats.to_dict() for stats in conversions_stats]}, stats_output, indent=2)
+
+
+def log_resources_report(stats: ConversionStats, size: int) -> None:
+    """
+    Log the slowest and the largest resources of the cartridge.
+    """
+    for title, key in (("slowest", lambda resource: resource.time), ("largest", lambda resource: resource.input_size)):
+        resources = heapq.nlargest(size, stats.resources, key=key)
+        logger.info(
+            "Top %d %s resources of %s:\n%s",
+            len(resources),
+            title,
+            stats.input_file,
+            "\n".join(
+                f"{position:>4}. {resource.time:.3f} s, {resource.input_size} B in, {resource.output_size} B out: "
+                f"{resource.identifierref} ({resource.type})"
+                for position, resource in enumerate(resources, start=1)
+            ),
+        )
+
+
+def write_resources_csv(csv_file: Path, conversions_stats: List[ConversionStats]) -> None:
+    """
+    Write the resources statistics of all the cartridges to the CSV file.
+    """
+    field_names = [field.name for field in attrs.fields(ResourceStats)]
+
+    with open(csv_file, "w", encoding="utf-8", newline="") as csv_output:
+        writer = csv.writer(csv_output)
+        writer.writerow(["input_file", *field_names])
+
+        for stats in conversions_stats:
+            for resource in stats.resources or []:
+                writer.writerow([stats.input_file, *attrs.astuple(resource)])
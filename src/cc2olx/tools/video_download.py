@@ -1,13 +1,24 @@
 import argparse
 import json
 import csv
-import zipfile
-from urllib.parse import parse_qs, urlparse
-
-from lxml import html
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 import youtube_dl
 
+from cc2olx.iframe_inventory import (
+    extract_video_url,
+    find_iframe_inventory,
+    load_iframe_inventories,
+    normalize_video_url,
+    scan_cartridge,
+)
+
+DEFAULT_WORKERS = 4
+MANIFEST_FILENAME = "manifest.jsonl"
+
 
 def parse_args(args=None):
     """Parse command line arguments."""
@@ -19,6 +30,19 @@ def parse_args(args=None):
     parser.add_argument("--downloads", "-d", default="downloads", help="Video download directory")
     parser.add_argument("--simulate", "-s", action="store_true", help="Simulate downloads")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose ytd downloads")
+    parser.add_argument(
+        "--workers", "-w", type=int, default=DEFAULT_WORKERS, help="Number of videos to download concurrently"
+    )
+    parser.add_argument("--scan-workers", type=int, help="Number of HTML files to scan concurrently")
+    parser.add_argument(
+        "--iframe-inventory",
+        help="Iframe inventory file; it's read if it lists the input, otherwise the input is scanned and appended",
+    )
+    parser.add_argument(
+        "--manifest",
+        "-m",
+        help=f"Resume manifest of the downloaded videos (default: {MANIFEST_FILENAME} in the download directory)",
+    )
 
     return parser.parse_args(args)
 
@@ -38,12 +62,50 @@ def get_ydl_opts(args):
     }
 
 
-def download_videos(urls, opts):
+class DownloadManifest:
     """
-    Download a list of videos and optionally transcripts.
-    Arguments:
-        * videos: a list of URLs
-        * opts: options for Youtube DL
+    Record the downloaded videos in a JSON lines file to resume interrupted downloads.
+
+    Every line maps a video URL to the downloaded file, so the URLs listed in
+    the file aren't downloaded again by the next run.
+    """
+
+    def __init__(self, path):
+        """Load the videos recorded by the previous runs."""
+        self.path = Path(path) if path else None
+        self.downloaded = {}
+        self._lock = threading.Lock()
+
+        if self.path and self.path.exists():
+            with self.path.open(encoding="utf-8") as manifest_file:
+                for line in manifest_file:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.downloaded[entry["url"]] = entry["filename"]
+
+    def record(self, url, filename):
+        """Append the downloaded video to the manifest."""
+        self.downloaded[url] = filename
+
+        if not self.path:
+            return
+
+        line = json.dumps({"url": url, "filename": filename}) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as manifest_file:
+                manifest_file.write(line)
+
+
+def download_video(url, opts):
+    """
+    Download a single video and optionally transcripts.
+
+    Every download uses its own Youtube DL instance, since the instances
+    can't be shared between the download threads.
+
+    Returns:
+        * relpath: the path of the downloaded video or None if the download failed
     """
 
     relpaths = []
@@ -55,12 +117,46 @@ def download_videos(urls, opts):
             if not fn.endswith("m4a"):
                 relpaths.append(fn)
 
-    opts["progress_hooks"] = [my_hook]
+    ydl = youtube_dl.YoutubeDL({**opts, "progress_hooks": [*opts.get("progress_hooks", []), my_hook]})
 
-    ydl = youtube_dl.YoutubeDL(opts)
-    ydl.download(urls)
+    try:
+        ydl.download([url])
+    except youtube_dl.utils.DownloadError as error:
+        print(f"Unable to download video {url}: {error}")
 
-    return relpaths
+    return relpaths[-1] if relpaths else None
+
+
+def download_videos(urls, opts, workers=DEFAULT_WORKERS, manifest=None):
+    """
+    Download a list of videos and optionally transcripts.
+    Arguments:
+        * videos: a list of URLs
+        * opts: options for Youtube DL
+        * workers: the number of videos to download concurrently
+        * manifest: the manifest of the downloaded videos, its videos aren't downloaded again
+
+    Returns:
+        * relpaths: the paths of the downloaded videos in the order of the URLs, None for failed downloads
+    """
+    manifest = manifest or DownloadManifest(None)
+
+    def download(url):
+        if url in manifest.downloaded:
+            return manifest.downloaded[url]
+
+        relpath = download_video(url, opts)
+        if relpath and not opts.get("simulate"):
+            manifest.record(url, relpath)
+        return relpath
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(download, urls))
+
+
+def deduplicate_urls(urls):
+    """Remove the repeated URLs keeping the order of their first occurrences."""
+    return list(dict.fromkeys(urls))
 
 
 def make_row(relpath, url):
@@ -77,34 +173,6 @@ def make_row(relpath, url):
     }
 
 
-def extract_url(src):
-    """Extract a downloadable video link from a src attribute."""
-    if "youtube.com" in src:
-        url = src.replace("/embed/", "/watch?v=").replace("?rel=0", "")
-        return url
-    elif "cdnapisec.kaltura.com" in src:
-        # Skip playlist URLs
-        if "playlist" in src:
-            return ""
-        return src
-    return ""
-
-
-def find_video_urls(input_html):
-    """Find valid video URLs from iframes in an HTML file."""
-
-    parsed_html = html.parse(input_html)
-    iframes = parsed_html.xpath("//iframe")
-
-    urls = []
-    for iframe in iframes:
-        src = iframe.attrib.get("src", "")
-        url = extract_url(src)
-        if url:
-            urls.append(url)
-    return urls
-
-
 def write_csv(outfile, urls, relpaths):
     fieldnames = ["Relative File Path", "External Video Link", "Youtube Id"]
     with open(outfile, "w", newline="", encoding="utf-8") as csvfile:
@@ -116,57 +184,58 @@ def write_csv(outfile, urls, relpaths):
             writer.writerow(row)
 
 
-def get_entry_id(src):
-    """Extract Kaltura entry_id from embedding URL."""
-    entry_id = None
-    parsed_url = urlparse(src)
-    query = parsed_url.query
-    query_dict = parse_qs(query)
-    entry_id_query = query_dict.get("entry_id")
-    if entry_id_query:
-        entry_id = entry_id_query[0]
-    return entry_id
-
-
-def reformat(url):
-    if "kaltura" in url:
-        netloc = url.split("embedIframeJs")[0].strip()
-        entry_id = get_entry_id(url)
-        url = f"{netloc}playManifest/entryId/{entry_id}/format/url/protocol/https"
+def find_all_video_urls(name, workers=None, inventory=None):
+    """
+    Extract video urls from a CC course or HTML file
 
-    return url
+    The URLs are taken from the iframe inventory of the input, it's built if
+    it isn't provided. The HTML files of a CC course are scanned concurrently
+    by the given number of workers, the URLs are returned in the order of the
+    files in the archive.
+    """
+    inventory = inventory or scan_cartridge(name, workers)
+    return [extract_video_url(iframe.src) for iframe in inventory.iter_video_iframes()]
 
 
-def find_all_video_urls(name):
+def get_iframe_inventory(name, inventory_file=None, workers=None):
     """
-    Extract video urls from a CC course or HTML file
+    Provide the iframe inventory of a CC course or HTML file.
+
+    The inventory is read from the file if the file lists the input with its
+    current content. Otherwise the input is scanned and its inventory is
+    appended to the file, so the converter can reuse it.
     """
-    urls = []
-    if zipfile.is_zipfile(name):
-        with zipfile.ZipFile(name) as z:
-            for filename in z.namelist():
-                if filename.endswith(".html"):
-                    with z.open(filename) as f:
-                        urls += find_video_urls(f)
-    else:
-        # If input is a single HTML for debugging
-        urls += find_video_urls(name)
+    if inventory_file and os.path.exists(inventory_file):
+        inventory = find_iframe_inventory(load_iframe_inventories(inventory_file), name)
+        if inventory is not None:
+            return inventory
 
-    return urls
+    inventory = scan_cartridge(name, workers)
+
+    if inventory_file:
+        with open(inventory_file, "a", encoding="utf-8") as inventory_output:
+            inventory.write(inventory_output)
+
+    return inventory
 
 
 def main():
     args = parse_args()
     ydl_opts = get_ydl_opts(args)
+    manifest = DownloadManifest(args.manifest or os.path.join(args.downloads, MANIFEST_FILENAME))
+
+    inventory = get_iframe_inventory(args.input, args.iframe_inventory, args.scan_workers)
+    urls = deduplicate_urls(find_all_video_urls(args.input, inventory=inventory))
+    relpaths = download_videos(urls, ydl_opts, args.workers, manifest)
 
-    urls = find_all_video_urls(args.input)
-    relpaths = download_videos(urls, ydl_opts)
+    # Skip the videos which failed to download
+    urls, relpaths = [u for u, r in zip(urls, relpaths) if r], [r for r in relpaths if r]
 
     # Remove download dir prefix from pathnames
-    relpaths = [r.lstrip(f"{args.downloads}/") for r in relpaths]
+    relpaths = [r.removeprefix(f"{args.downloads}/") for r in relpaths]
 
     # Reformat URLs as expected by the cc2olx tool
-    urls = [reformat(u) for u in urls]
+    urls = [normalize_video_url(u) for u in urls]
 
     write_csv(args.output, urls, relpaths)
 
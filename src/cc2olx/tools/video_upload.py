@@ -1,9 +1,16 @@
 import argparse
 import csv
+import json
+import math
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from xml.sax.saxutils import escape
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import AuthBase
 
 OAUTH_TOKEN_URL = "https://courses.edx.org/oauth2/access_token"
@@ -18,6 +25,12 @@ VIDEO_EXTENSION_CONTENT_TYPES = {
     ".mov": "video/quicktime",
 }
 
+DEFAULT_WORKERS = 4
+DEFAULT_PART_WORKERS = 4
+BYTES_IN_KILOBYTE = 1024
+BYTES_IN_MEGABYTE = 1024 * 1024
+DEFAULT_CHUNK_SIZE = 1024 * BYTES_IN_KILOBYTE
+
 
 class SuppliedJwtAuth(AuthBase):
     """Attaches a supplied JWT to the given Request object."""
@@ -80,10 +93,101 @@ def parse_args(args=None):
         "-o",
         help="path to where the output CSV should be stored; this will overwrite existing files",
     )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="number of videos to upload concurrently",
+    )
+    parser.add_argument(
+        "--state-file",
+        "-s",
+        help="path to a file recording the uploaded videos; the videos it lists are skipped on the next run",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE // BYTES_IN_KILOBYTE,
+        help="size in kilobytes of the chunks the video files are read from disk and sent in",
+    )
+    parser.add_argument(
+        "--multipart-part-size",
+        type=int,
+        help=(
+            "upload the videos in parts of this size in megabytes if the Studio generate upload link API "
+            "provides multipart upload URLs"
+        ),
+    )
+    parser.add_argument(
+        "--part-workers",
+        type=int,
+        default=DEFAULT_PART_WORKERS,
+        help="number of parts of a video to upload concurrently in multipart uploads",
+    )
     return parser.parse_args(args)
 
 
-def make_generate_upload_link_request(url, data, filename, access_token):
+class FileChunkReader:
+    """
+    Request body reading a range of a file in fixed-size chunks.
+
+    The body length is known in advance, so it's sent with the Content-Length
+    header the presigned URLs require, while only a single chunk of the file
+    is kept in memory at a time.
+    """
+
+    def __init__(self, path, chunk_size=DEFAULT_CHUNK_SIZE, offset=0, length=None):
+        """Open the file and position it at the start of the range."""
+        self.file = open(path, "rb")
+        self.chunk_size = chunk_size
+        self.length = os.fstat(self.file.fileno()).st_size - offset if length is None else length
+        self.remaining = self.length
+        self.file.seek(offset)
+
+    def __len__(self):
+        """Provide the body length."""
+        return self.length
+
+    def read(self, size=-1):
+        """
+        Read the next chunk of the range.
+
+        The requested size is ignored, so the file is always sent in chunks of
+        the configured size regardless of the HTTP client block size.
+        """
+        chunk = self.file.read(min(self.chunk_size, self.remaining))
+        self.remaining -= len(chunk)
+        return chunk
+
+    def close(self):
+        """Close the file."""
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def create_session(pool_size=DEFAULT_WORKERS):
+    """
+    Create a session shared by the upload threads.
+
+    The connection pool is sized to the number of the upload threads so the
+    connections are reused instead of being opened for every request. The
+    authentication is supplied per request, since the presigned video upload
+    URLs must not receive the Studio access token.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def make_generate_upload_link_request(url, data, filename, access_token, session=None):
     """
     Make a POST request against the Studio generate upload link API and return the
     response. If errors occur during the API call, log to the console.
@@ -93,15 +197,16 @@ def make_generate_upload_link_request(url, data, filename, access_token):
         * data: a dictionary to be passed in the POST request as a json parameter
         * filename: the filename for the file we are calling the API with - used for logging
         * access_token: access token to be able to make authenticated calls to the Studio API
+        * session: the session to make the request with, a new one is created if it's omitted
 
     Returns:
-        * response: the response object from the POST API call
+        * response: the response object from the POST API call or None if no response was received
     """
-    s = requests.Session()
-    s.auth = SuppliedJwtAuth(access_token)
+    s = session or requests.Session()
+    response = None
 
     try:
-        response = s.post(url, json=data)
+        response = s.post(url, json=data, auth=SuppliedJwtAuth(access_token))
         response.raise_for_status()
     except requests.exceptions.HTTPError as error:
         print(
@@ -127,7 +232,7 @@ def make_generate_upload_link_request(url, data, filename, access_token):
     return response
 
 
-def upload_transcript(filename, edx_video_id, language_code, access_token):
+def upload_transcript(filename, edx_video_id, language_code, access_token, session=None):
     """
     Make a POST request against the Studio upload transcript API and return the
     response. If errors occur during the API call, log to the console.
@@ -137,25 +242,34 @@ def upload_transcript(filename, edx_video_id, language_code, access_token):
         * edx_video_id: the video ID of the video this transcript is for
         * language_code: the language of the transcript
         * access_token: access token to be able to make authenticated calls to the Studio API
+        * session: the session to make the request with, a new one is created if it's omitted
 
     Returns:
-        * response: the response object from the POST API call
+        * response: the response object from the POST API call or None if no response was received
     """
-    s = requests.Session()
-    s.auth = SuppliedJwtAuth(access_token)
+    s = session or requests.Session()
+    response = None
 
     data = {"edx_video_id": edx_video_id, "language_code": language_code, "new_language_code": language_code}
-    files = {"file": open(filename, "rb")}
 
     try:
-        response = s.post(TRANSCRIPT_UPLOAD_LINK, data=data, files=files)
+        with open(filename, "rb") as transcript:
+            response = s.post(
+                TRANSCRIPT_UPLOAD_LINK, data=data, files={"file": transcript}, auth=SuppliedJwtAuth(access_token)
+            )
         response.raise_for_status()
     except requests.exceptions.HTTPError as error:
         print(
             "An HTTP error occurred calling the Studio transcript upload link API "
             "for transcript: {}: {}".format(filename, repr(error))
         )
-    if response.status_code == 201:
+    except requests.exceptions.RequestException as error:
+        print(
+            "An error occurred calling the Studio transcript upload link API "
+            "for transcript: {}: {}".format(filename, repr(error))
+        )
+
+    if response is not None and response.status_code == 201:
         print(f"Successfully uploaded transcript {filename}.")
     else:
         print(f"Transcript {filename} was unable to be uploaded.")
@@ -163,22 +277,26 @@ def upload_transcript(filename, edx_video_id, language_code, access_token):
     return response
 
 
-def make_upload_video_request(url, data, headers, filename):
+def make_upload_video_request(url, data, headers, filename, session=None):
     """
     Make a PUT request against the AWS upload video API.
     If errors occur during the API call, log to the console.
 
     Arguments:
         * url: the URL against which to make the PUT request
-        * data: a dictionary to be passed in the PUT request as a data parameter
+        * data: the request body; an open file is streamed without reading it into memory
         * headers: a dictionary of headers to be passed in the PUT request as a headers parameter
         * filename: the filename for the file we are calling the API with - used for logging
+        * session: the session to make the request with, a new one is created if it's omitted
 
     Returns:
-        * response: the response object from the PUT API call
+        * response: the response object from the PUT API call or None if no response was received
     """
+    s = session or requests.Session()
+    response = None
+
     try:
-        response = requests.put(url, data=data, headers=headers)
+        response = s.put(url, data=data, headers=headers)
         response.raise_for_status()
     except requests.exceptions.HTTPError as error:
         print(
@@ -201,11 +319,83 @@ def make_upload_video_request(url, data, headers, filename):
             "for video {} and the video was not uploaded: {}".format(filename, repr(error))
         )
 
-    if response.status_code == 200:
+    if response is not None and response.status_code == 200:
         print(f"Successfully uploaded video {filename}.")
     else:
         print(f"Video {filename} was unable to be uploaded.")
 
+    return response
+
+
+def make_multipart_upload_video_request(
+    part_urls,
+    complete_url,
+    path,
+    part_size,
+    filename,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    part_workers=DEFAULT_PART_WORKERS,
+    session=None,
+):
+    """
+    Upload the video in parts to the presigned multipart upload URLs and complete the upload.
+    If errors occur during the API calls, log to the console.
+
+    Arguments:
+        * part_urls: the presigned URLs of the parts, in the order of the parts
+        * complete_url: the presigned URL completing the multipart upload
+        * path: the path to the video file
+        * part_size: the size of a part in bytes, the last part can be smaller
+        * filename: the filename for the file we are calling the API with - used for logging
+        * chunk_size: the size of the chunks the parts are read from disk and sent in
+        * part_workers: the number of parts to upload concurrently
+        * session: the session to make the requests with, a new one is created if it's omitted
+
+    Returns:
+        * uploaded: whether all the parts were uploaded and the upload was completed
+    """
+    s = session or requests.Session()
+    file_size = os.path.getsize(path)
+
+    def upload_part(part):
+        part_number, url = part
+        offset = (part_number - 1) * part_size
+        with FileChunkReader(path, chunk_size, offset, min(part_size, file_size - offset)) as body:
+            response = s.put(url, data=body)
+        response.raise_for_status()
+        return part_number, response.headers["ETag"]
+
+    try:
+        with ThreadPoolExecutor(max_workers=part_workers) as executor:
+            etags = list(executor.map(upload_part, enumerate(part_urls, start=1)))
+
+        parts = "".join(
+            f"<Part><PartNumber>{part_number}</PartNumber><ETag>{escape(etag)}</ETag></Part>"
+            for part_number, etag in etags
+        )
+        response = s.post(complete_url, data=f"<CompleteMultipartUpload>{parts}</CompleteMultipartUpload>")
+        response.raise_for_status()
+    except (requests.exceptions.RequestException, KeyError) as error:
+        print(
+            "An error occurred during the multipart upload "
+            "of video {} and the video was not uploaded: {}".format(filename, repr(error))
+        )
+        print(f"Video {filename} was unable to be uploaded.")
+        return False
+
+    print(f"Successfully uploaded video {filename} in {len(part_urls)} parts.")
+    return True
+
+
+def report_upload_throughput(filename, size, duration):
+    """
+    Log the video size, upload duration and throughput to the console.
+    """
+    throughput = size / BYTES_IN_MEGABYTE / duration if duration > 0 else 0
+    print(
+        f"Uploaded {size / BYTES_IN_MEGABYTE:.1f} MB of video {filename} in {duration:.1f} s ({throughput:.2f} MB/s)."
+    )
+
 
 def write_upload_results_csv(input_csv_path, output_csv_path, file_data):
     """
@@ -245,72 +435,174 @@ def write_upload_results_csv(input_csv_path, output_csv_path, file_data):
             writer.writerow(new_row)
 
 
-def main():
-    args = parse_args()
-    access_token = get_access_token()
+class UploadState:
+    """
+    Record the uploaded videos in a JSON lines file to resume interrupted uploads.
 
-    root = Path(args.directory)
-    get_upload_link_url = GENERATE_UPLOAD_LINK_BASE_URL + args.course_id
-    files_data = {}
+    Every line describes a single video which was uploaded to the presigned URL,
+    so the videos listed in the file aren't uploaded again by the next run.
+    """
+
+    def __init__(self, path):
+        """Load the videos recorded by the previous runs."""
+        self.path = Path(path) if path else None
+        self.uploaded = {}
+        self._lock = threading.Lock()
+
+        if self.path and self.path.exists():
+            with self.path.open(encoding="utf-8") as state_file:
+                for line in state_file:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.uploaded[entry.pop("path")] = entry
+
+    def record(self, relative_path, file_data):
+        """Append the uploaded video to the state file."""
+        self.uploaded[relative_path] = file_data
+
+        if not self.path:
+            return
+
+        line = json.dumps({"path": relative_path, **file_data}) + "\n"
+        with self._lock, self.path.open("a", encoding="utf-8") as state_file:
+            state_file.write(line)
 
-    for dirpath, _, filenames in os.walk(args.directory):
-        for filename in filenames:
+
+def find_videos(directory):
+    """
+    Find the video files in the directory and return the list of their full and relative paths.
+    """
+    root = Path(directory)
+    videos = []
+
+    for dirpath, _, filenames in os.walk(directory):
+        for filename in sorted(filenames):
             # construct filename this way to uniquely identify
             # the file within the root directory
             full_path = Path(dirpath, filename)
-            relative_path = full_path.relative_to(root)
-            extension = relative_path.suffix
 
-            if extension in VIDEO_EXTENSION_CONTENT_TYPES:
-                content_type = VIDEO_EXTENSION_CONTENT_TYPES.get(extension)
+            if full_path.suffix in VIDEO_EXTENSION_CONTENT_TYPES:
+                videos.append((full_path, full_path.relative_to(root)))
 
-                request_data = {"files": [{"file_name": filename, "content_type": content_type}]}
+    return videos
 
-                response = make_generate_upload_link_request(get_upload_link_url, request_data, filename, access_token)
 
-                try:
-                    data = response.json()
-                except ValueError:
-                    print(
-                        "Unable to parse JSON for call to the Studio generate upload link API "
-                        "for video {}.".format(filename)
-                    )
+def upload_video(
+    full_path,
+    get_upload_link_url,
+    access_token,
+    session,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    part_size=None,
+    part_workers=DEFAULT_PART_WORKERS,
+):
+    """
+    Upload the video with its transcripts and return the data to include in the output CSV.
 
-                edx_video_id = None
-                upload_url = None
+    If the part size is provided, the number of parts is sent to the Studio generate upload link
+    API and the video is uploaded in parts if the API responds with the part upload URLs.
+    Otherwise the video is uploaded with a single request.
 
-                if "files" in data and data["files"]:
-                    file_data = data["files"][0]
+    Returns:
+        * file_data: a dictionary with the edx_video_id and the dash separated transcript languages
+        * uploaded: whether the video was uploaded to the presigned URL
+    """
+    filename = full_path.name
+    content_type = VIDEO_EXTENSION_CONTENT_TYPES.get(full_path.suffix)
+
+    file_size = full_path.stat().st_size
+
+    request_data = {"files": [{"file_name": filename, "content_type": content_type}]}
+    if part_size:
+        request_data["files"][0]["part_count"] = max(1, math.ceil(file_size / part_size))
+
+    response = make_generate_upload_link_request(get_upload_link_url, request_data, filename, access_token, session)
+
+    data = {}
+    try:
+        data = response.json()
+    except (AttributeError, ValueError):
+        print("Unable to parse JSON for call to the Studio generate upload link API for video {}.".format(filename))
+
+    edx_video_id = None
+    upload_url = None
+    part_urls = None
+    complete_url = None
 
-                    if "edx_video_id" in file_data:
-                        edx_video_id = file_data["edx_video_id"]
+    if "files" in data and data["files"]:
+        file_data = data["files"][0]
 
-                    if "upload_url" in file_data:
-                        upload_url = file_data["upload_url"]
+        if "edx_video_id" in file_data:
+            edx_video_id = file_data["edx_video_id"]
 
-                if not upload_url or not edx_video_id:
-                    print(
-                        "Unable to upload video {}; either upload_url or edx_video_id "
-                        "is missing in response from Studio generate upload link API."
-                    )
+        if "upload_url" in file_data:
+            upload_url = file_data["upload_url"]
 
-                # upload video to presigned url if we have one
-                if upload_url:
-                    with full_path.open("rb") as f:
-                        data = f.read()
-                        headers = {"Content-Type": content_type}
-                        make_upload_video_request(upload_url, data, headers, filename)
+        if part_size and "upload_part_urls" in file_data and "complete_upload_url" in file_data:
+            part_urls = file_data["upload_part_urls"]
+            complete_url = file_data["complete_upload_url"]
 
-                files_data[str(relative_path)] = {"edx_video_id": edx_video_id}
-                langs = []
+    if not upload_url or not edx_video_id:
+        print(
+            "Unable to upload video {}; either upload_url or edx_video_id "
+            "is missing in response from Studio generate upload link API.".format(filename)
+        )
+
+    uploaded = False
+
+    start_time = time.perf_counter()
+
+    if part_urls and complete_url:
+        uploaded = make_multipart_upload_video_request(
+            part_urls, complete_url, full_path, part_size, filename, chunk_size, part_workers, session
+        )
+    # upload video to presigned url if we have one
+    elif upload_url:
+        with FileChunkReader(full_path, chunk_size) as body:
+            headers = {"Content-Type": content_type}
+            response = make_upload_video_request(upload_url, body, headers, filename, session)
+            uploaded = response is not None and response.status_code == 200
+
+    if uploaded:
+        report_upload_throughput(filename, file_size, time.perf_counter() - start_time)
+
+    langs = []
+
+    # Look for files with the same name as our video but with a ${LANG}.srt suffix
+    for srt_path in sorted(full_path.parent.glob(full_path.stem + "*.srt")):
+        lang = srt_path.suffixes[0][1:]
+        langs.append(lang)
+        upload_transcript(srt_path, edx_video_id, lang, access_token, session)
+
+    return {"edx_video_id": edx_video_id, "lang": "-".join(langs)}, uploaded
+
+
+def main():
+    args = parse_args()
+    access_token = get_access_token()
+
+    get_upload_link_url = GENERATE_UPLOAD_LINK_BASE_URL + args.course_id
+    state = UploadState(args.state_file)
+    files_data = dict(state.uploaded)
+    chunk_size = args.chunk_size * BYTES_IN_KILOBYTE
+    part_size = args.multipart_part_size and args.multipart_part_size * BYTES_IN_MEGABYTE
+    session = create_session(args.workers * (args.part_workers if part_size else 1))
+
+    def upload(video):
+        full_path, relative_path = video
+        file_data, uploaded = upload_video(
+            full_path, get_upload_link_url, access_token, session, chunk_size, part_size, args.part_workers
+        )
+        if uploaded:
+            state.record(str(relative_path), file_data)
+        return str(relative_path), file_data
 
-                # Look for files with the same name as our video but with a ${LANG}.srt suffix
-                for srt_path in sorted(full_path.parent.glob(full_path.stem + "*.srt")):
-                    lang = srt_path.suffixes[0][1:]
-                    langs.append(lang)
-                    upload_transcript(srt_path, edx_video_id, lang, access_token)
+    videos = [video for video in find_videos(args.directory) if str(video[1]) not in state.uploaded]
+    if state.uploaded:
+        print(f"Skipping {len(state.uploaded)} videos uploaded previously.")
 
-                files_data[str(relative_path)]["lang"] = "-".join(langs)
+    with session, ThreadPoolExecutor(max_workers=args.workers) as executor:
+        files_data.update(executor.map(upload, videos))
 
     input_csv_path = Path(args.input_csv)
 
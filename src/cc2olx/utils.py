@@ -2,12 +2,16 @@
 Utility functions for cc2olx.
 """
 
+import concurrent.futures
 import csv
+import functools
 import logging
 import re
 import string
 import xml.dom.minidom
-from typing import Generator
+from typing import Generator, Iterable, Optional, Pattern, Tuple
+
+from cc2olx.logs import get_worker_logging_initargs, init_worker_logging
 
 CDATA_PATTERN = r"<!\[CDATA\[(?P<content>.*?)\]\]>"
 
@@ -139,3 +143,58 @@ def get_xml_minidom_element_iterator(
 
     for child in element.childNodes:
         yield from get_xml_minidom_element_iterator(child)
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_html_tags_pattern(tag_names: Tuple[str, ...]) -> Pattern:
+    """
+    Compile a pattern matching opening tags with the provided names.
+    """
+    return re.compile(r"<(?:{})\b".format("|".join(map(re.escape, tag_names))), flags=re.IGNORECASE)
+
+
+def html_may_contain_tags(html: str, tag_names: Iterable[str]) -> bool:
+    """
+    Decide whether HTML string may contain any of the provided tags.
+
+    This is a cheap pre-scan used to skip full HTML parsing when a transform
+    works only with the tags that are definitely absent. False positives
+    (e.g. a tag inside a comment) are possible, false negatives are not.
+
+    Args:
+        html (str): HTML string to scan.
+        tag_names (Iterable[str]): names of the tags a transform is interested in.
+
+    Returns:
+        bool: whether the full HTML parsing is needed.
+    """
+    return bool(_compile_html_tags_pattern(tuple(sorted(tag_names))).search(html))
+
+
+class LazyProcessPool:
+    """
+    A process pool executor whose worker processes are started on the first use.
+
+    The pool is shared by all the usages during a conversion, so the workers
+    are started at most once. It must be shut down when the conversion is
+    finished. The workers log through the conversion process logging.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=init_worker_logging,
+                initargs=get_worker_logging_initargs(),
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
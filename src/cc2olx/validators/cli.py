@@ -1,6 +1,6 @@
 import argparse
 import re
-from typing import Callable
+from typing import Callable, Tuple
 
 from django.core.exceptions import ValidationError
 from django.core.validators import URLValidator
@@ -38,3 +38,18 @@ link_source_validator = convert_to_argparse_validator(
         flags=re.IGNORECASE,
     )
 )
+
+
+def shard_validator(value: str) -> Tuple[int, int]:
+    """
+    Parse the shard in the `k/N` format, where k is the shard number from 1 to N.
+    """
+    match = re.fullmatch(r"(\d+)/(\d+)", value.strip())
+    if not match:
+        raise argparse.ArgumentTypeError(f"{value!r} is not a shard in the k/N format.")
+
+    shard, shards = int(match[1]), int(match[2])
+    if not 1 <= shard <= shards:
+        raise argparse.ArgumentTypeError(f"The shard number must be from 1 to {shards}, got {shard}.")
+
+    return shard, shards
@@ -3,7 +3,6 @@ from typing import Dict, List, Optional, Type, TypeVar
 
 from lxml import etree
 
-
 QTI_NAMESPACE = "http://www.imsglobal.org/xsd/ims_qtiasiv1p2"
 
 
@@ -15,6 +14,25 @@ class CommonCartridgeElementBase(etree.ElementBase):
     NODE_NAMESPACES: List[str]
     NODE_NAME: str
 
+    def _find(self, xpath: etree.XPath, **variables: str) -> Optional["CommonCartridgeElementBase"]:
+        """
+        Provide the first element matching the precompiled XPath expression.
+        """
+        found = xpath(self, **variables)
+        return found[0] if found else None
+
+    def _find_by_resource_type(
+        self,
+        xpaths: Dict[str, etree.XPath],
+        resource_type: str,
+    ) -> Optional["CommonCartridgeElementBase"]:
+        """
+        Provide the first element matching the XPath expression compiled for the resource type.
+        """
+        if (xpath := xpaths.get(resource_type)) is None:
+            return None
+        return self._find(xpath)
+
 
 class CommonCartridgeElementClassLookup(etree.CustomElementClassLookup):
     """
@@ -38,6 +56,17 @@ class CommonCartridgeElementClassLookup(etree.CustomElementClassLookup):
 CommonCartridgeElementType = TypeVar("CommonCartridgeElementType", bound=CommonCartridgeElementBase)
 
 
+def compile_xpath_per_namespace(path: str, prefix: str, namespace_options: Dict[str, str]) -> Dict[str, etree.XPath]:
+    """
+    Compile the XPath expression for every namespace option.
+
+    It's used by the elements whose namespace depends on a resource type.
+    """
+    return {
+        option: etree.XPath(path, namespaces={prefix: namespace}) for option, namespace in namespace_options.items()
+    }
+
+
 def common_cartridge_element(cls: CommonCartridgeElementType) -> CommonCartridgeElementType:
     """
     Add a type to the Common Cartridge XML lookup.
@@ -62,23 +91,20 @@ class WebLink(CommonCartridgeElementBase):
     NODE_NAMESPACES = list(SEARCH_NAMESPACE_OPTIONS.values())
     NODE_NAME = "weblink"
 
-    def get_title(self, resource_type: str) -> CommonCartridgeElementBase:
+    TITLE_XPATHS = compile_xpath_per_namespace("wl:title", "wl", SEARCH_NAMESPACE_OPTIONS)
+    URL_XPATHS = compile_xpath_per_namespace("wl:url", "wl", SEARCH_NAMESPACE_OPTIONS)
+
+    def get_title(self, resource_type: str) -> Optional[CommonCartridgeElementBase]:
         """
         Provide <title> child tag.
         """
-        return self.find("wl:title", self._define_search_namespace(resource_type))
+        return self._find_by_resource_type(self.TITLE_XPATHS, resource_type)
 
-    def get_url(self, resource_type: str) -> CommonCartridgeElementBase:
+    def get_url(self, resource_type: str) -> Optional[CommonCartridgeElementBase]:
         """
         Provide <url> child tag.
         """
-        return self.find("wl:url", self._define_search_namespace(resource_type))
-
-    def _define_search_namespace(self, resource_type: str) -> Dict[str, str]:
-        """
-        Define a search namespace based on resource type.
-        """
-        return {"wl": self.SEARCH_NAMESPACE_OPTIONS.get(resource_type)}
+        return self._find_by_resource_type(self.URL_XPATHS, resource_type)
 
 
 @common_cartridge_element
@@ -98,61 +124,70 @@ class BasicLtiLink(CommonCartridgeElementBase):
     ]
     NODE_NAME = "cartridge_basiclti_link"
 
+    TITLE_XPATH = etree.XPath("blti:title", namespaces=SEARCH_NAMESPACES)
+    DESCRIPTION_XPATH = etree.XPath("blti:description", namespaces=SEARCH_NAMESPACES)
+    SECURE_LAUNCH_URL_XPATH = etree.XPath("blti:secure_launch_url", namespaces=SEARCH_NAMESPACES)
+    LAUNCH_URL_XPATH = etree.XPath("blti:launch_url", namespaces=SEARCH_NAMESPACES)
+    WIDTH_XPATH = etree.XPath("blti:extensions/lticm:property[@name='selection_width']", namespaces=SEARCH_NAMESPACES)
+    HEIGHT_XPATH = etree.XPath("blti:extensions/lticm:property[@name='selection_height']", namespaces=SEARCH_NAMESPACES)
+    CUSTOM_XPATH = etree.XPath("blti:custom", namespaces=SEARCH_NAMESPACES)
+    CANVAS_TOOL_ID_XPATH = etree.XPath("blti:extensions/lticm:property[@name='tool_id']", namespaces=SEARCH_NAMESPACES)
+
     @property
     def title(self) -> CommonCartridgeElementBase:
         """
         Provide <title> child tag.
         """
-        return self.find("blti:title", self.SEARCH_NAMESPACES)
+        return self._find(self.TITLE_XPATH)
 
     @property
     def description(self) -> CommonCartridgeElementBase:
         """
         Provide <description> child tag.
         """
-        return self.find("blti:description", self.SEARCH_NAMESPACES)
+        return self._find(self.DESCRIPTION_XPATH)
 
     @property
     def secure_launch_url(self) -> Optional[CommonCartridgeElementBase]:
         """
         Provide <secure_launch_url> child tag.
         """
-        return self.find("blti:secure_launch_url", self.SEARCH_NAMESPACES)
+        return self._find(self.SECURE_LAUNCH_URL_XPATH)
 
     @property
     def launch_url(self) -> Optional[CommonCartridgeElementBase]:
         """
         Provide <launch_url> child tag.
         """
-        return self.find("blti:launch_url", self.SEARCH_NAMESPACES)
+        return self._find(self.LAUNCH_URL_XPATH)
 
     @property
     def width(self) -> Optional[CommonCartridgeElementBase]:
         """
         Provide width property descendant tag.
         """
-        return self.find("blti:extensions/lticm:property[@name='selection_width']", self.SEARCH_NAMESPACES)
+        return self._find(self.WIDTH_XPATH)
 
     @property
     def height(self) -> Optional[CommonCartridgeElementBase]:
         """
         Provide height property descendant tag.
         """
-        return self.find("blti:extensions/lticm:property[@name='selection_height']", self.SEARCH_NAMESPACES)
+        return self._find(self.HEIGHT_XPATH)
 
     @property
     def custom(self) -> Optional[CommonCartridgeElementBase]:
         """
         Provide <custom> child tag.
         """
-        return self.find("blti:custom", self.SEARCH_NAMESPACES)
+        return self._find(self.CUSTOM_XPATH)
 
     @property
     def canvas_tool_id(self) -> Optional[CommonCartridgeElementBase]:
         """
         Provide Canvas tool identifier property descendant tag.
         """
-        return self.find("blti:extensions/lticm:property[@name='tool_id']", self.SEARCH_NAMESPACES)
+        return self._find(self.CANVAS_TOOL_ID_XPATH)
 
 
 @common_cartridge_element
@@ -169,23 +204,20 @@ class DiscussionTopic(CommonCartridgeElementBase):
     NODE_NAMESPACES = list(SEARCH_NAMESPACE_OPTIONS.values())
     NODE_NAME = "topic"
 
-    def get_title(self, resource_type: str) -> CommonCartridgeElementBase:
+    TITLE_XPATHS = compile_xpath_per_namespace("dt:title", "dt", SEARCH_NAMESPACE_OPTIONS)
+    TEXT_XPATHS = compile_xpath_per_namespace("dt:text", "dt", SEARCH_NAMESPACE_OPTIONS)
+
+    def get_title(self, resource_type: str) -> Optional[CommonCartridgeElementBase]:
         """
         Provide <title> child tag.
         """
-        return self.find("dt:title", self._define_search_namespace(resource_type))
+        return self._find_by_resource_type(self.TITLE_XPATHS, resource_type)
 
-    def get_text(self, resource_type: str) -> CommonCartridgeElementBase:
+    def get_text(self, resource_type: str) -> Optional[CommonCartridgeElementBase]:
         """
         Provide <text> child tag.
         """
-        return self.find("dt:text", self._define_search_namespace(resource_type))
-
-    def _define_search_namespace(self, resource_type: str) -> Dict[str, str]:
-        """
-        Define a search namespace based on resource type.
-        """
-        return {"dt": self.SEARCH_NAMESPACE_OPTIONS.get(resource_type)}
+        return self._find_by_resource_type(self.TEXT_XPATHS, resource_type)
 
 
 @common_cartridge_element
@@ -198,12 +230,14 @@ class QtiElement(CommonCartridgeElementBase):
     NODE_NAMESPACES = [QTI_NAMESPACE]
     NODE_NAME = "questestinterop"
 
+    ITEMS_XPATH = etree.XPath(".//qti:section/qti:item", namespaces=SEARCH_NAMESPACES)
+
     @property
     def items(self) -> List["QtiItem"]:
         """
         Provide <item> child tags.
         """
-        return self.findall(".//qti:section/qti:item", self.SEARCH_NAMESPACES)
+        return self.ITEMS_XPATH(self)
 
 
 @common_cartridge_element
@@ -216,12 +250,25 @@ class QtiItem(CommonCartridgeElementBase):
     NODE_NAMESPACES = [QTI_NAMESPACE]
     NODE_NAME = "item"
 
+    PRESENTATION_XPATH = etree.XPath("qti:presentation", namespaces=SEARCH_NAMESPACES)
+    RESPROCESSING_XPATH = etree.XPath("qti:resprocessing", namespaces=SEARCH_NAMESPACES)
+    QTIMETADATAFIELDS_XPATH = etree.XPath(
+        "qti:itemmetadata/qti:qtimetadata/qti:qtimetadatafield", namespaces=SEARCH_NAMESPACES
+    )
+    PROFILE_XPATH = etree.XPath(
+        "qti:itemmetadata/qti:qtimetadata/qti:qtimetadatafield[qti:fieldlabel[1]='cc_profile']/qti:fieldentry[1]",
+        namespaces=SEARCH_NAMESPACES,
+    )
+    SOLUTION_XPATH = etree.XPath("qti:itemfeedback/qti:solution", namespaces=SEARCH_NAMESPACES)
+    ITEMFEEDBACK_XPATH = etree.XPath("qti:itemfeedback", namespaces=SEARCH_NAMESPACES)
+    ITEMFEEDBACK_BY_IDENT_XPATH = etree.XPath("qti:itemfeedback[@ident=$ident]", namespaces=SEARCH_NAMESPACES)
+
     @property
     def presentation(self) -> "QtiPresentation":
         """
         Provide <presentation> child tag.
         """
-        return self.find("qti:presentation", self.SEARCH_NAMESPACES)
+        return self._find(self.PRESENTATION_XPATH)
 
     @property
     def description(self) -> str:
@@ -235,14 +282,14 @@ class QtiItem(CommonCartridgeElementBase):
         """
         Provide <resprocessing> child tag.
         """
-        return self.find("qti:resprocessing", self.SEARCH_NAMESPACES)
+        return self._find(self.RESPROCESSING_XPATH)
 
     @property
     def qtimetadatafields(self) -> List["QtiMetadataField"]:
         """
         Provide <qtimetadatafield> descendant tag.
         """
-        return self.findall("qti:itemmetadata/qti:qtimetadata/qti:qtimetadatafield", self.SEARCH_NAMESPACES)
+        return self.QTIMETADATAFIELDS_XPATH(self)
 
     @property
     def profile(self) -> str:
@@ -264,12 +311,8 @@ class QtiItem(CommonCartridgeElementBase):
         </itemmetadata>
         ```
         """
-        for field in self.qtimetadatafields:
-            label = field.fieldlabel.text
-            entry = field.fieldentry.text
-
-            if label == "cc_profile":
-                return entry
+        if (entry := self._find(self.PROFILE_XPATH)) is not None:
+            return entry.text
 
         raise ValueError('QTI metadata must contain "cc_profile" field.')
 
@@ -278,16 +321,15 @@ class QtiItem(CommonCartridgeElementBase):
         """
         Provide <solution> descendant tag.
         """
-        return self.find("qti:itemfeedback/qti:solution", self.SEARCH_NAMESPACES)
+        return self._find(self.SOLUTION_XPATH)
 
     def get_itemfeedback(self, response_type: Optional[str] = None) -> Optional["QtiItemFeedback"]:
         """
         Provide <itemfeedback> child tag.
         """
-        selector = "qti:itemfeedback"
         if response_type:
-            selector = f"{selector}[@ident='{response_type}']"
-        return self.find(selector, self.SEARCH_NAMESPACES)
+            return self._find(self.ITEMFEEDBACK_BY_IDENT_XPATH, ident=response_type)
+        return self._find(self.ITEMFEEDBACK_XPATH)
 
 
 @common_cartridge_element
@@ -300,19 +342,22 @@ class QtiMetadataField(CommonCartridgeElementBase):
     NODE_NAMESPACES = [QTI_NAMESPACE]
     NODE_NAME = "qtimetadatafield"
 
+    FIELDLABEL_XPATH = etree.XPath("qti:fieldlabel", namespaces=SEARCH_NAMESPACES)
+    FIELDENTRY_XPATH = etree.XPath("qti:fieldentry", namespaces=SEARCH_NAMESPACES)
+
     @property
     def fieldlabel(self) -> CommonCartridgeElementBase:
         """
         Provide <fieldlabel> child tag.
         """
-        return self.find("qti:fieldlabel", self.SEARCH_NAMESPACES)
+        return self._find(self.FIELDLABEL_XPATH)
 
     @property
     def fieldentry(self) -> CommonCartridgeElementBase:
         """
         Provide <fieldentry> child tag.
         """
-        return self.find("qti:fieldentry", self.SEARCH_NAMESPACES)
+        return self._find(self.FIELDENTRY_XPATH)
 
 
 @common_cartridge_element
@@ -325,19 +370,24 @@ class QtiPresentation(CommonCartridgeElementBase):
     NODE_NAMESPACES = [QTI_NAMESPACE]
     NODE_NAME = "presentation"
 
+    RESPONSE_LABELS_XPATH = etree.XPath(
+        "qti:response_lid/qti:render_choice/qti:response_label", namespaces=SEARCH_NAMESPACES
+    )
+    MATTEXT_XPATH = etree.XPath("qti:material/qti:mattext", namespaces=SEARCH_NAMESPACES)
+
     @property
     def response_labels(self) -> List["QtiResponseLabel"]:
         """
         Provide <response_label> descendant tags.
         """
-        return self.findall("qti:response_lid/qti:render_choice/qti:response_label", self.SEARCH_NAMESPACES)
+        return self.RESPONSE_LABELS_XPATH(self)
 
     @property
     def mattext(self) -> CommonCartridgeElementBase:
         """
         Provide <mattext> descendant tag.
         """
-        return self.find("qti:material/qti:mattext", self.SEARCH_NAMESPACES)
+        return self._find(self.MATTEXT_XPATH)
 
 
 @common_cartridge_element
@@ -350,12 +400,14 @@ class QtiResponseLabel(CommonCartridgeElementBase):
     NODE_NAMESPACES = [QTI_NAMESPACE]
     NODE_NAME = "response_label"
 
+    MATTEXT_XPATH = etree.XPath("qti:material/qti:mattext", namespaces=SEARCH_NAMESPACES)
+
     @property
     def mattext(self) -> CommonCartridgeElementBase:
         """
         Provide <mattext> descendant tag.
         """
-        return self.find("qti:material/qti:mattext", self.SEARCH_NAMESPACES)
+        return self._find(self.MATTEXT_XPATH)
 
 
 @common_cartridge_element
@@ -368,12 +420,14 @@ class QtiResprocessing(CommonCartridgeElementBase):
     NODE_NAMESPACES = [QTI_NAMESPACE]
     NODE_NAME = "resprocessing"
 
+    RESPCONDITIONS_XPATH = etree.XPath("qti:respcondition", namespaces=SEARCH_NAMESPACES)
+
     @property
     def respconditions(self) -> List["QtiRespcondition"]:
         """
         Provide <respcondition> descendant tags.
         """
-        return self.findall("qti:respcondition", self.SEARCH_NAMESPACES)
+        return self.RESPCONDITIONS_XPATH(self)
 
 
 @common_cartridge_element
@@ -386,39 +440,45 @@ class QtiRespcondition(CommonCartridgeElementBase):
     NODE_NAMESPACES = [QTI_NAMESPACE]
     NODE_NAME = "respcondition"
 
+    VAREQUALS_XPATH = etree.XPath("qti:conditionvar/qti:varequal", namespaces=SEARCH_NAMESPACES)
+    AND_VAREQUALS_XPATH = etree.XPath("qti:conditionvar/qti:and/qti:varequal", namespaces=SEARCH_NAMESPACES)
+    OR_VAREQUALS_XPATH = etree.XPath("qti:conditionvar/qti:or/qti:varequal", namespaces=SEARCH_NAMESPACES)
+    VARSUBSTRINGS_XPATH = etree.XPath("qti:conditionvar/qti:varsubstring", namespaces=SEARCH_NAMESPACES)
+    DISPLAY_FEEDBACK_XPATH = etree.XPath("qti:displayfeedback[@linkrefid=$linkrefid]", namespaces=SEARCH_NAMESPACES)
+
     @property
     def varequals(self) -> List[CommonCartridgeElementBase]:
         """
         Provide <varequal> descendant tags.
         """
-        return self.findall("qti:conditionvar/qti:varequal", self.SEARCH_NAMESPACES)
+        return self.VAREQUALS_XPATH(self)
 
     @property
     def and_varequals(self) -> List[CommonCartridgeElementBase]:
         """
         Provide <varequal> descendant tags wrapped by <and> tag.
         """
-        return self.findall("qti:conditionvar/qti:and/qti:varequal", self.SEARCH_NAMESPACES)
+        return self.AND_VAREQUALS_XPATH(self)
 
     @property
     def or_varequals(self) -> List[CommonCartridgeElementBase]:
         """
         Provide <varequal> descendant tags wrapped by <or> tag.
         """
-        return self.findall("qti:conditionvar/qti:or/qti:varequal", self.SEARCH_NAMESPACES)
+        return self.OR_VAREQUALS_XPATH(self)
 
     @property
     def varsubstrings(self) -> List[CommonCartridgeElementBase]:
         """
         Provide <varsubstring> descendant tags.
         """
-        return self.findall("qti:conditionvar/qti:varsubstring", self.SEARCH_NAMESPACES)
+        return self.VARSUBSTRINGS_XPATH(self)
 
     def get_display_feedback(self, response_type: str) -> Optional[CommonCartridgeElementBase]:
         """
         Provide <displayfeedback> child tag.
         """
-        return self.find(f"qti:displayfeedback[@linkrefid='{response_type}']", self.SEARCH_NAMESPACES)
+        return self._find(self.DISPLAY_FEEDBACK_XPATH, linkrefid=response_type)
 
 
 @common_cartridge_element
@@ -431,12 +491,14 @@ class QtiSolution(CommonCartridgeElementBase):
     NODE_NAMESPACES = [QTI_NAMESPACE]
     NODE_NAME = "solution"
 
+    MATTEXT_XPATH = etree.XPath("qti:solutionmaterial//qti:material//qti:mattext", namespaces=SEARCH_NAMESPACES)
+
     @property
     def mattext(self) -> CommonCartridgeElementBase:
         """
         Provide <mattext> descendant tag.
         """
-        return self.find("qti:solutionmaterial//qti:material//qti:mattext", self.SEARCH_NAMESPACES)
+        return self._find(self.MATTEXT_XPATH)
 
 
 @common_cartridge_element
@@ -449,12 +511,14 @@ class QtiItemFeedback(CommonCartridgeElementBase):
     NODE_NAMESPACES = [QTI_NAMESPACE]
     NODE_NAME = "itemfeedback"
 
+    FLOW_MAT_XPATH = etree.XPath("qti:flow_mat", namespaces=SEARCH_NAMESPACES)
+
     @property
     def flow_mat(self) -> "QtiFlowMat":
         """
         Provide <flow_mat> child tag.
         """
-        return self.find("qti:flow_mat", self.SEARCH_NAMESPACES)
+        return self._find(self.FLOW_MAT_XPATH)
 
 
 @common_cartridge_element
@@ -467,12 +531,14 @@ class QtiFlowMat(CommonCartridgeElementBase):
     NODE_NAMESPACES = [QTI_NAMESPACE]
     NODE_NAME = "flow_mat"
 
+    MATERIAL_XPATH = etree.XPath("qti:material", namespaces=SEARCH_NAMESPACES)
+
     @property
     def material(self) -> "QtiMaterial":
         """
         Provide <material> child tag.
         """
-        return self.find("qti:material", self.SEARCH_NAMESPACES)
+        return self._find(self.MATERIAL_XPATH)
 
 
 @common_cartridge_element
@@ -485,12 +551,14 @@ class QtiMaterial(CommonCartridgeElementBase):
     NODE_NAMESPACES = [QTI_NAMESPACE]
     NODE_NAME = "material"
 
+    MATTEXT_XPATH = etree.XPath("qti:mattext", namespaces=SEARCH_NAMESPACES)
+
     @property
     def mattext(self) -> CommonCartridgeElementBase:
         """
         Provide <mattext> child tag.
         """
-        return self.find("qti:mattext", self.SEARCH_NAMESPACES)
+        return self._find(self.MATTEXT_XPATH)
 
 
 class CommonCartridgeXmlParser(etree.XMLParser):
@@ -514,29 +582,34 @@ class AssignmentElement(CommonCartridgeElementBase):
     NODE_NAMESPACES = list(SEARCH_NAMESPACES.values())
     NODE_NAME = "assignment"
 
+    TITLE_XPATH = etree.XPath("xsi:title", namespaces=SEARCH_NAMESPACES)
+    TEXT_XPATH = etree.XPath("xsi:text", namespaces=SEARCH_NAMESPACES)
+    INSTRUCTOR_TEXT_XPATH = etree.XPath("xsi:instructor_text", namespaces=SEARCH_NAMESPACES)
+    ACCEPTED_FORMATS_XPATH = etree.XPath("xsi:submission_formats/xsi:format", namespaces=SEARCH_NAMESPACES)
+
     @property
     def title(self) -> CommonCartridgeElementBase:
         """
         Provide <title> child tag.
         """
-        return self.find("xsi:title", self.SEARCH_NAMESPACES)
+        return self._find(self.TITLE_XPATH)
 
     def get_text(self) -> Optional[CommonCartridgeElementBase]:
         """
         Provide <text> child tag.
         """
-        return self.find("xsi:text", self.SEARCH_NAMESPACES)
+        return self._find(self.TEXT_XPATH)
 
     @property
     def instructor_text(self) -> CommonCartridgeElementBase:
         """
         Provide <instructor_text> child tag.
         """
-        return self.find("xsi:instructor_text", self.SEARCH_NAMESPACES)
+        return self._find(self.INSTRUCTOR_TEXT_XPATH)
 
     @property
     def accepted_formats(self) -> List[CommonCartridgeElementBase]:
         """
         Provide <format> children of <submission_formats> child tag.
         """
-        return self.findall("xsi:submission_formats/xsi:format", self.SEARCH_NAMESPACES)
+        return self.ACCEPTED_FORMATS_XPATH(self)
@@ -14,7 +14,7 @@ from cc2olx.content_processors.dataclasses import ContentProcessorContext
 from cc2olx.content_processors.utils import WebContentFile
 from cc2olx.models import Cartridge
 from cc2olx.parser import parse_options
-from .utils import build_multi_value_args, zip_imscc_dir
+from .utils import build_multi_value_args, MockStudioServer, zip_imscc_dir
 
 
 @pytest.fixture(scope="session")
@@ -155,9 +155,30 @@ def video_upload_args(fixtures_data_dir):
         "directory": str(fixtures_data_dir.joinpath("video_files")),
         "input_csv": str(fixtures_data_dir.joinpath("video-data.csv")),
         "output_csv": NamedTemporaryFile().name,
+        "workers": 1,
+        "state_file": None,
+        "chunk_size": 1024,
+        "multipart_part_size": None,
+        "part_workers": 4,
     }
 
 
+@pytest.fixture
+def mock_studio_server(monkeypatch):
+    """
+    Run a local HTTP server imitating the APIs used by the video upload tool.
+    """
+    with MockStudioServer() as server:
+        monkeypatch.setattr("cc2olx.tools.video_upload.OAUTH_TOKEN_URL", f"{server.url}/oauth2/access_token")
+        monkeypatch.setattr(
+            "cc2olx.tools.video_upload.GENERATE_UPLOAD_LINK_BASE_URL", f"{server.url}/generate_video_upload_link/"
+        )
+        monkeypatch.setattr("cc2olx.tools.video_upload.TRANSCRIPT_UPLOAD_LINK", f"{server.url}/transcript_upload_api/")
+        monkeypatch.setenv("CC2OLX_CLIENT", "client")
+        monkeypatch.setenv("CC2OLX_SECRET", "secret")
+        yield server
+
+
 @pytest.fixture(scope="session")
 def link_map_csv(fixtures_data_dir):
     """
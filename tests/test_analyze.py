@@ -0,0 +1,86 @@
+import json
+import zipfile
+
+import pytest
+
+from cc2olx.analyze import CartridgeAnalysis, analyze_cartridge, analyze_cartridges, estimate_conversion_time
+from cc2olx.main import analyze
+
+TIME_COEFFICIENTS = {"cartridge": 1.0, "resource": 0.1, "qti_item": 0.01, "megabyte": 2.0}
+
+
+class TestAnalyzeCartridge:
+    def test_resources_are_counted(self, imscc_file):
+        analysis = analyze_cartridge(imscc_file, TIME_COEFFICIENTS)
+
+        assert analysis.error is None
+        assert analysis.is_canvas_flavor is True
+        assert analysis.resources == 28
+        assert analysis.resources_by_type["webcontent"] == 10
+        assert analysis.resources_by_type["imsqti_xmlv1p2/imscc_xmlv1p1/assessment"] == 2
+        assert analysis.unsupported_resources_by_type == {
+            "associatedcontent/imscc_xmlv1p1/learning-application-resource": 3,
+        }
+        assert analysis.module_items > 0
+
+    def test_qti_items_are_counted_by_profile(self, imscc_file):
+        analysis = analyze_cartridge(imscc_file, TIME_COEFFICIENTS)
+
+        assert analysis.qti_items_by_profile == {
+            "cc.multiple_choice.v0p1": 1,
+            "cc.true_false.v0p1": 1,
+            "cc.multiple_response.v0p1": 1,
+            "cc.fib.v0p1": 2,
+            "cc.essay.v0p1": 2,
+        }
+
+    def test_qti_items_counting_is_skipped(self, imscc_file):
+        analysis = analyze_cartridge(imscc_file, TIME_COEFFICIENTS, count_qti_items=False)
+
+        assert analysis.qti_items_by_profile == {}
+
+    def test_static_files_are_measured(self, imscc_file):
+        with zipfile.ZipFile(imscc_file) as cartridge_zip:
+            web_resources_bytes = sum(
+                info.file_size for info in cartridge_zip.infolist() if info.filename.startswith("web_resources/")
+            )
+
+        analysis = analyze_cartridge(imscc_file, TIME_COEFFICIENTS)
+
+        assert analysis.static_bytes > web_resources_bytes
+        assert 0 < analysis.static_bytes < analysis.uncompressed_size
+
+    def test_error_is_reported(self, tmp_path):
+        input_file = tmp_path / "broken.imscc"
+        input_file.write_bytes(b"not a zip")
+
+        analysis = analyze_cartridge(input_file, TIME_COEFFICIENTS)
+
+        assert analysis.error.startswith("BadZipFile")
+        assert analysis.estimated_time == 0.0
+
+
+def test_conversion_time_is_estimated(tmp_path):
+    analysis = CartridgeAnalysis(tmp_path / "course.imscc", resources=10, uncompressed_size=1024 * 1024)
+    analysis.qti_items_by_profile["cc.essay.v0p1"] = 100
+
+    assert estimate_conversion_time(analysis, TIME_COEFFICIENTS) == pytest.approx(1.0 + 1.0 + 1.0 + 2.0)
+
+
+def test_cartridges_are_analyzed_in_worker_processes(imscc_file):
+    sequential_analyses = list(analyze_cartridges([imscc_file, imscc_file]))
+
+    parallel_analyses = list(analyze_cartridges([imscc_file, imscc_file], workers=2))
+
+    assert parallel_analyses == sequential_analyses
+
+
+def test_analyze_command_writes_report(imscc_file, tmp_path):
+    report_file = tmp_path / "report.jsonl"
+
+    assert analyze(["-i", str(imscc_file), "--report-file", str(report_file)]) == 0
+
+    [report] = [json.loads(line) for line in report_file.read_text().splitlines()]
+    assert report["input_file"] == str(imscc_file)
+    assert report["resources_by_type"]["webcontent"] == 10
+    assert report["estimated_time"] > 0
@@ -0,0 +1,95 @@
+import tarfile
+import zipfile
+
+from benchmarks import conversion_stages, logging_overhead, olx_layout, ora_criteria
+from benchmarks.cartridge_generator import CartridgeSpec, generate_cartridge
+from cc2olx.main import convert_one_file
+
+SMALL_CARTRIDGE_SPEC = CartridgeSpec(
+    modules=2,
+    html_pages=2,
+    html_paragraphs=5,
+    qti_assessments=1,
+    qti_items_per_profile=2,
+    web_links=1,
+    lti_links=1,
+    discussions=1,
+    assignments=1,
+    static_files=3,
+    static_file_size=16,
+    canvas=True,
+)
+
+
+def test_synthetic_cartridge_is_generated(tmp_path):
+    cartridge_path = generate_cartridge(tmp_path / "synthetic.imscc", SMALL_CARTRIDGE_SPEC)
+
+    with zipfile.ZipFile(cartridge_path) as cartridge:
+        names = set(cartridge.namelist())
+
+    assert "imsmanifest.xml" in names
+    assert "course_settings/module_meta.xml" in names
+    assert len([name for name in names if name.startswith("web_resources/")]) == 3
+    assert len([name for name in names if name.endswith("assessment_qti.xml")]) == 2
+
+
+def test_synthetic_cartridge_is_converted(tmp_path):
+    cartridge_path = generate_cartridge(tmp_path / "synthetic.imscc", SMALL_CARTRIDGE_SPEC)
+    workspace = tmp_path / "workspace"
+
+    convert_one_file(cartridge_path, workspace)
+
+    with tarfile.open(workspace / "synthetic.tar.gz") as archive:
+        course_xml = archive.extractfile("course.xml").read().decode()
+
+    # Multiple choice, true/false, multiple response and FIB items of 2 modules.
+    assert course_xml.count("<problem ") == 2 * 4 * 2
+    # Essay items and assignments.
+    assert course_xml.count("<openassessment ") == 2 * 2 + 2
+    assert course_xml.count("<lti_consumer ") == 2
+    assert course_xml.count("<discussion ") == 2
+
+
+def test_all_conversion_stages_are_measured(tmp_path):
+    cartridge_path = generate_cartridge(tmp_path / "synthetic.imscc", SMALL_CARTRIDGE_SPEC)
+
+    durations = conversion_stages.run(cartridge_path, repeat=2)
+
+    assert list(durations) == list(conversion_stages.STAGES)
+    assert all(len(stage_durations) == 2 for stage_durations in durations.values())
+    assert all(duration > 0 for stage in ("process", "post-process", "serialize") for duration in durations[stage])
+
+
+def test_logging_modes_are_measured(tmp_path):
+    cartridge_path = generate_cartridge(tmp_path / "synthetic.imscc", SMALL_CARTRIDGE_SPEC)
+
+    durations, log_sizes = logging_overhead.run(cartridge_path, repeat=1)
+
+    assert list(durations) == list(logging_overhead.MODES)
+    assert log_sizes["disabled"] < log_sizes["summary"] < log_sizes["file"]
+    assert log_sizes["queued file"] == log_sizes["file"]
+
+
+def test_logging_message_costs_are_measured(tmp_path):
+    costs = logging_overhead.measure_message_costs(100, tmp_path / "messages.log")
+
+    assert list(costs) == list(logging_overhead.MODES)
+    assert all(cost > 0 for cost in costs.values())
+    assert len((tmp_path / "messages.log").read_text().splitlines()) == 200 + 1
+
+
+def test_olx_layouts_are_measured(tmp_path):
+    cartridge_path = generate_cartridge(tmp_path / "synthetic.imscc", SMALL_CARTRIDGE_SPEC)
+
+    durations, archive_sizes = olx_layout.run(cartridge_path, repeat=1, workers=2)
+
+    assert list(durations) == list(olx_layout.LAYOUTS)
+    assert all(len(durations[layout]["package"]) == 1 for layout in olx_layout.LAYOUTS)
+    assert all(archive_sizes[layout] > 0 for layout in olx_layout.LAYOUTS)
+
+
+def test_ora_criteria_methods_are_measured():
+    costs = ora_criteria.run(5)
+
+    assert list(costs) == list(ora_criteria.METHODS)
+    assert all(cost > 0 for cost in costs.values())
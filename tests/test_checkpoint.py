@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from cc2olx.checkpoint import CheckpointJournal, hash_file
+
+
+@pytest.fixture
+def converted_cartridge(tmp_path):
+    input_file = tmp_path / "course.imscc"
+    input_file.write_bytes(b"cartridge")
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    output_file = output_dir / "course.tar.gz"
+    output_file.write_bytes(b"archive")
+    return input_file, output_dir, output_file
+
+
+def test_converted_cartridge_is_recorded(converted_cartridge, tmp_path):
+    input_file, output_dir, output_file = converted_cartridge
+    journal_file = tmp_path / "checkpoint.jsonl"
+
+    journal = CheckpointJournal(journal_file, output_dir)
+    journal.record(input_file, output_file)
+    journal.close()
+
+    assert json.loads(journal_file.read_text()) == {
+        "input_file": str(input_file),
+        "input_sha256": hash_file(input_file),
+        "output_file": "course.tar.gz",
+        "output_sha256": hash_file(output_file),
+        "output_size": 7,
+    }
+
+
+def test_converted_cartridge_is_found_on_resume(converted_cartridge, tmp_path):
+    input_file, output_dir, output_file = converted_cartridge
+    journal_file = tmp_path / "checkpoint.jsonl"
+    journal = CheckpointJournal(journal_file, output_dir)
+    entry = journal.record(input_file, output_file)
+    journal.close()
+
+    resumed_journal = CheckpointJournal(journal_file, output_dir, resume=True)
+    resumed_journal.close()
+
+    assert resumed_journal.find_converted(input_file) == entry
+    assert CheckpointJournal(journal_file, output_dir).find_converted(input_file) is None
+
+
+@pytest.mark.parametrize("change", ("source", "output_size", "output_removed"))
+def test_changed_cartridge_is_converted_again(converted_cartridge, tmp_path, change):
+    input_file, output_dir, output_file = converted_cartridge
+    journal_file = tmp_path / "checkpoint.jsonl"
+    journal = CheckpointJournal(journal_file, output_dir)
+    journal.record(input_file, output_file)
+    journal.close()
+
+    if change == "source":
+        input_file.write_bytes(b"cartridge v2")
+    elif change == "output_size":
+        output_file.write_bytes(b"part")
+    else:
+        output_file.unlink()
+
+    resumed_journal = CheckpointJournal(journal_file, output_dir, resume=True)
+    resumed_journal.close()
+
+    assert resumed_journal.find_converted(input_file) is None
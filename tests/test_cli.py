@@ -26,10 +26,30 @@ def test_parse_args(imscc_file):
         loglevel="INFO",
         result="folder",
         link_file=None,
+        iframe_inventory=None,
         passport_file=None,
         output="output",
         relative_links_source=None,
         content_types_with_custom_blocks=[],
+        log_file=None,
+        log_summary=False,
+        memory_budget=None,
+        qti_workers=None,
+        stats_file=None,
+        slowest_resources=0,
+        resources_csv=None,
+        progress_file=None,
+        progress_fd=None,
+        shard=None,
+        plan_file=None,
+        result_index=None,
+        include=None,
+        exclude=None,
+        olx_layout="inline",
+        olx_workers=4,
+        checkpoint_file=None,
+        resume=False,
+        fail_fast=False,
     )
 
 
@@ -45,10 +65,30 @@ def test_parse_args_csv_file(imscc_file, link_map_csv):
         loglevel="INFO",
         result="folder",
         link_file=link_map_csv,
+        iframe_inventory=None,
         passport_file=None,
         output="output",
         relative_links_source=None,
         content_types_with_custom_blocks=[],
+        log_file=None,
+        log_summary=False,
+        memory_budget=None,
+        qti_workers=None,
+        stats_file=None,
+        slowest_resources=0,
+        resources_csv=None,
+        progress_file=None,
+        progress_fd=None,
+        shard=None,
+        plan_file=None,
+        result_index=None,
+        include=None,
+        exclude=None,
+        olx_layout="inline",
+        olx_workers=4,
+        checkpoint_file=None,
+        resume=False,
+        fail_fast=False,
     )
 
 
@@ -62,10 +102,30 @@ def test_parse_args_passport_file(imscc_file, passports_csv):
         loglevel="INFO",
         result="folder",
         link_file=None,
+        iframe_inventory=None,
         passport_file=passports_csv,
         output="output",
         relative_links_source=None,
         content_types_with_custom_blocks=[],
+        log_file=None,
+        log_summary=False,
+        memory_budget=None,
+        qti_workers=None,
+        stats_file=None,
+        slowest_resources=0,
+        resources_csv=None,
+        progress_file=None,
+        progress_fd=None,
+        shard=None,
+        plan_file=None,
+        result_index=None,
+        include=None,
+        exclude=None,
+        olx_layout="inline",
+        olx_workers=4,
+        checkpoint_file=None,
+        resume=False,
+        fail_fast=False,
     )
 
 
@@ -82,10 +142,30 @@ def test_parse_args_with_correct_relative_links_source(imscc_file: Path) -> None
         loglevel="INFO",
         result="folder",
         link_file=None,
+        iframe_inventory=None,
         passport_file=None,
         output="output",
         relative_links_source=relative_links_source,
         content_types_with_custom_blocks=[],
+        log_file=None,
+        log_summary=False,
+        memory_budget=None,
+        qti_workers=None,
+        stats_file=None,
+        slowest_resources=0,
+        resources_csv=None,
+        progress_file=None,
+        progress_fd=None,
+        shard=None,
+        plan_file=None,
+        result_index=None,
+        include=None,
+        exclude=None,
+        olx_layout="inline",
+        olx_workers=4,
+        checkpoint_file=None,
+        resume=False,
+        fail_fast=False,
     )
 
 
@@ -115,10 +195,30 @@ def test_parse_args_with_correct_content_types_with_custom_blocks(
         loglevel="INFO",
         result="folder",
         link_file=None,
+        iframe_inventory=None,
         passport_file=None,
         output="output",
         relative_links_source=None,
         content_types_with_custom_blocks=content_types_with_custom_blocks,
+        log_file=None,
+        log_summary=False,
+        memory_budget=None,
+        qti_workers=None,
+        stats_file=None,
+        slowest_resources=0,
+        resources_csv=None,
+        progress_file=None,
+        progress_fd=None,
+        shard=None,
+        plan_file=None,
+        result_index=None,
+        include=None,
+        exclude=None,
+        olx_layout="inline",
+        olx_workers=4,
+        checkpoint_file=None,
+        resume=False,
+        fail_fast=False,
     )
 
 
@@ -143,3 +243,36 @@ def test_parse_args_with_incorrect_content_types_with_custom_blocks(
     parse_args(["-i", str(imscc_file), "-c", content_type_with_custom_block])
 
     logger_mock.warning.assert_called_once_with(expected_log_message)
+
+
+def test_parse_args_without_inputs() -> None:
+    """
+    Test arguments parser requires inputs unless the shard plan file is provided.
+    """
+    with pytest.raises(SystemExit):
+        parse_args([])
+
+    assert parse_args(["--shard", "1/2", "--plan-file", "plan.json"]).inputs is None
+
+
+def test_parse_args_plan_file_without_shard(imscc_file: Path) -> None:
+    """
+    Test arguments parser requires the shard with the plan file.
+    """
+    with pytest.raises(SystemExit):
+        parse_args(["-i", str(imscc_file), "--plan-file", "plan.json"])
+
+
+@pytest.mark.parametrize(
+    "extra_args",
+    (
+        ["--checkpoint-file", "checkpoint.jsonl"],
+        ["--resume", "-r", "tgz"],
+    ),
+)
+def test_parse_args_checkpoint_requirements(imscc_file: Path, extra_args: list) -> None:
+    """
+    Test arguments parser requires the tgz result type with the checkpoint file and the checkpoint file to resume.
+    """
+    with pytest.raises(SystemExit):
+        parse_args(["-i", str(imscc_file)] + extra_args)
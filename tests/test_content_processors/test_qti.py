@@ -1,8 +1,13 @@
+from collections import OrderedDict
+from collections.abc import Iterator
+
+import attrs
 import pytest
 
 from cc2olx.content_processors import QtiContentProcessor
 from cc2olx.content_processors.qti import QtiError
 from cc2olx.models import Cartridge
+from cc2olx.utils import LazyProcessPool
 
 
 class TestQtiContentProcessor:
@@ -23,3 +28,182 @@ class TestQtiContentProcessor:
             processor.process(resource, idref)
 
         assert str(exc_info.value) == 'Unknown cc_profile: "cc.strange.v0p1"'
+
+    def test_items_are_parsed_lazily(self, cartridge, empty_content_processor_context):
+        processor = QtiContentProcessor(cartridge, empty_content_processor_context)
+        resource = cartridge.define_resource("resource_4_qti")
+
+        parsed_problems = processor._parse(resource)
+
+        assert isinstance(parsed_problems, Iterator)
+        assert [problem["ident"] for problem in parsed_problems] == [
+            "question_multiple_choice0",
+            "question_boolean1",
+            "multiple_response_question2",
+            "question_fill_in_blank3",
+            "question_fill_in_blank_with_regexp4",
+            "essay_question_id5",
+            "essay_question_2_id6",
+        ]
+
+    @pytest.mark.parametrize("min_items", [0, 3, 100])
+    def test_items_are_parsed_in_parallel(self, min_items, cartridge, empty_content_processor_context, settings):
+        processor = QtiContentProcessor(cartridge, empty_content_processor_context)
+        resource = cartridge.define_resource("resource_4_qti")
+        expected_problems = list(processor._parse(resource))
+        settings.QTI_PARALLEL_MIN_ITEMS = min_items
+        settings.QTI_PARALLEL_CHUNK_SIZE = 2
+        process_pool = LazyProcessPool(2)
+        context = attrs.evolve(empty_content_processor_context, qti_process_pool=process_pool)
+        parallel_processor = QtiContentProcessor(cartridge, context)
+
+        try:
+            parsed_problems = list(parallel_processor._parse(resource))
+            parsed_problems_again = list(parallel_processor._parse(resource))
+        finally:
+            process_pool.shutdown()
+
+        assert parsed_problems == expected_problems
+        assert parsed_problems_again == expected_problems
+
+    def test_assessment_without_items_is_not_processed(self, cartridge, empty_content_processor_context):
+        processor = QtiContentProcessor(cartridge, empty_content_processor_context)
+        resource = cartridge.define_resource("resource_4_qti_no_items")
+
+        assert processor.process(resource, "resource_4_qti_no_items") is None
+
+
+class TestQtiProblemRendering:
+    """
+    Test the template based QTI problems rendering produces the expected OLX.
+    """
+
+    @pytest.mark.parametrize(
+        "problem_data,expected_olx",
+        [
+            (
+                {
+                    "ident": "mc0",
+                    "cc_profile": "cc.multiple_choice.v0p1",
+                    "problem_description": "&lt;p&gt;2 &amp;gt; 1?&lt;/p&gt;",
+                    "choices": OrderedDict(
+                        [("1", {"text": "Yes & no", "correct": True}), ("2", {"text": "", "correct": False})]
+                    ),
+                },
+                [
+                    '<problem><multiplechoiceresponse><p>2 &gt; 1?</p><choicegroup type="MultipleChoice">'
+                    '<choice correct="true">Yes &amp; no</choice><choice correct="false"></choice></choicegroup>'
+                    "</multiplechoiceresponse></problem>"
+                ],
+            ),
+            (
+                {
+                    "ident": "mr0",
+                    "cc_profile": "cc.multiple_response.v0p1",
+                    "problem_description": "<p>Pick</p>",
+                    "choices": OrderedDict(
+                        [("1", {"text": "A", "correct": True}), ("2", {"text": "B\r\nC", "correct": False})]
+                    ),
+                },
+                [
+                    '<problem><choiceresponse partial_credit="EDC"><p>Pick</p><checkboxgroup type="MultipleChoice">'
+                    '<choice correct="true">A</choice><choice correct="false">B\r\nC</choice></checkboxgroup>'
+                    "</choiceresponse></problem>"
+                ],
+            ),
+            (
+                {
+                    "ident": "fib0",
+                    "cc_profile": "cc.fib.v0p1",
+                    "problem_description": "<p>Capital?</p>",
+                    "is_regexp": True,
+                    "answer": 'Pa"ris',
+                    "additional_answers": ["par\nis"],
+                },
+                [
+                    '<problem><stringresponse answer="Pa&quot;ris" type="ci regexp"><p>Capital?</p>'
+                    '<additional_answer answer="par\nis"/><textline size="16"/></stringresponse></problem>'
+                ],
+            ),
+            (
+                {
+                    "ident": "essay0",
+                    "cc_profile": "cc.essay.v0p1",
+                    "problem_description": "Describe <b>it</b>",
+                    "general_fb": "Good & bad",
+                    "sample_solution": "<p>Solution</p>",
+                },
+                [
+                    "<html><![CDATA[<p>Solution</p>]]></html>",
+                    '<openassessment url_name="essay0" text_response="required" prompts_type="html">'
+                    "<title>Open Response Assessment</title><assessments>"
+                    '<assessment name="staff-assessment" required="True"/></assessments><prompts><prompt>'
+                    "<description>Describe &lt;b&gt;it&lt;/b&gt;</description></prompt></prompts><rubric>"
+                    '<criterion feedback="optional"><name>Feedback</name><label>Feedback</label>'
+                    '<prompt>Example Feedback</prompt><option points="0"><name>General</name><label>General</label>'
+                    '<explanation>Good &amp; bad</explanation></option><option points="0"><name>Correct</name>'
+                    '<label>Correct</label><explanation>Correct</explanation></option><option points="0">'
+                    "<name>Incorrect</name><label>Incorrect</label><explanation>Incorrect</explanation></option>"
+                    "</criterion><feedbackprompt>Feedback prompt text</feedbackprompt>"
+                    "<feedback_default_text>Feedback prompt default text</feedback_default_text></rubric>"
+                    "</openassessment>",
+                ],
+            ),
+            (
+                {"ident": "essay1", "cc_profile": "cc.essay.v0p1", "problem_description": None},
+                [
+                    '<openassessment url_name="essay1" text_response="required" prompts_type="html">'
+                    "<title>Open Response Assessment</title><assessments>"
+                    '<assessment name="staff-assessment" required="True"/></assessments><prompts><prompt>'
+                    '<description/></prompt></prompts><rubric><criterion feedback="optional"><name>Ideas</name>'
+                    '<label>Ideas</label><prompt>Example criterion</prompt><option points="0"><name>Poor</name>'
+                    '<label>Poor</label><explanation>Explanation</explanation></option><option points="1">'
+                    "<name>Good</name><label>Good</label><explanation>Explanation</explanation></option></criterion>"
+                    "<feedbackprompt>Feedback prompt text</feedbackprompt>"
+                    "<feedback_default_text>Feedback prompt default text</feedback_default_text></rubric>"
+                    "</openassessment>"
+                ],
+            ),
+        ],
+    )
+    def test_problem_olx_is_rendered(self, problem_data, expected_olx, empty_content_processor_context):
+        processor = QtiContentProcessor(None, empty_content_processor_context)
+
+        olx_nodes = processor._create_nodes([problem_data])
+
+        assert [olx_node.toxml() for olx_node in olx_nodes] == expected_olx
+        assert all(olx_node.parentNode is None for olx_node in olx_nodes)
+
+    @pytest.mark.parametrize("sample_solution", ["<p>A\r\nB\rC</p>", "<p>A\x01B\x1f</p>", "<p>A]]B &amp; <b>C</b></p>"])
+    def test_essay_sample_solution_is_kept_as_is(self, sample_solution, empty_content_processor_context):
+        processor = QtiContentProcessor(None, empty_content_processor_context)
+        problem_data = {
+            "ident": "essay0",
+            "cc_profile": "cc.essay.v0p1",
+            "problem_description": "Describe it",
+            "sample_solution": sample_solution,
+        }
+
+        sample_solution_node, _ = processor._create_nodes([problem_data])
+
+        assert sample_solution_node.firstChild.nodeType == sample_solution_node.CDATA_SECTION_NODE
+        assert sample_solution_node.firstChild.data == sample_solution
+        assert sample_solution_node.toxml() == f"<html><![CDATA[{sample_solution}]]></html>"
+
+    def test_xml_invalid_characters_are_removed(self, empty_content_processor_context):
+        processor = QtiContentProcessor(None, empty_content_processor_context)
+        problem_data = {
+            "ident": "fib0",
+            "cc_profile": "cc.fib.v0p1",
+            "problem_description": "<p>Capital?</p>",
+            "is_regexp": False,
+            "answer": "Pa\x00ris",
+            "additional_answers": ["par\x0bis\r"],
+        }
+
+        [olx_node] = processor._create_nodes([problem_data])
+
+        assert olx_node.toxml() == (
+            '<problem><stringresponse answer="Paris" type="ci"><p>Capital?</p>'
+            '<additional_answer answer="paris\r"/><textline size="17"/></stringresponse></problem>'
+        )
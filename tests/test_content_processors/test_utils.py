@@ -1,4 +1,6 @@
-from cc2olx.content_processors.utils import WebContentFile
+import xml.dom.minidom
+
+from cc2olx.content_processors.utils import WebContentFile, generate_default_ora_criteria, load_ora_rubric_criteria
 
 
 class TestWebContentFile:
@@ -30,3 +32,62 @@ class TestWebContentFile:
         web_content_file = WebContentFile(cartridge, resource["children"][0])
 
         assert web_content_file.is_from_web_resources_dir() is False
+
+
+class TestDefaultOraCriteria:
+    def test_default_criteria_are_loaded_from_rubric_library(self):
+        criteria = generate_default_ora_criteria()
+
+        assert [criterion.tagName for criterion in criteria] == ["criterion", "criterion"]
+        assert "<name>Ideas</name>" in criteria[0].toxml()
+        assert "<name>Content</name>" in criteria[1].toxml()
+
+    def test_default_criteria_are_independent(self):
+        criteria = generate_default_ora_criteria()
+        expected_names = [criterion.getElementsByTagName("name")[0].firstChild.data for criterion in criteria]
+
+        criteria[0].getElementsByTagName("name")[0].firstChild.data = "Changed"
+        new_criteria = generate_default_ora_criteria()
+
+        assert [criterion.getElementsByTagName("name")[0].firstChild.data for criterion in new_criteria] == (
+            expected_names
+        )
+        assert all(criterion.childNodes for criterion in new_criteria)
+
+    def test_default_criteria_match_parsed_rubric_library(self, settings):
+        document = xml.dom.minidom.parse(str(settings.ORA_RUBRIC_CRITERIA_PATH))
+        parsed_criteria = document.documentElement.getElementsByTagName("criterion")
+
+        assert [criterion.toprettyxml() for criterion in generate_default_ora_criteria()] == [
+            criterion.toprettyxml() for criterion in parsed_criteria
+        ]
+
+    def test_custom_rubric_library_is_used(self, settings, tmp_path):
+        rubric_criteria_path = tmp_path / "rubric.xml"
+        rubric_criteria_path.write_text(
+            '<criteria><criterion feedback="required"><name>Clarity</name></criterion></criteria>'
+        )
+        settings.ORA_RUBRIC_CRITERIA_PATH = rubric_criteria_path
+
+        criteria = generate_default_ora_criteria()
+
+        assert [criterion.toxml() for criterion in criteria] == [
+            '<criterion feedback="required"><name>Clarity</name></criterion>'
+        ]
+
+    def test_rubric_library_cdata_sections_and_comments_are_kept(self, settings, tmp_path):
+        rubric_criterion = (
+            "<criterion><!-- Clarity --><name>Clarity</name><prompt><![CDATA[<b>Clear</b>]]></prompt></criterion>"
+        )
+        rubric_criteria_path = tmp_path / "rubric.xml"
+        rubric_criteria_path.write_text(f"<criteria>{rubric_criterion}</criteria>")
+        settings.ORA_RUBRIC_CRITERIA_PATH = rubric_criteria_path
+
+        criteria = generate_default_ora_criteria()
+
+        assert [criterion.toxml() for criterion in criteria] == [rubric_criterion]
+
+    def test_rubric_library_is_parsed_once(self, settings):
+        assert load_ora_rubric_criteria(settings.ORA_RUBRIC_CRITERIA_PATH) is load_ora_rubric_criteria(
+            settings.ORA_RUBRIC_CRITERIA_PATH
+        )
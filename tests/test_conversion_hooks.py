@@ -0,0 +1,138 @@
+import logging
+import pstats
+from pathlib import Path
+
+import pytest
+
+from cc2olx.conversion_hooks import BaseConversionHook, ConversionHooks, CProfileHook, TracemallocHook
+from cc2olx.conversion_hooks.dispatcher import NO_HOOKS_CONTEXT
+from cc2olx.conversion_hooks.utils import create_conversion_hooks
+from cc2olx.main import convert_one_file
+
+
+class RecordingHook(BaseConversionHook):
+    """
+    Record the conversion events without the durations.
+    """
+
+    events = []
+
+    def on_conversion_start(self, input_file):
+        self.events.append(("conversion_start", input_file.name))
+
+    def on_conversion_end(self, input_file, succeeded, duration):
+        assert duration >= 0
+        self.events.append(("conversion_end", input_file.name, succeeded))
+
+    def on_stage_start(self, stage):
+        self.events.append(("stage_start", stage))
+
+    def on_stage_end(self, stage, duration):
+        assert duration >= 0
+        self.events.append(("stage_end", stage))
+
+    def on_content_processor_end(self, processor_name, idref, duration):
+        self.events.append(("content_processor_end", processor_name, idref))
+
+    def on_content_post_processor_end(self, processor_name, idref, duration):
+        self.events.append(("content_post_processor_end", processor_name, idref))
+
+
+@pytest.fixture
+def recording_hook():
+    RecordingHook.events = []
+    return RecordingHook()
+
+
+class TestConversionHooks:
+    def test_shared_context_is_used_without_hooks(self):
+        hooks = ConversionHooks([])
+
+        assert hooks.stage("extract") is NO_HOOKS_CONTEXT
+        assert hooks.content_processor_call("HtmlContentProcessor", "resource_1") is NO_HOOKS_CONTEXT
+
+    def test_hooks_are_notified(self, recording_hook, tmp_path):
+        hooks = ConversionHooks([recording_hook])
+
+        with hooks.conversion(tmp_path / "course.imscc"):
+            with hooks.stage("olx"):
+                with hooks.content_post_processor_call("StaticLinkPostProcessor", "resource_1"):
+                    pass
+
+        assert recording_hook.events == [
+            ("conversion_start", "course.imscc"),
+            ("stage_start", "olx"),
+            ("content_post_processor_end", "StaticLinkPostProcessor", "resource_1"),
+            ("stage_end", "olx"),
+            ("conversion_end", "course.imscc", True),
+        ]
+
+    def test_failed_conversion_is_reported(self, recording_hook, tmp_path):
+        hooks = ConversionHooks([recording_hook])
+
+        with pytest.raises(ValueError):
+            with hooks.conversion(tmp_path / "course.imscc"):
+                with hooks.stage("extract"):
+                    raise ValueError
+
+        assert recording_hook.events[-2:] == [("stage_end", "extract"), ("conversion_end", "course.imscc", False)]
+
+
+def test_hooks_are_loaded_from_settings(settings, options, imscc_file):
+    settings.CONVERSION_HOOKS = ["tests.test_conversion_hooks.RecordingHook"]
+    RecordingHook.events = []
+
+    convert_one_file(imscc_file, options["workspace"], options["link_file"])
+
+    events = RecordingHook.events
+    assert events[0] == ("conversion_start", imscc_file.name)
+    assert events[-1] == ("conversion_end", imscc_file.name, True)
+    assert [event[1] for event in events if event[0] == "stage_end"] == [
+        "extract",
+        "load_manifest",
+        "normalize",
+        "olx",
+        "policy",
+        "package",
+    ]
+    assert ("content_processor_end", "QtiContentProcessor", "resource_4_qti") in events
+    assert any(event[0] == "content_post_processor_end" for event in events)
+
+
+def test_cprofile_hook_writes_profile(settings, tmp_path):
+    settings.CPROFILE_HOOK_OUTPUT_DIR = tmp_path / "profiles"
+    hook = CProfileHook()
+
+    with ConversionHooks([hook]).conversion(tmp_path / "course.imscc"):
+        sorted(range(1000))
+
+    profile_stats = pstats.Stats(str(tmp_path / "profiles" / "course.prof"))
+    assert any(function_name == "<built-in method builtins.sorted>" for *_, function_name in profile_stats.stats)
+
+
+def test_cprofile_hook_keeps_output_subdirectories(settings, tmp_path):
+    settings.CPROFILE_HOOK_OUTPUT_DIR = tmp_path / "profiles"
+    settings.CONVERSION_HOOKS = ["cc2olx.conversion_hooks.CProfileHook"]
+
+    for year in ("2023", "2024"):
+        with create_conversion_hooks(output_path=Path(year) / "course").conversion(tmp_path / year / "course.imscc"):
+            sorted(range(1000))
+
+    assert sorted(path.relative_to(tmp_path / "profiles").as_posix() for path in tmp_path.rglob("*.prof")) == [
+        "2023/course.prof",
+        "2024/course.prof",
+    ]
+
+
+def test_tracemalloc_hook_reports_allocation_sites(settings, tmp_path, caplog):
+    settings.TRACEMALLOC_HOOK_TOP_SIZE = 1
+    hook = TracemallocHook()
+
+    with caplog.at_level(logging.INFO):
+        with ConversionHooks([hook]).conversion(tmp_path / "course.imscc"):
+            allocated = [str(number) for number in range(10000)]
+
+    [report] = caplog.messages
+    assert report.startswith("Top 1 allocation sites")
+    assert "test_conversion_hooks.py" in report
+    assert len(allocated) == 10000
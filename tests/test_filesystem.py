@@ -0,0 +1,161 @@
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from cc2olx.filesystem import (
+    add_in_directory,
+    add_in_tar_gz,
+    atomic_output_file,
+    copy_file,
+    iter_xml_elements,
+    unzip_directory,
+)
+from cc2olx.xml import cc_xml
+
+
+def test_iter_xml_elements_provides_elements_with_tag(tmp_path):
+    xml_path = tmp_path / "items.xml"
+    xml_path.write_text('<root xmlns="urn:test"><item n="1"><a/></item><other/><item n="2"/><item n="3"/></root>')
+
+    numbers = [element.get("n") for element in iter_xml_elements(xml_path, "{urn:test}item")]
+
+    assert numbers == ["1", "2", "3"]
+
+
+def test_iter_xml_elements_frees_processed_elements(tmp_path):
+    xml_path = tmp_path / "items.xml"
+    xml_path.write_text('<root xmlns="urn:test"><item n="1"><a/></item><item n="2"/><item n="3"/></root>')
+    elements = iter_xml_elements(xml_path, "{urn:test}item")
+
+    first_element = next(elements)
+    root = first_element.getparent()
+    next(elements)
+    next(elements)
+
+    assert len(first_element) == 0
+    assert "1" not in [element.get("n") for element in root]
+
+
+def test_iter_xml_elements_uses_common_cartridge_element_classes(tmp_path):
+    xml_path = tmp_path / "qti.xml"
+    xml_path.write_text(
+        f'<questestinterop xmlns="{cc_xml.QTI_NAMESPACE}"><section><item ident="1"/></section></questestinterop>'
+    )
+
+    elements = list(iter_xml_elements(xml_path, f"{{{cc_xml.QTI_NAMESPACE}}}item"))
+
+    assert [type(element) for element in elements] == [cc_xml.QtiItem]
+
+
+def test_atomic_output_file_is_renamed_on_success(tmp_path):
+    output_file = tmp_path / "course.tar.gz"
+
+    with atomic_output_file(output_file) as temp_path:
+        with open(temp_path, "w") as temp_file:
+            temp_file.write("content")
+        assert not output_file.exists()
+
+    assert output_file.read_text() == "content"
+    assert list(tmp_path.iterdir()) == [output_file]
+
+
+def test_atomic_output_file_is_removed_on_failure(tmp_path):
+    output_file = tmp_path / "course.tar.gz"
+    output_file.write_text("previous")
+
+    with pytest.raises(RuntimeError):
+        with atomic_output_file(output_file) as temp_path:
+            with open(temp_path, "w") as temp_file:
+                temp_file.write("partial")
+            raise RuntimeError
+
+    assert output_file.read_text() == "previous"
+    assert list(tmp_path.iterdir()) == [output_file]
+
+
+def test_unzip_directory_skips_members(tmp_path):
+    cartridge_file = tmp_path / "course.imscc"
+    with zipfile.ZipFile(cartridge_file, "w") as cartridge_zip:
+        cartridge_zip.writestr("course.xml", "<course/>")
+        cartridge_zip.writestr("media/video.mp4", "video")
+
+    directory = unzip_directory(cartridge_file, skip_member=lambda info: info.filename.endswith(".mp4"))
+
+    assert (directory / "course.xml").read_text() == "<course/>"
+    assert (directory / "media").is_dir()
+    assert not (directory / "media" / "video.mp4").exists()
+
+
+def test_add_in_tar_gz_streams_zip_members(tmp_path):
+    (tmp_path / "course.xml").write_text("<course/>")
+    with zipfile.ZipFile(tmp_path / "course.imscc", "w") as cartridge_zip:
+        cartridge_zip.writestr("web_resources/video.mp4", "video")
+    archive_file = tmp_path / "course.tar.gz"
+
+    with zipfile.ZipFile(tmp_path / "course.imscc") as cartridge_zip:
+        zip_members = [(cartridge_zip, cartridge_zip.getinfo("web_resources/video.mp4"), "static/video.mp4")]
+        add_in_tar_gz(str(archive_file), [(str(tmp_path / "course.xml"), "course.xml")], zip_members)
+
+    with tarfile.open(archive_file) as archive:
+        assert archive.getnames() == ["course.xml", "static/video.mp4"]
+        assert archive.extractfile("static/video.mp4").read() == b"video"
+
+
+def test_copy_file_copies_content_and_metadata(tmp_path):
+    src = tmp_path / "video.mp4"
+    src.write_bytes(os.urandom(1024 * 1024))
+    src.chmod(0o640)
+    dst = tmp_path / "copy.mp4"
+
+    assert copy_file(src, dst) == dst
+
+    assert dst.read_bytes() == src.read_bytes()
+    assert dst.stat().st_mode == src.stat().st_mode
+    assert dst.stat().st_mtime == src.stat().st_mtime
+
+
+def test_copy_file_falls_back_on_short_copy(mocker, tmp_path):
+    src = tmp_path / "video.mp4"
+    src.write_bytes(os.urandom(1024 * 1024))
+    dst = tmp_path / "copy.mp4"
+    mocker.patch("os.copy_file_range", return_value=0, create=True)
+
+    copy_file(src, dst)
+
+    assert dst.read_bytes() == src.read_bytes()
+
+
+def test_add_in_directory_links_files(tmp_path):
+    (tmp_path / "course.xml").write_text("<course/>")
+    (tmp_path / "web_resources" / "images").mkdir(parents=True)
+    (tmp_path / "web_resources" / "images" / "image.png").write_bytes(b"image")
+    with zipfile.ZipFile(tmp_path / "course.imscc", "w") as cartridge_zip:
+        cartridge_zip.writestr("web_resources/video.mp4", "video")
+    olx_directory = tmp_path / "output" / "course"
+    olx_directory.mkdir(parents=True)
+    (olx_directory / "previous.xml").write_text("<course/>")
+
+    with zipfile.ZipFile(tmp_path / "course.imscc") as cartridge_zip:
+        total_size = add_in_directory(
+            olx_directory,
+            [
+                (str(tmp_path / "course.xml"), "course.xml"),
+                (str(tmp_path / "web_resources"), "/static/"),
+                (str(tmp_path / "missing.pdf"), "/static/missing.pdf"),
+            ],
+            [(cartridge_zip, cartridge_zip.getinfo("web_resources/video.mp4"), "static/video.mp4")],
+        )
+
+    assert total_size == 19
+    assert sorted(str(path.relative_to(olx_directory)) for path in olx_directory.rglob("*") if path.is_file()) == [
+        "course.xml",
+        "static/images/image.png",
+        "static/video.mp4",
+    ]
+    assert (olx_directory / "static" / "images" / "image.png").samefile(
+        tmp_path / "web_resources" / "images" / "image.png"
+    )
+    assert (olx_directory / "static" / "video.mp4").read_bytes() == b"video"
+    assert [path.name for path in olx_directory.parent.iterdir()] == ["course"]
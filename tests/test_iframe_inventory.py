@@ -0,0 +1,125 @@
+import io
+import json
+import shutil
+
+from cc2olx.checkpoint import hash_file
+from cc2olx.iframe_inventory import (
+    find_iframe_inventory,
+    find_iframe_srcs,
+    InventoryIframe,
+    normalize_video_url,
+    read_iframe_inventories,
+    scan_cartridge,
+)
+from cc2olx.iframe_link_parser import KalturaIframeLinkParser
+
+KALTURA_VIDEO_URL = (
+    "https://cdnapisec.kaltura.com/p/2019031/sp/201903100/playManifest/entryId/1_zeqnrfgw/format/url/protocol/https"
+)
+
+
+def test_scan_cartridge(imscc_file):
+    inventory = scan_cartridge(imscc_file, workers=2)
+
+    assert inventory.cartridge == str(imscc_file.resolve())
+    assert inventory.cartridge_size == imscc_file.stat().st_size
+    assert inventory.cartridge_sha256 == hash_file(imscc_file)
+    assert [iframe.url for iframe in inventory.get_resource_iframes("resource_5_video")] == [KALTURA_VIDEO_URL]
+    assert inventory.get_resource_iframes("resource_3_vertical") == []
+    assert inventory.get_resource_iframes("resource_2_lti") is None
+    assert [iframe.url for iframe in inventory.iter_video_iframes()] == [KALTURA_VIDEO_URL, KALTURA_VIDEO_URL]
+
+
+def test_scan_html_file(fixtures_data_dir):
+    html_file = fixtures_data_dir / "imscc_files" / "main" / "iframe.html"
+
+    inventory = scan_cartridge(html_file)
+
+    assert [html_file.file for html_file in inventory.html_files] == [str(html_file)]
+    assert [iframe.url for iframe in inventory.iter_video_iframes()] == [KALTURA_VIDEO_URL]
+
+
+def test_inventory_is_read_back(imscc_file):
+    inventory = scan_cartridge(imscc_file)
+    other_inventory = scan_cartridge(imscc_file)
+    other_inventory.cartridge = "other.imscc"
+    inventory_output = io.StringIO()
+
+    inventory.write(inventory_output)
+    other_inventory.write(inventory_output)
+    inventories = read_iframe_inventories(io.StringIO(inventory_output.getvalue()))
+
+    assert inventories == {inventory.key: inventory, other_inventory.key: other_inventory}
+    assert inventories[inventory.key].get_resource_iframes("resource_5_video") == inventory.get_resource_iframes(
+        "resource_5_video"
+    )
+
+
+def test_inventory_is_found_for_the_same_cartridge_only(imscc_file, tmp_path):
+    cartridge_file = tmp_path / "first" / imscc_file.name
+    same_named_file = tmp_path / "second" / imscc_file.name
+    for path in (cartridge_file, same_named_file):
+        path.parent.mkdir()
+        shutil.copyfile(imscc_file, path)
+    inventory = scan_cartridge(cartridge_file)
+    inventories = {inventory.key: inventory}
+
+    assert find_iframe_inventory(inventories, cartridge_file) is inventory
+    assert find_iframe_inventory(inventories, same_named_file) is None
+
+    with open(cartridge_file, "ab") as cartridge_output:
+        cartridge_output.write(b"\0")
+
+    assert find_iframe_inventory(inventories, cartridge_file) is None
+
+
+def test_inventory_without_cartridge_hash_is_ignored(imscc_file):
+    inventory_line = json.dumps({"cartridge": str(imscc_file.resolve()), "file": "a.html", "iframes": []})
+
+    inventories = read_iframe_inventories([inventory_line])
+
+    assert find_iframe_inventory(inventories, imscc_file) is None
+
+
+def test_inventory_iframe_from_src():
+    youtube_iframe = InventoryIframe.from_src("https://www.youtube.com/embed/1234?rel=0")
+    playlist_iframe = InventoryIframe.from_src("https://cdnapisec.kaltura.com/p/1/playlist")
+
+    assert youtube_iframe.url == "https://www.youtube.com/watch?v=1234"
+    assert playlist_iframe.url == ""
+    assert normalize_video_url(youtube_iframe.url) == youtube_iframe.url
+
+
+def test_link_parser_uses_inventory(imscc_file, link_map_csv, iframe_content):
+    inventory = scan_cartridge(imscc_file)
+    iframe_link_parser = KalturaIframeLinkParser(link_map_csv, inventory)
+
+    assert iframe_link_parser.needs_html_parsing(iframe_content, "resource_5_video") is True
+    # The inventory is trusted for the scanned resources, the pre-scan is used for the others.
+    assert iframe_link_parser.needs_html_parsing(iframe_content, "resource_3_vertical") is False
+    assert iframe_link_parser.needs_html_parsing(iframe_content, "resource_2_lti") is True
+    assert iframe_link_parser.needs_html_parsing(iframe_content) is True
+
+
+def test_link_parser_skips_videos_missing_in_link_file(imscc_file, link_map_csv, iframe_content):
+    inventory = scan_cartridge(imscc_file)
+    iframe_link_parser = KalturaIframeLinkParser(link_map_csv, inventory)
+    iframe_link_parser.link_map = {}
+
+    assert iframe_link_parser.needs_html_parsing(iframe_content, "resource_5_video") is False
+
+
+def test_iframe_srcs_are_found():
+    content = (
+        b'<p><IFRAME src="https://www.youtube.com/embed/1234?rel=0"></IFRAME></p>'
+        b'<iframe src="https://example.com/embed"></iframe>'
+    )
+
+    assert find_iframe_srcs(content) == ["https://www.youtube.com/embed/1234?rel=0", "https://example.com/embed"]
+
+
+def test_content_without_iframes_is_not_parsed(mocker):
+    fromstring_mock = mocker.patch("cc2olx.iframe_inventory.lxml.html.fromstring")
+
+    assert find_iframe_srcs(b"<html><body><p>No videos</p></body></html>") == []
+    fromstring_mock.assert_not_called()
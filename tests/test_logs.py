@@ -0,0 +1,88 @@
+import logging
+import logging.handlers
+
+import pytest
+
+from cc2olx.logs import DETAILS_LOGGER_NAME, LoggingSetup, LogSummary, details_logger
+
+
+@pytest.fixture
+def root_logger_level():
+    root_logger = logging.getLogger()
+    level = root_logger.level
+    yield
+    root_logger.setLevel(level)
+
+
+class TestDetailsLogger:
+    def test_messages_are_logged_without_summary(self, caplog):
+        with caplog.at_level(logging.INFO):
+            details_logger.info("Loading file %s", "imsmanifest.xml")
+
+        assert caplog.messages == ["Loading file imsmanifest.xml"]
+        assert caplog.records[0].name == DETAILS_LOGGER_NAME
+        assert caplog.records[0].filename == "test_logs.py"
+
+    def test_messages_are_counted_instead_of_logged(self, caplog):
+        summary = LogSummary()
+        details_logger.summary = summary
+
+        try:
+            with caplog.at_level(logging.INFO):
+                for index in range(3):
+                    details_logger.info("Loading file %s", f"file_{index}.xml")
+                details_logger.warning("Unsupported element %s", "extension")
+                details_logger.debug("Disabled by level")
+                assert caplog.messages == []
+
+                summary.log()
+        finally:
+            details_logger.summary = None
+
+        assert caplog.messages == [
+            "3 x 'Loading file %s', e.g. 'Loading file file_0.xml'",
+            "1 x 'Unsupported element %s', e.g. 'Unsupported element extension'",
+        ]
+        assert summary.counts == {}
+
+
+class TestLogSummary:
+    def test_worker_summary_is_merged(self):
+        summary = LogSummary()
+        summary.add(logging.INFO, "Loading file %s", ("a.xml",))
+        worker_summary = LogSummary()
+        worker_summary.add(logging.INFO, "Loading file %s", ("b.xml",))
+        worker_summary.add(logging.WARNING, "Unsupported element %s", ("extension",))
+
+        summary.merge(worker_summary)
+
+        assert summary.counts == {
+            (logging.INFO, "Loading file %s"): 2,
+            (logging.WARNING, "Unsupported element %s"): 1,
+        }
+        assert summary.examples[(logging.INFO, "Loading file %s")] == "Loading file a.xml"
+        assert summary.examples[(logging.WARNING, "Unsupported element %s")] == "Unsupported element extension"
+
+
+class TestLoggingSetup:
+    def test_logs_are_written_to_file(self, tmp_path, root_logger_level):
+        log_file = tmp_path / "conversion.log"
+        logging_setup = LoggingSetup("INFO", log_file)
+
+        logging.getLogger().info("Converted %s", "course.imscc")
+        logging_setup.shutdown()
+
+        assert log_file.read_text().endswith("- Converted course.imscc\n")
+        assert not any(isinstance(handler, logging.handlers.QueueHandler) for handler in logging.getLogger().handlers)
+
+    def test_summary_is_logged_on_shutdown(self, tmp_path, root_logger_level):
+        log_file = tmp_path / "conversion.log"
+        logging_setup = LoggingSetup("INFO", log_file, summary=True)
+
+        for _ in range(5):
+            details_logger.info("Loading file %s", "imsmanifest.xml")
+        logging_setup.shutdown()
+
+        [summary_line] = log_file.read_text().splitlines()
+        assert summary_line.endswith("- 5 x 'Loading file %s', e.g. 'Loading file imsmanifest.xml'")
+        assert details_logger.summary is None
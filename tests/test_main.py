@@ -1,8 +1,16 @@
+import json
+import logging
+import shutil
 import tarfile
 
-from cc2olx.cli import RESULT_TYPE_ZIP
+import pytest
+
+import cc2olx.main
+from cc2olx.cli import parse_args, RESULT_TYPE_OLX, RESULT_TYPE_TGZ, RESULT_TYPE_ZIP
+from cc2olx.iframe_inventory import scan_cartridge
 from cc2olx.main import convert_one_file, main
-from .utils import format_xml
+from cc2olx.parser import parse_options
+from .utils import format_xml, zip_imscc_dir
 
 
 def test_convert_one_file(options, imscc_file, studio_course_xml):
@@ -67,3 +75,409 @@ def test_main_zip_output(mocker, options):
     main()
 
     assert options["workspace"].with_suffix(".zip").exists()
+
+
+def test_main_tgz_output(mocker, imscc_file, options, tmp_path):
+    """
+    Tests, that ``--result tgz`` cli option writes only the cartridge archives to the output folder.
+    """
+
+    options["output_format"] = RESULT_TYPE_TGZ
+    options["result_index"] = tmp_path / "index.jsonl"
+    workspace = options["workspace"]
+    mocker.patch("cc2olx.main.parse_args")
+    mocker.patch("cc2olx.main.parse_options", return_value=options)
+    convert_one_file_spy = mocker.spy(cc2olx.main, "convert_one_file")
+
+    main()
+
+    tgz_filename = (workspace / imscc_file.stem).with_suffix(".tar.gz")
+    assert list(workspace.iterdir()) == [tgz_filename]
+    assert convert_one_file_spy.call_args.args[10] == workspace
+    assert json.loads(options["result_index"].read_text())["output_file"] == tgz_filename.name
+    with tarfile.open(tgz_filename, "r:gz") as tgz:
+        assert "course.xml" in tgz.getnames()
+
+
+def test_main_same_named_cartridges_in_subdirectories(mocker, imscc_file, tmp_path):
+    """
+    Tests, that the same-named cartridges of the input subdirectories are written to the output subdirectories.
+    """
+
+    for subdirectory in ("a", "b"):
+        (tmp_path / "in" / subdirectory).mkdir(parents=True)
+        shutil.copyfile(imscc_file, tmp_path / "in" / subdirectory / "course.imscc")
+    workspace = tmp_path / "out"
+    result_index = tmp_path / "index.jsonl"
+    options = parse_options(
+        parse_args(
+            [
+                "-i",
+                str(tmp_path / "in"),
+                "-r",
+                RESULT_TYPE_TGZ,
+                "-o",
+                str(workspace),
+                "--result-index",
+                str(result_index),
+            ]
+        )
+    )
+    mocker.patch("cc2olx.main.parse_args")
+    mocker.patch("cc2olx.main.parse_options", return_value=options)
+
+    main()
+
+    assert sorted(path.relative_to(workspace).as_posix() for path in workspace.rglob("*.tar.gz")) == [
+        "a/course.tar.gz",
+        "b/course.tar.gz",
+    ]
+    assert sorted(json.loads(line)["output_file"] for line in result_index.read_text().splitlines()) == [
+        "a/course.tar.gz",
+        "b/course.tar.gz",
+    ]
+
+
+def test_main_same_named_cartridges_do_not_overwrite_each_other(mocker, imscc_file, options, tmp_path):
+    """
+    Tests, that the cartridge having the output path of another cartridge isn't converted.
+    """
+
+    for name in ("a/course.imscc", "b/course.imscc", "a/course.v2.imscc"):
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        shutil.copyfile(imscc_file, tmp_path / name)
+    options["input_files"] = [tmp_path / "a/course.imscc", tmp_path / "b/course.imscc", tmp_path / "a/course.v2.imscc"]
+    options["output_format"] = RESULT_TYPE_TGZ
+    options["result_index"] = tmp_path / "index.jsonl"
+    mocker.patch("cc2olx.main.parse_args")
+    mocker.patch("cc2olx.main.parse_options", return_value=options)
+    convert_one_file_spy = mocker.spy(cc2olx.main, "convert_one_file")
+
+    main()
+
+    assert [call.args[0] for call in convert_one_file_spy.call_args_list] == [
+        tmp_path / "a/course.imscc",
+        tmp_path / "a/course.v2.imscc",
+    ]
+    assert sorted(path.name for path in options["workspace"].glob("*.tar.gz")) == ["course.tar.gz", "course.v2.tar.gz"]
+    index = [json.loads(line) for line in options["result_index"].read_text().splitlines()]
+    assert [(entry["succeeded"], entry["output_file"]) for entry in index] == [
+        (True, "course.tar.gz"),
+        (False, None),
+        (True, "course.v2.tar.gz"),
+    ]
+
+
+def test_main_resume_does_not_overwrite_previous_run_output(mocker, imscc_file, options, tmp_path):
+    """
+    Tests, that the output of the cartridge converted by the previous run isn't replaced by another cartridge.
+    """
+
+    for name in ("a/course.imscc", "b/course.imscc"):
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        shutil.copyfile(imscc_file, tmp_path / name)
+    options["output_format"] = RESULT_TYPE_TGZ
+    options["checkpoint_file"] = tmp_path / "checkpoint.jsonl"
+    mocker.patch("cc2olx.main.parse_args")
+    mocker.patch("cc2olx.main.parse_options", return_value=options)
+
+    options["input_files"] = [tmp_path / "a/course.imscc"]
+    main()
+    output_file = options["workspace"] / "course.tar.gz"
+    output_mtime = output_file.stat().st_mtime_ns
+    convert_one_file_spy = mocker.spy(cc2olx.main, "convert_one_file")
+    options["input_files"] = [tmp_path / "b/course.imscc"]
+    options["resume"] = True
+    main()
+
+    convert_one_file_spy.assert_not_called()
+    assert output_file.stat().st_mtime_ns == output_mtime
+    [entry] = [json.loads(line) for line in options["checkpoint_file"].read_text().splitlines()]
+    assert entry["input_file"] == str(tmp_path / "a/course.imscc")
+
+
+def test_main_olx_output(mocker, imscc_file, options):
+    """
+    Tests, that ``--result olx`` cli option writes the OLX course directory with the same content as the archive.
+    """
+
+    mocker.patch("cc2olx.main.parse_args")
+    mocker.patch("cc2olx.main.parse_options", return_value=options)
+    options["output_format"] = RESULT_TYPE_TGZ
+    options["input_files"] = [imscc_file]
+    main()
+    with tarfile.open((options["workspace"] / imscc_file.stem).with_suffix(".tar.gz"), "r:gz") as tgz:
+        archived_files = {member.name: tgz.extractfile(member).read() for member in tgz.getmembers() if member.isfile()}
+
+    options["output_format"] = RESULT_TYPE_OLX
+    options["input_files"] = [imscc_file]
+    main()
+
+    olx_directory = options["workspace"] / imscc_file.stem
+    olx_files = {
+        str(path.relative_to(olx_directory)): path.read_bytes() for path in olx_directory.rglob("*") if path.is_file()
+    }
+    assert olx_files == archived_files
+    assert sorted(path.name for path in options["workspace"].iterdir()) == [
+        imscc_file.stem,
+        imscc_file.stem + ".tar.gz",
+    ]
+
+
+def test_main_resume(mocker, imscc_file, options, tmp_path):
+    """
+    Tests, that ``--resume`` cli option skips the cartridges converted by the previous run.
+    """
+
+    options["output_format"] = RESULT_TYPE_TGZ
+    options["checkpoint_file"] = tmp_path / "checkpoint.jsonl"
+    options["stats_file"] = tmp_path / "stats.json"
+    mocker.patch("cc2olx.main.parse_args")
+    mocker.patch("cc2olx.main.parse_options", return_value=options)
+    convert_one_file_spy = mocker.spy(cc2olx.main, "convert_one_file")
+
+    options["input_files"] = [imscc_file]
+    main()
+    options["input_files"] = [imscc_file]
+    options["resume"] = True
+    main()
+
+    assert convert_one_file_spy.call_count == 1
+    [entry] = [json.loads(line) for line in options["checkpoint_file"].read_text().splitlines()]
+    assert entry["output_file"] == imscc_file.stem + ".tar.gz"
+    [cartridge_stats] = json.loads(options["stats_file"].read_text())["cartridges"]
+    assert cartridge_stats["resumed"] is True
+    assert cartridge_stats["output_size"] == entry["output_size"]
+
+
+def test_main_fail_fast(mocker, imscc_file, options, tmp_path):
+    """
+    Tests, that ``--fail-fast`` cli option stops the batch at the first failed cartridge.
+    """
+
+    broken_file = tmp_path / "broken.imscc"
+    broken_file.write_text("not a zip")
+    options["input_files"] = [broken_file, imscc_file]
+    options["fail_fast"] = True
+    mocker.patch("cc2olx.main.parse_args")
+    mocker.patch("cc2olx.main.parse_options", return_value=options)
+    convert_one_file_spy = mocker.spy(cc2olx.main, "convert_one_file")
+
+    assert main() == 1
+
+    assert convert_one_file_spy.call_count == 1
+
+
+@pytest.mark.parametrize("log_summary", [False, True])
+def test_main_qti_workers_log_to_file(mocker, options, fixtures_data_dir, tmp_path, settings, log_summary):
+    """
+    Tests, that the details logger messages of the QTI worker processes get to the log file.
+    """
+
+    cartridge_dir = tmp_path / "cartridge"
+    shutil.copytree(fixtures_data_dir / "imscc_files" / "main", cartridge_dir)
+    assessment_file = cartridge_dir / "resource_4_qti" / "assessment_qti.xml"
+    assessment_file.write_text(assessment_file.read_text().replace("cc.essay.v0p1", "cc.pattern_match.v0p1"))
+    imscc_file = tmp_path / "course.imscc"
+    zip_imscc_dir(cartridge_dir, imscc_file)
+    log_file = tmp_path / "conversion.log"
+    settings.QTI_PARALLEL_MIN_ITEMS = 0
+    settings.QTI_PARALLEL_CHUNK_SIZE = 1
+    options.update(input_files=[imscc_file], log_file=log_file, log_summary=log_summary, qti_workers=2)
+    mocker.patch("cc2olx.main.parse_args")
+    mocker.patch("cc2olx.main.parse_options", return_value=options)
+
+    root_logger_level = logging.getLogger().level
+    try:
+        main()
+    finally:
+        logging.getLogger().setLevel(root_logger_level)
+
+    log = log_file.read_text()
+    if log_summary:
+        assert "2 x \"Problem with ID %s can't be converted." in log
+    else:
+        assert log.count("can't be converted.\n    Profile cc.pattern_match.v0p1 is not supported.") == 2
+
+
+def test_main_stats_file(mocker, imscc_file, options, tmp_path):
+    """
+    Tests, that ``--stats-file`` cli option results in the conversion statistics JSON file.
+    """
+
+    options["stats_file"] = tmp_path / "stats.json"
+
+    mocker.patch("cc2olx.main.parse_args")
+    mocker.patch("cc2olx.main.parse_options", return_value=options)
+
+    main()
+
+    stats = json.loads(options["stats_file"].read_text())
+    [cartridge_stats] = stats["cartridges"]
+    assert cartridge_stats["input_file"] == str(imscc_file)
+    assert cartridge_stats["succeeded"] is True
+    assert list(cartridge_stats["stages"]) == ["extract", "load_manifest", "normalize", "olx", "policy", "package"]
+    assert set(cartridge_stats["stages"]["olx"]) == {
+        "wall_time",
+        "cpu_time",
+        "peak_rss",
+        "bytes_read",
+        "bytes_written",
+    }
+    assert cartridge_stats["content_processors"]["QtiContentProcessor"]["processed"] == 1
+    assert cartridge_stats["content_post_processors"]["StaticLinkPostProcessor"]["calls"] > 0
+
+
+def test_main_resources_csv(mocker, imscc_file, options, tmp_path):
+    """
+    Tests, that ``--resources-csv`` cli option results in the resources statistics CSV file.
+    """
+
+    options["resources_csv"] = tmp_path / "resources.csv"
+
+    mocker.patch("cc2olx.main.parse_args")
+    mocker.patch("cc2olx.main.parse_options", return_value=options)
+
+    main()
+
+    header, *rows = options["resources_csv"].read_text().splitlines()
+    assert header == "input_file,identifierref,type,time,input_size,output_size"
+    assert rows
+    assert all(row.startswith(str(imscc_file)) for row in rows)
+
+
+def test_main_iframe_inventory(mocker, imscc_file, options, tmp_path):
+    """
+    Tests, that the cartridge inventory from ``--iframe-inventory`` cli option is passed to its conversion.
+    """
+
+    options["iframe_inventory"] = tmp_path / "inventory.jsonl"
+    with open(options["iframe_inventory"], "w", encoding="utf-8") as inventory_output:
+        scan_cartridge(imscc_file).write(inventory_output)
+
+    mocker.patch("cc2olx.main.parse_args")
+    mocker.patch("cc2olx.main.parse_options", return_value=options)
+    convert_one_file_spy = mocker.spy(cc2olx.main, "convert_one_file")
+
+    main()
+
+    iframe_inventory = convert_one_file_spy.call_args.args[9]
+    assert iframe_inventory.cartridge == str(imscc_file.resolve())
+    assert iframe_inventory.get_resource_iframes("resource_5_video")
+
+
+def test_main_ignores_stale_iframe_inventory(mocker, imscc_file, options, tmp_path):
+    """
+    Tests, that the inventory of a changed cartridge isn't passed to its conversion.
+    """
+
+    options["iframe_inventory"] = tmp_path / "inventory.jsonl"
+    inventory = scan_cartridge(imscc_file)
+    inventory.cartridge_sha256 = "0" * 64
+    with open(options["iframe_inventory"], "w", encoding="utf-8") as inventory_output:
+        inventory.write(inventory_output)
+
+    mocker.patch("cc2olx.main.parse_args")
+    mocker.patch("cc2olx.main.parse_options", return_value=options)
+    convert_one_file_spy = mocker.spy(cc2olx.main, "convert_one_file")
+
+    main()
+
+    assert convert_one_file_spy.call_args.args[9] is None
+
+
+def test_main_progress_file(mocker, imscc_file, options, tmp_path):
+    """
+    Tests, that ``--progress-file`` cli option results in the progress events JSON lines file.
+    """
+
+    options["progress_file"] = tmp_path / "progress.jsonl"
+
+    mocker.patch("cc2olx.main.parse_args")
+    mocker.patch("cc2olx.main.parse_options", return_value=options)
+
+    main()
+
+    events = [json.loads(line) for line in options["progress_file"].read_text().splitlines()]
+    assert events[0]["event"] == "batch_started"
+    assert events[1]["event"] == "cartridge_started"
+    resources_events = [event for event in events if event["event"] == "resources_processed"]
+    assert resources_events[-1]["processed"] == resources_events[-1]["total"] > 0
+    assert events[-2]["event"] == "cartridge_finished"
+    assert (
+        events[-2]["bytes_packaged"] == (options["workspace"] / imscc_file.stem).with_suffix(".tar.gz").stat().st_size
+    )
+    assert events[-1]["event"] == "batch_finished"
+
+
+def test_main_analyze_command(mocker, imscc_file, tmp_path):
+    """
+    Tests, that ``analyze`` command analyzes the cartridges instead of their conversion.
+    """
+
+    report_file = tmp_path / "report.jsonl"
+    mocker.patch("sys.argv", ["cc2olx", "analyze", "-i", str(imscc_file), "--report-file", str(report_file)])
+    parse_args_mock = mocker.patch("cc2olx.main.parse_args")
+
+    assert main() == 0
+
+    parse_args_mock.assert_not_called()
+    assert json.loads(report_file.read_text())["input_file"] == str(imscc_file)
+
+
+def test_main_plan_command(mocker, imscc_file, tmp_path):
+    """
+    Tests, that ``plan`` command writes the shard plan instead of the conversion.
+    """
+
+    plan_file = tmp_path / "plan.json"
+    mocker.patch("sys.argv", ["cc2olx", "plan", "-i", str(imscc_file), "-n", "2", "--plan-file", str(plan_file)])
+    parse_args_mock = mocker.patch("cc2olx.main.parse_args")
+
+    assert main() == 0
+
+    parse_args_mock.assert_not_called()
+    plan = json.loads(plan_file.read_text())
+    assert plan["shards"] == 2
+    assert [cartridge["shard"] for cartridge in plan["cartridges"]] == [1]
+
+
+def test_main_run_shard(mocker, imscc_file, tmp_path):
+    """
+    Tests, that ``run`` command converts the cartridges of the planned shard and writes the result index.
+    """
+
+    plan_file = tmp_path / "plan.json"
+    result_index_file = tmp_path / "index.jsonl"
+    output = tmp_path / "output"
+    mocker.patch("sys.argv", ["cc2olx", "plan", "-i", str(imscc_file), "-n", "2", "--plan-file", str(plan_file)])
+    main()
+
+    for shard in ("1/2", "2/2"):
+        mocker.patch(
+            "sys.argv",
+            ["cc2olx", "run", "--shard", shard, "--plan-file", str(plan_file), "--result-index", str(result_index_file)]
+            + ["-o", str(output), "-r", "folder"],
+        )
+        assert main() == 0
+
+        entries = [json.loads(line) for line in result_index_file.read_text().splitlines()]
+        assert [entry["shard"] for entry in entries] == (["1/2"] if shard == "1/2" else [])
+
+    mocker.patch("sys.argv", ["cc2olx", "run", "--shard", "1/2", "--plan-file", str(plan_file), "-o", str(output)])
+    main()
+    assert (output / imscc_file.stem).with_suffix(".tar.gz").exists()
+
+
+def test_main_run_shard_count_mismatch(mocker, imscc_file, tmp_path):
+    """
+    Tests, that the shard count must match the plan.
+    """
+
+    plan_file = tmp_path / "plan.json"
+    mocker.patch("sys.argv", ["cc2olx", "plan", "-i", str(imscc_file), "-n", "2", "--plan-file", str(plan_file)])
+    main()
+
+    mocker.patch("sys.argv", ["cc2olx", "run", "--shard", "1/3", "--plan-file", str(plan_file)])
+
+    assert main() == 1
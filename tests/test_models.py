@@ -40,6 +40,24 @@ def test_load_manifest_extracted(imscc_file, options, temp_workspace_path):
     assert isinstance(cartridge.resources[0]["children"][0], ResourceFile)
 
 
+def test_stored_static_files_are_streamed(imscc_file, options):
+    """
+    Tests, that only the stored static files which are the resource files are extracted.
+    """
+
+    cartridge = Cartridge(imscc_file, options["workspace"], stream_static_files=True)
+    cartridge.load_manifest_extracted()
+
+    assert list(cartridge.iter_streamed_static_members()) == [
+        (cartridge.cartridge.getinfo("web_resources/QuizImages/fractal.jpg"), "QuizImages/fractal.jpg")
+    ]
+    assert not (cartridge.directory / "web_resources" / "QuizImages" / "fractal.jpg").exists()
+    assert (cartridge.directory / "web_resources" / "QuizImages").is_dir()
+    assert (cartridge.directory / "web_resources" / "elearning.png").read_bytes() == cartridge.cartridge.read(
+        "web_resources/elearning.png"
+    )
+
+
 def test_cartridge_normalize(imscc_file, options):
     cartridge = Cartridge(imscc_file, options["workspace"])
     cartridge.load_manifest_extracted()
@@ -2,8 +2,12 @@ import json
 import xml.dom.minidom
 from unittest.mock import Mock
 
+import pytest
+
 from cc2olx import olx
-from .utils import format_xml
+from cc2olx.iframe_inventory import scan_cartridge
+from cc2olx.spill import SpilledElement
+from .utils import canonicalize_xml, format_xml, inline_exploded_olx
 
 
 def test_olx_export_xml(
@@ -23,6 +27,108 @@ def test_olx_export_xml(
     assert format_xml(xml) == format_xml(studio_course_xml)
 
 
+def test_spilled_olx_is_the_same(cartridge, link_map_csv, settings):
+    settings.SPILL_PAYLOAD_MIN_SIZE = 1
+    expected_xml = olx.OlxExport(cartridge, link_map_csv).xml()
+    # The zero budget is always exceeded, so every chapter and HTML payload is spilled.
+    olx_export = olx.OlxExport(cartridge, link_map_csv, memory_budget=0)
+
+    xml = olx_export.xml()
+
+    assert xml == expected_xml
+    assert all(isinstance(chapter, SpilledElement) for chapter in olx_export.doc.documentElement.childNodes)
+    assert olx_export.spill_storage.spilled_characters > len(xml)
+    olx_export.close()
+
+
+def test_peak_rss_is_used_if_current_rss_is_unavailable(cartridge, link_map_csv, mocker):
+    mocker.patch("cc2olx.olx.get_current_rss", return_value=None)
+    mocker.patch("cc2olx.olx.get_peak_rss", return_value=100)
+
+    assert olx.OlxExport(cartridge, link_map_csv, memory_budget=99)._is_memory_budget_exceeded() is True
+    assert olx.OlxExport(cartridge, link_map_csv, memory_budget=100)._is_memory_budget_exceeded() is False
+
+
+def test_memory_budget_is_ignored_if_memory_usage_is_unavailable(cartridge, link_map_csv, mocker, caplog):
+    mocker.patch("cc2olx.olx.get_current_rss", return_value=None)
+    mocker.patch("cc2olx.olx.get_peak_rss", return_value=None)
+    expected_xml = olx.OlxExport(cartridge, link_map_csv).xml()
+    olx_export = olx.OlxExport(cartridge, link_map_csv, memory_budget=0)
+
+    assert olx_export.xml() == expected_xml
+
+    assert olx_export._spill_storage is None
+    assert (
+        caplog.messages.count("The memory usage can't be determined on this platform, the memory budget is ignored.")
+        == 1
+    )
+
+
+def test_olx_with_iframe_inventory_is_the_same(cartridge, imscc_file, link_map_csv):
+    expected_xml = olx.OlxExport(cartridge, link_map_csv).xml()
+
+    olx_export = olx.OlxExport(cartridge, link_map_csv, iframe_inventory=scan_cartridge(imscc_file))
+
+    assert olx_export.xml() == expected_xml
+
+
+def test_olx_with_qti_workers_is_the_same(cartridge, link_map_csv, settings):
+    settings.QTI_PARALLEL_MIN_ITEMS = 0
+    expected_xml = olx.OlxExport(cartridge, link_map_csv).xml()
+    olx_export = olx.OlxExport(cartridge, link_map_csv, qti_workers=2)
+
+    xml = olx_export.xml()
+    executor = olx_export._qti_process_pool.executor
+    olx_export.close()
+
+    assert xml == expected_xml
+    assert olx_export._qti_process_pool._executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(len, "")
+
+
+def test_exploded_olx_is_the_same(cartridge, link_map_csv, tmp_path):
+    expected_xml = olx.OlxExport(cartridge, link_map_csv).xml()
+
+    olx.OlxExport(cartridge, link_map_csv).write_exploded_xml(tmp_path, workers=4)
+
+    assert (tmp_path / "course.xml").read_text() == '<course url_name="course" org="org" course="Some_cc_Course"/>\n'
+    assert len(list((tmp_path / "html").iterdir())) > 1
+    assert canonicalize_xml(inline_exploded_olx(tmp_path)) == canonicalize_xml(expected_xml)
+
+
+def test_spilled_exploded_olx_is_the_same(cartridge, link_map_csv, tmp_path, settings):
+    settings.SPILL_PAYLOAD_MIN_SIZE = 1
+    expected_xml = olx.OlxExport(cartridge, link_map_csv).xml()
+
+    olx_export = olx.OlxExport(cartridge, link_map_csv, memory_budget=0)
+    olx_export.write_exploded_xml(tmp_path, workers=4)
+    olx_export.close()
+
+    assert canonicalize_xml(inline_exploded_olx(tmp_path)) == canonicalize_xml(expected_xml)
+
+
+def test_resources_stats_are_collected(cartridge, link_map_csv):
+    olx_export = olx.OlxExport(cartridge, link_map_csv, collect_resources_stats=True)
+
+    olx_export.xml()
+
+    resources_stats = {resource.identifierref: resource for resource in olx_export.resources_stats}
+    assert len(resources_stats) > 0
+    assert all(resource.time >= 0 for resource in resources_stats.values())
+    assert resources_stats["resource_3_vertical"].type == "webcontent"
+    assert resources_stats["resource_3_vertical"].input_size > 0
+    assert resources_stats["resource_3_vertical"].output_size > 0
+
+
+def test_resources_stats_are_not_collected_by_default(cartridge, link_map_csv):
+    olx_export = olx.OlxExport(cartridge, link_map_csv)
+
+    olx_export.xml()
+
+    assert olx_export.resources_stats is None
+
+
 def test_olx_export_wiki_page_disabled(cartridge, link_map_csv, studio_course_xml):
     policy_json = olx.OlxExport(cartridge, link_map_csv).policy()
     policy = json.loads(policy_json)
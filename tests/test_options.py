@@ -1,7 +1,9 @@
 from pathlib import Path
 
+import pytest
+
 from cc2olx.cli import parse_args
-from cc2olx.parser import parse_options
+from cc2olx.parser import get_output_path, iter_cartridge_files, order_largest_first, parse_options
 
 
 def test_parse_options(imscc_file):
@@ -9,13 +11,116 @@ def test_parse_options(imscc_file):
 
     options = parse_options(parsed_args)
 
+    assert list(options.pop("input_files")) == [imscc_file]
     assert options == {
-        "input_files": {imscc_file},
+        "input_directories": [],
         "output_format": parsed_args.result,
         "workspace": Path.cwd() / "output",
         "link_file": None,
+        "iframe_inventory": None,
         "passport_file": None,
         "log_level": parsed_args.loglevel,
+        "log_file": None,
+        "log_summary": False,
         "relative_links_source": None,
         "content_types_with_custom_blocks": [],
+        "memory_budget": None,
+        "qti_workers": None,
+        "stats_file": None,
+        "slowest_resources": 0,
+        "resources_csv": None,
+        "progress_file": None,
+        "progress_fd": None,
+        "shard": None,
+        "plan_file": None,
+        "result_index": None,
+        "olx_layout": "inline",
+        "olx_workers": 4,
+        "checkpoint_file": None,
+        "resume": False,
+        "fail_fast": False,
+    }
+
+
+@pytest.fixture
+def cartridges_tree(tmp_path):
+    """
+    Create the nested directories with the cartridge files of different sizes.
+    """
+    sizes = {
+        "small.imscc": 1,
+        "2023/large.imscc": 30,
+        "2023/notes.txt": 100,
+        "2024/medium.imscc": 20,
+        "2024/drafts/huge.imscc": 40,
     }
+    for name, size in sizes.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * size)
+    return tmp_path
+
+
+def test_cartridge_files_are_found_recursively(cartridges_tree):
+    cartridge_files = iter_cartridge_files([cartridges_tree, cartridges_tree / "small.imscc"])
+
+    assert [(path.relative_to(cartridges_tree).as_posix(), size) for path, size in cartridge_files] == [
+        ("2023/large.imscc", 30),
+        ("2024/drafts/huge.imscc", 40),
+        ("2024/medium.imscc", 20),
+        ("small.imscc", 1),
+    ]
+
+
+@pytest.mark.parametrize(
+    "include, exclude, expected",
+    (
+        (["2024/*.imscc"], [], ["2024/medium.imscc"]),
+        (["2024/*"], ["drafts"], ["2024/medium.imscc"]),
+        ([], ["2023", "drafts"], ["2024/medium.imscc", "small.imscc"]),
+    ),
+)
+def test_cartridge_files_are_filtered(cartridges_tree, include, exclude, expected):
+    cartridge_files = iter_cartridge_files([cartridges_tree], include, exclude)
+
+    assert [path.relative_to(cartridges_tree).as_posix() for path, _ in cartridge_files] == expected
+
+
+@pytest.mark.parametrize(
+    "window, expected",
+    (
+        (1, ["a", "b", "c", "d"]),
+        (2, ["b", "c", "d", "a"]),
+        (10, ["b", "d", "c", "a"]),
+    ),
+)
+def test_cartridge_files_are_ordered_largest_first(window, expected):
+    cartridge_files = [(Path("a"), 1), (Path("b"), 3), (Path("c"), 2), (Path("d"), 3)]
+
+    assert list(order_largest_first(cartridge_files, window)) == [Path(name) for name in expected]
+
+
+def test_cartridge_files_are_found_lazily(cartridges_tree, settings):
+    settings.INPUT_FILES_ORDERING_WINDOW = 1
+    input_files = parse_options(parse_args(["-i", str(cartridges_tree)]))["input_files"]
+
+    assert next(input_files) == cartridges_tree / "2023" / "large.imscc"
+
+    (cartridges_tree / "2024" / "medium.imscc").unlink()
+
+    assert [path.name for path in input_files] == ["huge.imscc", "small.imscc"]
+
+
+def test_output_paths_keep_input_subdirectories(cartridges_tree, tmp_path):
+    input_directories = [cartridges_tree / "2024", cartridges_tree]
+
+    assert get_output_path(cartridges_tree / "2024" / "drafts" / "huge.imscc", input_directories) == Path("drafts/huge")
+    assert get_output_path(cartridges_tree / "2023" / "large.imscc", input_directories) == Path("2023/large")
+    assert get_output_path(tmp_path.parent / "course.imscc", input_directories) == Path("course")
+
+
+def test_missing_inputs_are_reported(tmp_path, imscc_file):
+    parsed_args = parse_args(["-i", str(imscc_file), "-i", str(tmp_path / "a"), "-i", str(tmp_path / "b")])
+
+    with pytest.raises(FileNotFoundError, match=f"The input paths don't exist: {tmp_path / 'a'}, {tmp_path / 'b'}"):
+        parse_options(parsed_args)
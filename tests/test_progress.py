@@ -0,0 +1,122 @@
+import io
+import json
+import os
+
+import pytest
+
+from cc2olx.conversion_hooks import ConversionHooks
+from cc2olx.progress import ProgressReporter, open_progress_output
+from cc2olx.stats import ConversionStats
+
+
+def read_events(output):
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+@pytest.fixture
+def input_files(tmp_path):
+    first_file = tmp_path / "first.imscc"
+    first_file.write_bytes(b"x" * 300)
+    second_file = tmp_path / "second.imscc"
+    second_file.write_bytes(b"x" * 100)
+    return [first_file, second_file]
+
+
+@pytest.fixture
+def third_file(tmp_path):
+    third_file = tmp_path / "third.imscc"
+    third_file.write_bytes(b"x" * 200)
+    return third_file
+
+
+class TestProgressReporter:
+    def test_batch_events_are_written(self, input_files):
+        output = io.StringIO()
+        reporter = ProgressReporter(output, input_files)
+
+        reporter.batch_started()
+        reporter.cartridge_started(input_files[0])
+        reporter.cartridge_finished(ConversionStats(input_files[0], output_size=50))
+        reporter.batch_finished()
+
+        events = read_events(output)
+        assert [event["event"] for event in events] == [
+            "batch_started",
+            "cartridge_started",
+            "cartridge_finished",
+            "batch_finished",
+        ]
+        assert events[0]["cartridges_total"] == 2
+        assert events[0]["bytes_total"] == 400
+        assert events[1]["input_size"] == 300
+        assert events[2]["bytes_packaged"] == 50
+        assert events[2]["cartridges_done"] == 1
+        assert events[2]["succeeded"] is True
+        assert events[2]["eta"] >= 0
+        assert events[3]["cartridges_done"] == 1
+
+    def test_resumed_cartridges_are_left_out_of_eta(self, mocker, input_files, third_file):
+        monotonic = mocker.patch("cc2olx.progress.time.monotonic", return_value=0.0)
+        output = io.StringIO()
+        reporter = ProgressReporter(output, [*input_files, third_file])
+
+        reporter.cartridge_finished(ConversionStats(input_files[0], resumed=True))
+        monotonic.return_value = 10.0
+        reporter.cartridge_finished(ConversionStats(input_files[1]))
+
+        resumed_event, converted_event = read_events(output)
+        assert resumed_event["eta"] is None
+        # 100 bytes are converted in 10 seconds, 200 bytes of the third cartridge are left.
+        assert converted_event["eta"] == 20.0
+
+    def test_eta_is_unknown_before_progress(self, input_files):
+        output = io.StringIO()
+        reporter = ProgressReporter(output, input_files)
+
+        reporter.resources_processed(input_files[0], 0, 10)
+
+        [event] = read_events(output)
+        assert event["processed"] == 0
+        assert event["total"] == 10
+        assert event["eta"] is None
+
+
+class TestProgressHook:
+    def run_resources(self, reporter, input_file, total):
+        hooks = ConversionHooks([reporter.create_hook(input_file)])
+        hooks.resources_found(total)
+        for index in range(total):
+            with hooks.resource(f"resource_{index}"):
+                pass
+
+    def test_events_are_throttled(self, settings, input_files):
+        settings.PROGRESS_EVENTS_INTERVAL = 3600
+        output = io.StringIO()
+
+        self.run_resources(ProgressReporter(output, input_files), input_files[1], 100)
+
+        assert [event["processed"] for event in read_events(output)] == [0, 100]
+
+    def test_every_resource_is_reported_without_interval(self, settings, input_files):
+        settings.PROGRESS_EVENTS_INTERVAL = 0
+        output = io.StringIO()
+
+        self.run_resources(ProgressReporter(output, input_files), input_files[1], 3)
+
+        assert [event["processed"] for event in read_events(output)] == [0, 1, 2, 3]
+
+
+def test_progress_is_written_to_file_descriptor():
+    read_fd, write_fd = os.pipe()
+
+    with open_progress_output(None, write_fd) as output:
+        output.write("{}\n")
+
+    os.write(write_fd, b"still open\n")
+    os.close(write_fd)
+    with open(read_fd, encoding="utf-8") as pipe_output:
+        assert pipe_output.read() == "{}\nstill open\n"
+
+
+def test_progress_output_is_not_opened_by_default():
+    assert open_progress_output(None, None) is None
@@ -0,0 +1,116 @@
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from cc2olx.analyze import CartridgeAnalysis
+from cc2olx.cli import parse_plan_args
+from cc2olx.parser import parse_plan_options
+from cc2olx.sharding import (
+    create_shard_plan,
+    estimate_cartridge_cost,
+    load_shard_plan,
+    write_result_index,
+    write_shard_plan,
+)
+from cc2olx.stats import ConversionStats, StageStats
+
+
+def create_analyses(estimated_times):
+    return [
+        CartridgeAnalysis(Path(f"/cartridges/{number}.imscc"), estimated_time=estimated_time)
+        for number, estimated_time in enumerate(estimated_times)
+    ]
+
+
+def test_shard_plan_is_balanced():
+    plan = create_shard_plan(create_analyses([3, 5, 1, 4, 3, 2]), 3)
+
+    assert [cartridge.estimated_time for cartridge in plan.cartridges] == [5, 4, 3, 3, 2, 1]
+    assert plan.get_shard_estimated_times() == {1: 6, 2: 6, 3: 6}
+    assert plan.get_shard_input_files(1) == [Path("/cartridges/1.imscc"), Path("/cartridges/2.imscc")]
+
+
+def test_shard_plan_is_deterministic():
+    analyses = create_analyses([1, 2, 2, 2, 5, 0.5, 3, 3])
+    plan = create_shard_plan(analyses, 3)
+
+    for _ in range(5):
+        random.shuffle(analyses)
+        assert create_shard_plan(analyses, 3) == plan
+
+
+def test_shard_plan_with_more_shards_than_cartridges():
+    plan = create_shard_plan(create_analyses([1, 2]), 4)
+
+    assert plan.get_shard_estimated_times() == {1: 2, 2: 1, 3: 0, 4: 0}
+    assert plan.get_shard_input_files(4) == []
+
+
+def test_failed_analysis_is_estimated_by_archive_size(settings):
+    settings.ANALYSIS_TIME_COEFFICIENTS = {"cartridge": 1, "resource": 0, "qti_item": 0, "megabyte": 2}
+    analysis = CartridgeAnalysis(Path("broken.imscc"), error="BadZipFile", archive_size=3 * 1024 * 1024)
+
+    assert estimate_cartridge_cost(analysis) == 7
+
+
+def test_shard_plan_file(tmp_path):
+    plan = create_shard_plan(create_analyses([3, 2, 1]), 2)
+    plan_file = tmp_path / "plan.json"
+
+    with open(plan_file, "w", encoding="utf-8") as plan_output:
+        write_shard_plan(plan_output, plan)
+
+    assert load_shard_plan(plan_file) == plan
+
+
+def test_write_result_index(tmp_path):
+    workspace = tmp_path / "output"
+    succeeded_stats = ConversionStats(
+        Path("/cartridges/0.imscc"),
+        output_file=workspace / "0.tar.gz",
+        output_size=100,
+        stages={"extract": StageStats(1.25, 1.0, None, None, None), "olx": StageStats(0.5, 0.5, None, None, None)},
+    )
+    failed_stats = ConversionStats(Path("/cartridges/1.imscc"), succeeded=False)
+    result_index_file = tmp_path / "index.jsonl"
+
+    write_result_index(result_index_file, [succeeded_stats, failed_stats], workspace, (2, 3))
+
+    assert [json.loads(line) for line in result_index_file.read_text().splitlines()] == [
+        {
+            "input_file": "/cartridges/0.imscc",
+            "shard": "2/3",
+            "succeeded": True,
+            "output_file": "0.tar.gz",
+            "output_size": 100,
+            "wall_time": 1.75,
+        },
+        {
+            "input_file": "/cartridges/1.imscc",
+            "shard": "2/3",
+            "succeeded": False,
+            "output_file": None,
+            "output_size": None,
+            "wall_time": 0,
+        },
+    ]
+
+
+def test_parse_plan_options(imscc_file):
+    options = parse_plan_options(parse_plan_args(["-i", str(imscc_file), "-n", "4", "--skip-qti-items"]))
+
+    assert options == {
+        "input_files": [imscc_file],
+        "log_level": "INFO",
+        "shards": 4,
+        "plan_file": None,
+        "workers": 1,
+        "count_qti_items": False,
+    }
+
+
+def test_parse_plan_args_requires_positive_shards(imscc_file):
+    with pytest.raises(SystemExit):
+        parse_plan_args(["-i", str(imscc_file), "-n", "0"])
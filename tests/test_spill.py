@@ -0,0 +1,88 @@
+import io
+import xml.dom.minidom
+
+import pytest
+
+from cc2olx import spill
+from cc2olx.spill import SpilledCDATASection, SpilledElement, SpillStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    spill_storage = SpillStorage(tmp_path)
+    yield spill_storage
+    spill_storage.close()
+
+
+class TestSpillStorage:
+    def test_fragments_are_copied_in_chunks(self, storage, monkeypatch):
+        monkeypatch.setattr(spill, "COPY_CHUNK_SIZE", 3)
+        first_fragment = storage.write(lambda writer: writer.write("ünïcödé"))
+        second_fragment = storage.write(lambda writer: writer.write("second"))
+
+        buffer = io.StringIO()
+        second_fragment.write_to(buffer)
+        first_fragment.write_to(buffer)
+
+        assert buffer.getvalue() == "secondünïcödé"
+        assert first_fragment.read() == "ünïcödé"
+        assert storage.spilled_characters == 13
+
+    def test_fragment_including_spilled_fragment_is_spilled(self, storage, monkeypatch):
+        monkeypatch.setattr(spill, "COPY_CHUNK_SIZE", 2)
+        inner_fragment = storage.write(lambda writer: writer.write("inner"))
+
+        def render(writer):
+            writer.write("<")
+            inner_fragment.write_to(writer)
+            writer.write(">")
+
+        outer_fragment = storage.write(render)
+
+        assert outer_fragment.read() == "<inner>"
+        assert inner_fragment.read() == "inner"
+
+    def test_file_is_created_in_directory(self, tmp_path):
+        storage = SpillStorage(tmp_path)
+        storage.write(lambda writer: writer.write("markup"))
+
+        # The anonymous temporary file isn't visible in the directory.
+        assert list(tmp_path.iterdir()) == []
+        storage.close()
+
+
+class TestSpilledElement:
+    def test_element_is_written_as_spilled_markup(self, storage):
+        document = xml.dom.minidom.parseString("<course><chapter url_name='1'><sequential/></chapter></course>")
+        chapter = document.documentElement.firstChild
+        expected_markup = io.StringIO()
+        chapter.writexml(expected_markup, "\t", "\t", "\n")
+
+        spilled_chapter = SpilledElement(chapter, storage, "\t", "\t", "\n")
+        document.documentElement.replaceChild(spilled_chapter, chapter)
+        markup = io.StringIO()
+        spilled_chapter.writexml(markup, "\t", "\t", "\n")
+
+        assert markup.getvalue() == expected_markup.getvalue()
+        assert document.documentElement.toprettyxml().count("<sequential/>") == 1
+
+    def test_different_indentation_is_not_allowed(self, storage):
+        chapter = xml.dom.minidom.parseString("<chapter/>").documentElement
+        spilled_chapter = SpilledElement(chapter, storage, "\t", "\t", "\n")
+
+        with pytest.raises(ValueError):
+            spilled_chapter.writexml(io.StringIO(), "\t\t", "\t", "\n")
+
+
+class TestSpilledCDATASection:
+    def test_section_is_written_from_storage(self, storage):
+        document = xml.dom.minidom.Document()
+        html = document.createElement("html")
+        html.appendChild(SpilledCDATASection("<p>Large page</p>", storage))
+
+        assert html.toxml() == "<html><![CDATA[<p>Large page</p>]]></html>"
+        assert html.firstChild.data == "<p>Large page</p>"
+
+    def test_cdata_end_is_not_allowed(self, storage):
+        with pytest.raises(ValueError):
+            SpilledCDATASection("]]>", storage)
@@ -0,0 +1,135 @@
+import csv
+import json
+import logging
+import xml.dom.minidom
+
+import pytest
+
+from cc2olx.stats import (
+    ConversionStats,
+    ProcessorStats,
+    ResourceStats,
+    get_current_rss,
+    log_resources_report,
+    measure_xml_size,
+    write_resources_csv,
+    write_stats_file,
+)
+
+
+class TestConversionStats:
+    def test_stage_resources_are_measured(self, tmp_path):
+        stats = ConversionStats(tmp_path / "course.imscc")
+
+        with stats.measure_stage("write"):
+            (tmp_path / "file.txt").write_bytes(b"x" * 1000)
+
+        stage_stats = stats.stages["write"]
+        assert stage_stats.wall_time >= 0
+        assert stage_stats.cpu_time >= 0
+        assert stage_stats.peak_rss > 0
+        assert stage_stats.bytes_written >= 1000
+
+    def test_stage_is_measured_if_error_occurs(self, tmp_path):
+        stats = ConversionStats(tmp_path / "course.imscc")
+
+        with pytest.raises(ValueError):
+            with stats.measure_stage("failing"):
+                raise ValueError
+
+        assert "failing" in stats.stages
+
+    def test_stats_are_written_to_file(self, tmp_path):
+        stats = ConversionStats(tmp_path / "course.imscc")
+        with stats.measure_stage("extract"):
+            pass
+        with stats.content_processors["HtmlContentProcessor"].measure_call():
+            pass
+        stats_file = tmp_path / "stats.json"
+
+        write_stats_file(stats_file, [stats])
+
+        written_stats = json.loads(stats_file.read_text())
+        [cartridge_stats] = written_stats["cartridges"]
+        assert cartridge_stats["input_file"] == str(tmp_path / "course.imscc")
+        assert list(cartridge_stats["stages"]) == ["extract"]
+        assert cartridge_stats["content_processors"]["HtmlContentProcessor"]["calls"] == 1
+        assert cartridge_stats["content_post_processors"] == {}
+        assert "resources" not in cartridge_stats
+
+
+class TestProcessorStats:
+    def test_calls_are_counted(self):
+        stats = ProcessorStats()
+
+        for _ in range(3):
+            with stats.measure_call():
+                pass
+
+        assert stats.calls == 3
+        assert stats.errors == 0
+        assert stats.time >= 0
+
+    def test_errors_are_counted(self):
+        stats = ProcessorStats()
+
+        with pytest.raises(RuntimeError):
+            with stats.measure_call():
+                raise RuntimeError
+
+        assert stats.calls == 1
+        assert stats.errors == 1
+
+
+class TestResourcesReport:
+    @pytest.fixture
+    def stats(self, tmp_path):
+        return ConversionStats(
+            tmp_path / "course.imscc",
+            resources=[
+                ResourceStats("fast_small", "webcontent", 0.1, 10, 100),
+                ResourceStats("slow_small", "imsqti_xmlv1p2/imscc_xmlv1p1/assessment", 2.0, 20, 300),
+                ResourceStats("fast_large", "webcontent", 0.2, 5000, 200),
+            ],
+        )
+
+    def test_slowest_and_largest_resources_are_logged(self, stats, caplog):
+        with caplog.at_level(logging.INFO):
+            log_resources_report(stats, 1)
+
+        slowest_report, largest_report = caplog.messages
+        assert slowest_report.startswith("Top 1 slowest resources")
+        assert "slow_small" in slowest_report
+        assert "fast" not in slowest_report
+        assert largest_report.startswith("Top 1 largest resources")
+        assert "fast_large" in largest_report
+        assert "small" not in largest_report
+
+    def test_resources_are_written_to_csv(self, stats, tmp_path):
+        csv_file = tmp_path / "resources.csv"
+
+        write_resources_csv(csv_file, [stats, ConversionStats(tmp_path / "failed.imscc")])
+
+        with open(csv_file, encoding="utf-8") as csv_input:
+            header, *rows = list(csv.reader(csv_input))
+        assert header == ["input_file", "identifierref", "type", "time", "input_size", "output_size"]
+        assert len(rows) == 3
+        assert rows[1] == [
+            str(tmp_path / "course.imscc"),
+            "slow_small",
+            "imsqti_xmlv1p2/imscc_xmlv1p1/assessment",
+            "2.0",
+            "20",
+            "300",
+        ]
+
+
+def test_current_rss_is_provided():
+    assert get_current_rss() > 0
+
+
+def test_xml_size_is_measured_in_bytes():
+    document = xml.dom.minidom.parseString("<html><p>Caf\u00e9</p></html>")
+    nodes = list(document.documentElement.childNodes)
+
+    assert measure_xml_size(nodes) == len("<p>Caf\u00e9</p>".encode("utf-8")) == 12
@@ -1,10 +1,15 @@
+import json
+import shutil
 from argparse import Namespace
-from unittest.mock import Mock, call
+from unittest.mock import ANY, Mock, call
 
 from cc2olx.tools.video_upload import (
+    BYTES_IN_MEGABYTE,
+    FileChunkReader,
     main,
     parse_args,
     upload_transcript,
+    UploadState,
     OAUTH_TOKEN_URL,
     GENERATE_UPLOAD_LINK_BASE_URL,
     TRANSCRIPT_UPLOAD_LINK,
@@ -74,7 +79,7 @@ class TestVideoUpload:
         # patch API calls
         mocker.patch("cc2olx.tools.video_upload.requests.post", side_effect=post_side_effect)
         mocker.patch("cc2olx.tools.video_upload.requests.Session.post", side_effect=post_side_effect)
-        upload_video_mock = mocker.patch("cc2olx.tools.video_upload.requests.put", side_effect=put_side_effect)
+        upload_video_mock = mocker.patch("cc2olx.tools.video_upload.requests.Session.put", side_effect=put_side_effect)
 
         # patch writerow method of csv.DictWriter class so that we can assert against
         # data written to the output csv
@@ -83,10 +88,10 @@ class TestVideoUpload:
         main()
 
         expected_upload_video_call_args = [
-            call("example.com/upload/ghi", data=b"", headers={"Content-Type": "video/quicktime"}),
-            call("example.com/upload/abc", data=b"", headers={"Content-Type": "video/mp4"}),
-            call("example.com/upload/def", data=b"", headers={"Content-Type": "video/mp4"}),
-            call("example.com/upload/jkl", data=b"", headers={"Content-Type": "video/quicktime"}),
+            call("example.com/upload/ghi", data=ANY, headers={"Content-Type": "video/quicktime"}),
+            call("example.com/upload/abc", data=ANY, headers={"Content-Type": "video/mp4"}),
+            call("example.com/upload/def", data=ANY, headers={"Content-Type": "video/mp4"}),
+            call("example.com/upload/jkl", data=ANY, headers={"Content-Type": "video/quicktime"}),
         ]
         upload_video_mock.assert_has_calls(expected_upload_video_call_args, any_order=True)
 
@@ -157,7 +162,15 @@ def test_parse_args():
     parsed_args = parse_args(["courseid", "dirname", "input.csv", "--output-csv", "output.csv"])
 
     assert parsed_args == Namespace(
-        course_id="courseid", directory="dirname", input_csv="input.csv", output_csv="output.csv"
+        course_id="courseid",
+        directory="dirname",
+        input_csv="input.csv",
+        output_csv="output.csv",
+        workers=4,
+        state_file=None,
+        chunk_size=1024,
+        multipart_part_size=None,
+        part_workers=4,
     )
 
 
@@ -185,3 +198,115 @@ def test_transcript_upload(mocker, transcript_file):
 
     response = upload_transcript(transcript_file, None, "en", "test_access_token")
     assert response.status_code == 400
+
+
+def _run_upload(mocker, video_upload_args, **args):
+    args_mock = Mock()
+    args_mock.configure_mock(**{**video_upload_args, **args})
+    mocker.patch("cc2olx.tools.video_upload.parse_args", return_value=args_mock)
+    main()
+
+
+def test_video_upload_concurrently_streams_videos(mocker, mock_studio_server, video_upload_args, tmp_path):
+    video_dir = tmp_path / "videos"
+    shutil.copytree(video_upload_args["directory"], video_dir)
+    video_path = video_dir / "01___Intro_to_Knowledge_Based_AI" / "1 - Preview.mp4"
+    video_path.write_bytes(b"video content")
+
+    _run_upload(mocker, video_upload_args, directory=str(video_dir), workers=3)
+
+    video_uploads = {path: body for _, path, _, body in mock_studio_server.get_requests("PUT", "/upload/")}
+    preview_video_id = mock_studio_server.video_ids["1 - Preview.mp4"]
+    assert len(video_uploads) == 4
+    assert video_uploads[f"/upload/{preview_video_id}"] == b"video content"
+    assert all(
+        "Transfer-Encoding" not in headers and "Content-Length" in headers
+        for _, _, headers, _ in mock_studio_server.get_requests("PUT", "/upload/")
+    )
+    assert len(mock_studio_server.get_requests("POST", "/transcript_upload_api/")) == 4
+    assert all(
+        "Authorization" not in headers for _, _, headers, _ in mock_studio_server.get_requests("PUT", "/upload/")
+    )
+    assert all(
+        headers["Authorization"] == "JWT 123"
+        for _, _, headers, _ in mock_studio_server.get_requests("POST", "/generate_video_upload_link/")
+    )
+
+
+def test_video_upload_resumes_from_state_file(mocker, mock_studio_server, video_upload_args, tmp_path):
+    state_file = tmp_path / "state.jsonl"
+    output_csv = tmp_path / "output.csv"
+    state_file.write_text(
+        json.dumps(
+            {
+                "path": "01___Intro_to_Knowledge_Based_AI/0 - Introductions.mp4",
+                "edx_video_id": "uploaded-before",
+                "lang": "en",
+            }
+        )
+        + "\n"
+    )
+
+    _run_upload(mocker, video_upload_args, state_file=str(state_file), output_csv=str(output_csv), workers=2)
+
+    assert "0 - Introductions.mp4" not in mock_studio_server.video_ids
+    assert len(mock_studio_server.get_requests("PUT", "/upload/")) == 3
+    assert len(UploadState(state_file).uploaded) == 4
+    assert "uploaded-before" in output_csv.read_text()
+
+    _run_upload(mocker, video_upload_args, state_file=str(state_file), output_csv=str(output_csv), workers=2)
+
+    assert len(mock_studio_server.get_requests("PUT", "/upload/")) == 3
+    assert output_csv.read_text().count("video-") == 3
+
+
+def test_failed_video_upload_is_not_recorded(mocker, mock_studio_server, video_upload_args, tmp_path):
+    state_file = tmp_path / "state.jsonl"
+    mocker.patch("cc2olx.tools.video_upload.GENERATE_UPLOAD_LINK_BASE_URL", f"{mock_studio_server.url}/missing-api/")
+
+    _run_upload(mocker, video_upload_args, state_file=str(state_file))
+
+    assert not mock_studio_server.get_requests("PUT")
+    assert UploadState(state_file).uploaded == {}
+
+
+def test_file_chunk_reader_reads_range_in_chunks(tmp_path):
+    video_path = tmp_path / "video.mp4"
+    video_path.write_bytes(bytes(range(100)))
+
+    with FileChunkReader(video_path, chunk_size=16, offset=10, length=50) as body:
+        chunks = list(iter(lambda: body.read(64), b""))
+
+    assert len(body) == 50
+    assert [len(chunk) for chunk in chunks] == [16, 16, 16, 2]
+    assert b"".join(chunks) == bytes(range(10, 60))
+
+
+def test_video_upload_in_parts(mocker, mock_studio_server, video_upload_args, tmp_path, capsys):
+    video_dir = tmp_path / "videos"
+    shutil.copytree(video_upload_args["directory"], video_dir)
+    video_content = bytes(range(256)) * (5 * BYTES_IN_MEGABYTE // 256) + b"tail"
+    (video_dir / "01___Intro_to_Knowledge_Based_AI" / "1 - Preview.mp4").write_bytes(video_content)
+
+    _run_upload(mocker, video_upload_args, directory=str(video_dir), multipart_part_size=2, part_workers=2)
+
+    preview_video_id = mock_studio_server.video_ids["1 - Preview.mp4"]
+    parts = sorted(
+        (path, body) for _, path, _, body in mock_studio_server.get_requests("PUT", f"/upload/{preview_video_id}/")
+    )
+    complete_requests = mock_studio_server.get_requests("POST", f"/upload/{preview_video_id}/complete")
+    assert [len(body) for _, body in parts] == [2 * BYTES_IN_MEGABYTE, 2 * BYTES_IN_MEGABYTE, BYTES_IN_MEGABYTE + 4]
+    assert b"".join(body for _, body in parts) == video_content
+    assert len(complete_requests) == 1
+    assert complete_requests[0][3].count(b"<PartNumber>") == 3
+    assert "Successfully uploaded video 1 - Preview.mp4 in 3 parts." in capsys.readouterr().out
+
+
+def test_video_upload_falls_back_to_single_request(mocker, mock_studio_server, video_upload_args, capsys):
+    mock_studio_server.multipart = False
+
+    _run_upload(mocker, video_upload_args, multipart_part_size=2)
+
+    assert len(mock_studio_server.get_requests("PUT", "/upload/")) == 4
+    assert not mock_studio_server.get_requests("POST", "/upload/")
+    assert capsys.readouterr().out.count("MB/s)") == 4
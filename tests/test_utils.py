@@ -1,4 +1,6 @@
-from cc2olx.utils import clean_from_cdata
+import pytest
+
+from cc2olx.utils import clean_from_cdata, html_may_contain_tags
 
 
 class TestXMLCleaningFromCDATA:
@@ -33,3 +35,35 @@ class TestXMLCleaningFromCDATA:
         actual_cleaned_html_without_cdata = clean_from_cdata(html_without_cdata)
 
         assert actual_cleaned_html_without_cdata == html_without_cdata
+
+
+class TestHtmlMayContainTags:
+    """
+    Test the cheap HTML tags pre-scan.
+    """
+
+    @pytest.mark.parametrize(
+        "html",
+        [
+            '<p>Video</p><iframe src="https://example.com"></iframe>',
+            '<p>Video</p><IFRAME src="https://example.com"></IFRAME>',
+            "<div><iframe/></div>",
+        ],
+    )
+    def test_html_with_tag_is_detected(self, html: str) -> None:
+        assert html_may_contain_tags(html, ["iframe"]) is True
+
+    @pytest.mark.parametrize(
+        "html",
+        [
+            "<p>No video here</p>",
+            "<p>&lt;iframe&gt; is escaped</p>",
+            "<iframes>Not the same tag</iframes>",
+            "",
+        ],
+    )
+    def test_html_without_tag_is_detected(self, html: str) -> None:
+        assert html_may_contain_tags(html, ["iframe"]) is False
+
+    def test_any_of_several_tags_is_detected(self) -> None:
+        assert html_may_contain_tags("<p><video src='a.mp4'></video></p>", ["iframe", "video"]) is True
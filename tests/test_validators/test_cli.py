@@ -4,7 +4,7 @@ from unittest.mock import Mock
 import pytest
 from django.core.exceptions import ValidationError
 
-from cc2olx.validators.cli import convert_to_argparse_validator, link_source_validator
+from cc2olx.validators.cli import convert_to_argparse_validator, link_source_validator, shard_validator
 
 
 class TestConvertToArgparseValidator:
@@ -68,3 +68,24 @@ class TestLinkSourceValidator:
         """
         with pytest.raises(argparse.ArgumentTypeError, match="Enter a valid URL."):
             link_source_validator(links_source)
+
+
+class TestShardValidator:
+    """
+    Test shard validator.
+    """
+
+    @pytest.mark.parametrize("shard, expected", (("1/1", (1, 1)), ("2/5", (2, 5)), ("5/5", (5, 5))))
+    def test_shard_is_parsed(self, shard: str, expected: tuple) -> None:
+        """
+        Test whether the validator provides the shard number and the shards count.
+        """
+        assert shard_validator(shard) == expected
+
+    @pytest.mark.parametrize("shard", ("0/2", "3/2", "1/0", "1", "a/b", "1/2/3", "-1/2"))
+    def test_wrong_values_are_detected(self, shard: str) -> None:
+        """
+        Test whether the validator raises an error if the value is invalid.
+        """
+        with pytest.raises(argparse.ArgumentTypeError):
+            shard_validator(shard)
@@ -1,10 +1,17 @@
 from argparse import Namespace
 from unittest.mock import call, Mock
 
+import youtube_dl
+
+from cc2olx.iframe_inventory import normalize_video_url
+from cc2olx.tools import video_download
+
 from cc2olx.tools.video_download import (
+    DownloadManifest,
+    get_iframe_inventory,
+    deduplicate_urls,
     parse_args,
     find_all_video_urls,
-    reformat,
     get_ydl_opts,
     write_csv,
     main,
@@ -19,7 +26,7 @@ def test_find_video_urls_in_html(fixtures_data_dir):
 
     html_file_path = str(fixtures_data_dir / "imscc_files" / "main" / "iframe.html")
     urls = find_all_video_urls(html_file_path)
-    urls = [reformat(u) for u in urls]
+    urls = [normalize_video_url(u) for u in urls]
     expected = [
         "https://cdnapisec.kaltura.com/p/2019031/sp/201903100/playManifest/entryId/1_zeqnrfgw/format/url/protocol/https"
     ]
@@ -32,7 +39,7 @@ def test_find_all_video_urls_in_cc(imscc_file):
     """
 
     urls = find_all_video_urls(imscc_file)
-    urls = [reformat(u) for u in urls]
+    urls = [normalize_video_url(u) for u in urls]
     expected = [
         "https://cdnapisec.kaltura.com/p/2019031/sp/201903100/playManifest/entryId/1_zeqnrfgw/format/url/protocol/https",  # noqa: E501
         "https://cdnapisec.kaltura.com/p/2019031/sp/201903100/playManifest/entryId/1_zeqnrfgw/format/url/protocol/https",  # noqa: E501
@@ -48,7 +55,16 @@ def test_parse_args(imscc_file):
     parsed_args = parse_args(["-i", str(imscc_file), "-o", "outfile.csv", "-d", "download_dir", "-v"])
 
     assert parsed_args == Namespace(
-        input=str(imscc_file), config=None, output="outfile.csv", downloads="download_dir", simulate=False, verbose=True
+        input=str(imscc_file),
+        config=None,
+        output="outfile.csv",
+        downloads="download_dir",
+        simulate=False,
+        verbose=True,
+        workers=4,
+        scan_workers=None,
+        iframe_inventory=None,
+        manifest=None,
     )
 
 
@@ -117,9 +133,19 @@ class FakeYDL:
                 hook({"status": "finished", "filename": "filename.mp4"})
 
 
-def test_main(mocker, imscc_file):
+def test_main(mocker, imscc_file, tmp_path):
     args_mock = Mock()
-    args_mock.configure_mock(config=None, input=imscc_file, output="outfileXXX", simulate=True)
+    args_mock.configure_mock(
+        config=None,
+        input=imscc_file,
+        output="outfileXXX",
+        downloads=str(tmp_path),
+        simulate=True,
+        workers=2,
+        scan_workers=2,
+        iframe_inventory=None,
+        manifest=None,
+    )
     mocker.patch("cc2olx.tools.video_download.parse_args", return_value=args_mock)
     mocker.patch("cc2olx.tools.video_download.youtube_dl.YoutubeDL", new=FakeYDL)
 
@@ -142,21 +168,80 @@ def test_main(mocker, imscc_file):
                 "Youtube Id": "",
             }
         ),
-        call(
-            {
-                "Relative File Path": "filename.mp4",
-                "External Video Link": "https://cdnapisec.kaltura.com/p/2019031/sp/201903100/playManifest/entryId/1_zeqnrfgw/format/url/protocol/https",  # noqa: E501
-                "Youtube Id": "",
-            }
-        ),
     ]
 
     csv_writerow_mock.assert_has_calls(expected_csv_writerow_call_args, any_order=True)
+    # The cartridge embeds the same video twice, it's downloaded once.
+    assert csv_writerow_mock.call_count == 2
 
 
 def test_download_videos(mocker):
     parsed_args = parse_args(["-i", "file.html", "-d", "download_dir", "-v", "-s"])
     opts = get_ydl_opts(parsed_args)
-    mocker.patch("cc2olx.tools.video_download.youtube_dl.YoutubeDL", return_value=FakeYDL(opts))
+    mocker.patch("cc2olx.tools.video_download.youtube_dl.YoutubeDL", new=FakeYDL)
     ret = download_videos(["url1", "url2", "url3"], opts)
     assert ret == ["filename.mp4", "filename.mp4", "filename.mp4"]
+
+
+class UrlNamedFakeYDL:
+    """
+    Fake downloader naming the downloaded files after the URLs and failing for the URLs containing "broken".
+    """
+
+    downloaded_urls = []
+
+    def __init__(self, opts):
+        self.opts = opts
+
+    def download(self, urls):
+        for url in urls:
+            if "broken" in url:
+                raise youtube_dl.utils.DownloadError(f"Unable to download {url}")
+
+            self.downloaded_urls.append(url)
+            for hook in self.opts["progress_hooks"]:
+                hook({"status": "finished", "filename": f"{url}.m4a"})
+                hook({"status": "finished", "filename": f"{url}.mp4"})
+
+
+def test_download_videos_resumes_from_manifest(mocker, tmp_path):
+    mocker.patch("cc2olx.tools.video_download.youtube_dl.YoutubeDL", new=UrlNamedFakeYDL)
+    mocker.patch.object(UrlNamedFakeYDL, "downloaded_urls", [])
+    manifest_path = tmp_path / "downloads" / "manifest.jsonl"
+    urls = [f"url{number}" for number in range(8)] + ["broken"]
+
+    relpaths = download_videos(urls, {}, workers=3, manifest=DownloadManifest(manifest_path))
+
+    assert relpaths == [f"url{number}.mp4" for number in range(8)] + [None]
+    assert sorted(UrlNamedFakeYDL.downloaded_urls) == urls[:-1]
+
+    UrlNamedFakeYDL.downloaded_urls.clear()
+    relpaths = download_videos(urls, {}, workers=3, manifest=DownloadManifest(manifest_path))
+
+    assert relpaths == [f"url{number}.mp4" for number in range(8)] + [None]
+    assert UrlNamedFakeYDL.downloaded_urls == []
+
+
+def test_simulated_downloads_are_not_recorded(mocker, tmp_path):
+    mocker.patch("cc2olx.tools.video_download.youtube_dl.YoutubeDL", new=UrlNamedFakeYDL)
+    manifest_path = tmp_path / "manifest.jsonl"
+
+    download_videos(["url1"], {"simulate": True}, manifest=DownloadManifest(manifest_path))
+
+    assert not manifest_path.exists()
+
+
+def test_deduplicate_urls():
+    assert deduplicate_urls(["url2", "url1", "url2", "url3", "url1"]) == ["url2", "url1", "url3"]
+
+
+def test_iframe_inventory_is_written_and_reused(mocker, imscc_file, tmp_path):
+    inventory_file = tmp_path / "inventory.jsonl"
+    scan_cartridge_spy = mocker.spy(video_download, "scan_cartridge")
+
+    inventory = get_iframe_inventory(imscc_file, str(inventory_file))
+    reused_inventory = get_iframe_inventory(imscc_file, str(inventory_file))
+
+    assert scan_cartridge_spy.call_count == 1
+    assert reused_inventory == inventory
+    assert find_all_video_urls(imscc_file, inventory=reused_inventory) == find_all_video_urls(imscc_file)
@@ -1,8 +1,13 @@
+import hashlib
 import itertools
+import json
+import threading
 import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import List
 
 import xmlformatter
+from lxml import etree
 
 formatter = xmlformatter.Formatter(compress=True, encoding_output="UTF-8")
 
@@ -11,6 +16,45 @@ def format_xml(xml):
     return formatter.format_string(xml)
 
 
+def canonicalize_xml(xml):
+    """
+    Provide the canonical XML form ignoring the indentation and the attributes order.
+    """
+    parser = etree.XMLParser(remove_blank_text=True, remove_comments=True, strip_cdata=False)
+    return etree.tostring(etree.fromstring(xml.encode("utf-8"), parser), method="c14n").decode("utf-8")
+
+
+def inline_exploded_olx(directory):
+    """
+    Assemble the OLX written in the exploded layout back into a single course document.
+
+    The block pointers are the elements with `url_name` attribute only.
+    """
+    parser = etree.XMLParser(remove_blank_text=True, strip_cdata=False)
+
+    def load_block(pointer):
+        url_name = pointer.get("url_name")
+        block = etree.parse(str(directory / pointer.tag / f"{url_name}.xml"), parser).getroot()
+        for attribute, value in pointer.attrib.items():
+            block.set(attribute, value)
+        inline_children(block)
+        return block
+
+    def inline_children(element):
+        for child in element:
+            if isinstance(child.tag, str) and child.keys() == ["url_name"] and len(child) == 0 and not child.text:
+                element.replace(child, load_block(child))
+            elif isinstance(child.tag, str):
+                inline_children(child)
+
+    course_pointer = etree.parse(str(directory / "course.xml"), parser).getroot()
+    course = etree.parse(str(directory / "course" / f"{course_pointer.get('url_name')}.xml"), parser).getroot()
+    for attribute, value in course_pointer.attrib.items():
+        course.set(attribute, value)
+    inline_children(course)
+    return etree.tostring(course, encoding="unicode")
+
+
 def zip_imscc_dir(imscc_dir_path, result_path):
     """
     ZIPs the directory with .imscc content.
@@ -26,3 +70,90 @@ def build_multi_value_args(arg_name: str, values: List[str]) -> List[str]:
     Build arguments list for multi-value arguments.
     """
     return list(itertools.chain(*[(arg_name, value) for value in values]))
+
+
+class MockStudioRequestHandler(BaseHTTPRequestHandler):
+    """
+    Imitate the OAuth, Studio video APIs and the presigned video upload URLs.
+    """
+
+    def log_message(self, format, *args):
+        pass
+
+    def read_body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def send_json(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self.read_body()
+        self.server.record(self.command, self.path, self.headers, body)
+
+        if self.path == "/oauth2/access_token":
+            self.send_json(200, {"access_token": "123"})
+        elif self.path.startswith("/generate_video_upload_link/"):
+            file_data = json.loads(body)["files"][0]
+            filename = file_data["file_name"]
+            edx_video_id = self.server.video_ids.setdefault(filename, f"video-{len(self.server.video_ids)}")
+            upload_url = f"{self.server.url}/upload/{edx_video_id}"
+            response_data = {"edx_video_id": edx_video_id, "upload_url": upload_url}
+            if "part_count" in file_data and self.server.multipart:
+                response_data["upload_part_urls"] = [
+                    f"{upload_url}/parts/{part_number}" for part_number in range(1, file_data["part_count"] + 1)
+                ]
+                response_data["complete_upload_url"] = f"{upload_url}/complete"
+            self.send_json(200, {"files": [response_data]})
+        elif self.path.startswith("/upload/") and self.path.endswith("/complete"):
+            self.send_json(200, {})
+        elif self.path == "/transcript_upload_api/":
+            self.send_json(201, {})
+        else:
+            self.send_json(404, {})
+
+    def do_PUT(self):
+        body = self.read_body()
+        self.server.record(self.command, self.path, self.headers, body)
+
+        if not self.path.startswith("/upload/"):
+            self.send_json(404, {})
+            return
+
+        self.send_response(200)
+        self.send_header("ETag", f'"{hashlib.md5(body).hexdigest()}"')
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+class MockStudioServer(ThreadingHTTPServer):
+    """
+    Local HTTP server recording the requests made by the video upload tool.
+    """
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), MockStudioRequestHandler)
+        self.url = "http://{}:{}".format(*self.server_address)
+        self.video_ids = {}
+        self.multipart = True
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def record(self, method, path, headers, body):
+        with self._lock:
+            self.requests.append((method, path, dict(headers), body))
+
+    def get_requests(self, method, path_prefix=""):
+        return [request for request in self.requests if request[0] == method and request[1].startswith(path_prefix)]
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()